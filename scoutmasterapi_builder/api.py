@@ -16,6 +16,9 @@ from .reports import Reports
 from .invites import Invites
 from .environments import Environments
 from .benchmarking import Benchmarking
+from .mirror import Mirror
+from .crawler import Crawler
+from .transfer import Transfer
 
 
 class ScoutMasterAPI(
@@ -38,6 +41,9 @@ class ScoutMasterAPI(
     Invites,
     Environments,
     Benchmarking,
+    Mirror,
+    Crawler,
+    Transfer,
 ):
     """Aggregates all topic classes into a single API object"""
     pass
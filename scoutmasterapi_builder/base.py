@@ -1,12 +1,33 @@
 import time
 import functools
-import pandas as pd
-import geopandas as gpd
+import gzip
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 import requests
 import json
+import binascii
 from warnings import warn
 
+from .concurrency import Batch, Progress, RateLimiter, Submitter, gather
+from .singleflight import SingleFlight, clone
+from .metrics import MetricsRegistry, endpoint_template
+from .profiling import Profiler
+from .crs import reproject
+from .geometry import preprocess_geometries
+from .transport import REDACTED, RecordingTransport, ReplayTransport
+from .streaming import features_to_geodataframe, iter_batches, iter_json_array, parse_geometries
+
+_NO_PHASE = nullcontext()
+# urllib3 decodes brotli responses only when a brotli package is installed.
+ACCEPT_ENCODING = ("gzip, deflate, br"
+                   if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi")
+                   else "gzip, deflate")
+
 
 def conceptual(func):
     """Mark a client method as targeting a ⚠️ Conceptual endpoint.
@@ -35,14 +56,6 @@ def conceptual_class(cls):
         if callable(attr) and not name.startswith("_"):
             setattr(cls, name, conceptual(attr))
     return cls
-from shapely.wkt import loads as wkt_loads
-from shapely.wkb import loads as wkb_loads
-from shapely.geometry import mapping, shape
-import binascii
-from shapely.wkt import loads as wkt_loads
-from shapely.wkb import loads as wkb_loads
-from shapely.geometry import mapping, shape
-import binascii
 
 class BaseAPI:
     """Core HTTP requests and output formatting"""
@@ -57,6 +70,7 @@ class BaseAPI:
         self._client_secret = None
         self._token_expiry = 0.0  # epoch seconds when the cached token expires
         self._expiry_skew = 60    # refresh this many seconds before actual expiry
+        self._token_lock = threading.Lock()  # one token fetch at a time across threads
         self.version = version
         self.api = "https://dev-api.scoutmaster.nl" if dev else "https://api.scoutmaster.nl"
         self.host = f"{self.api}/{self.version}/"
@@ -73,6 +87,45 @@ class BaseAPI:
         self.output_format = output_format
         self.spatial = spatial
         self.lang = "en"
+        # Identical concurrent GETs (same URL, params and client identity) are
+        # coalesced into one HTTP request whose result every caller shares.
+        self.coalesce_requests = True
+        self._flights = SingleFlight()
+        # Global reference catalogues (crops, layer type definitions,
+        # observation parameters, ...) are cached for reference_ttl seconds;
+        # 0 disables. Per-project/field data is never cached: it changes with
+        # subscriptions.
+        self.reference_ttl = 900
+        self._cache = {}
+        self._field_indexes = {}  # project_id -> spatial.FieldIndex
+        self._observation_values = {}  # observation_id -> (updated_at, values)
+        # One pooled session for all traffic so connections (and TLS
+        # handshakes) are reused across calls and threads.
+        self.pool_size = 16
+        self.session = self._make_session()
+        # Optional replacement for the session when sending requests (see
+        # transport.py), e.g. to record or replay responses; None uses session.
+        self.transport = None
+        # JSON bodies of POST/PATCH requests larger than compression_threshold
+        # bytes are gzip-compressed when compress_requests is on. Off by
+        # default: the server must accept 'Content-Encoding: gzip'.
+        self.compress_requests = False
+        self.compression_threshold = 16 * 1024
+        self.compression_level = 6
+        # Opt-in preprocessing of uploaded geometries (see
+        # geometry.preprocess_geometries): True for the defaults or a dict of
+        # its keyword arguments, e.g. {"decimals": 7, "tolerance": 0.05}.
+        self.geometry_preprocessing = None
+        # Default concurrency of the bulk (*_many) helpers and size of the
+        # shared pool behind api.submit; keep <= pool_size.
+        self.max_workers = 8
+        self._executor = None  # created on first api.submit call
+        self._executor_lock = threading.Lock()
+        # Per-endpoint request metrics; None (the default) keeps every
+        # instrumentation point down to a single attribute check.
+        self.metrics = None
+        self._local = threading.local()  # per-thread (method, template) of the current call
+        self._profiler = None  # active Profiler while inside `with api.profile():`
         self._log(f"Initialized ScoutMaster API with host: {self.host}")
 
     def _log(self, *args, **kwargs):
@@ -80,6 +133,209 @@ class BaseAPI:
         if self.verbose:
             print(*args, **kwargs)
 
+    def enable_metrics(self, buckets=None, max_spans=1000):
+        """Start collecting per-endpoint metrics and return the registry.
+
+        Export with api.metrics.as_dict(), .to_prometheus() or .spans().
+        """
+        kwargs = {"max_spans": max_spans}
+        if buckets is not None: kwargs["buckets"] = buckets
+        self.metrics = MetricsRegistry(**kwargs)
+        return self.metrics
+
+    def disable_metrics(self):
+        """Stop collecting metrics; the previous registry is returned."""
+        metrics, self.metrics = self.metrics, None
+        return metrics
+
+    @contextmanager
+    def profile(self, cprofile=False, memory=False):
+        """Break every call made inside the block down into phases.
+
+        >>> with api.profile(cprofile=True) as p:
+        ...     api.fields(project_id)
+        >>> p.report()                 # seconds per phase, per method
+        >>> p.print_stats("fields")    # cProfile of the formatting phase
+
+        Args:
+            cprofile (bool): Collect a cProfile per method for _format_output.
+            memory (bool): Track the tracemalloc peak of each formatting call.
+        Yields:
+            Profiler: the collected timings.
+        """
+        profiler = Profiler(self, cprofile=cprofile, memory=memory)
+        previous, self._profiler = self._profiler, profiler
+        try:
+            yield profiler
+        finally:
+            self._profiler = previous
+            profiler.close()
+
+    @contextmanager
+    def recording(self, path):
+        """Record every response received inside the block to a cassette.
+
+        >>> with api.recording("fields.cassette.gz"):
+        ...     api.fields(project_id)
+
+        The cassette is a gzip-compressed JSON file of response statuses,
+        headers and bodies; request headers and bodies are not recorded and
+        tokens are redacted. Replay it offline with replay().
+
+        Yields:
+            RecordingTransport: the interactions recorded so far.
+        """
+        transport = RecordingTransport(self.transport or self.session)
+        previous, self.transport = self.transport, transport
+        try:
+            yield transport
+        finally:
+            self.transport = previous
+            transport.save(path)
+
+    def replay(self, path, latency=False):
+        """Answer all further requests from a cassette, without network access.
+
+        Also installs a placeholder token, so no authenticate() call is needed.
+        Set api.transport = None to go back to the network.
+
+        Args:
+            path (str): Cassette written by recording().
+            latency (bool): Reproduce each response's recorded duration
+                instead of answering at memory speed.
+        Returns:
+            ReplayTransport: the installed transport.
+        """
+        self.transport = ReplayTransport.load(path, latency=latency)
+        self.access_token, self._token_expiry = REDACTED, float("inf")
+        return self.transport
+
+    def _phase(self, name):
+        """Context manager timing a formatting sub-phase while profiling."""
+        profiler = self._profiler
+        return _NO_PHASE if profiler is None else profiler.phase(name)
+
+    def _make_session(self):
+        session = requests.Session()
+        # Responses are decompressed by urllib3, incrementally for streams.
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @property
+    def submit(self):
+        """Non-blocking variants of every public method, returning Futures.
+
+        >>> futures = [api.submit.layer_statistics_get(i) for i in layer_ids]
+        >>> stats = api.gather(futures)
+
+        Calls run on one bounded pool of max_workers threads per client.
+        """
+        return Submitter(self)
+
+    def gather(self, futures, return_exceptions=False, timeout=None):
+        """Results of `futures` (e.g. from api.submit) in input order; see
+        concurrency.gather."""
+        return gather(futures, return_exceptions=return_exceptions, timeout=timeout)
+
+    def batch(self, max_concurrency=None):
+        """
+        Collect calls and dispatch them concurrently when the block exits.
+        >>> with api.batch(max_concurrency=16) as b:
+        ...     for field_id in field_ids:
+        ...         b.layers(field_id, layer_type_id=t)
+        >>> b.combined
+        Args:
+            max_concurrency (int, optional): Concurrent requests (default max_workers).
+        Returns:
+            Batch: results, errors and combined output once the block exits.
+        """
+        return Batch(self, max_concurrency)
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix="scoutmaster")
+        return self._executor
+
+    def close(self):
+        """Wait for submitted calls, then release the thread pool and connections."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.session.close()
+
+    def clear_cache(self):
+        """Drop all cached reference data."""
+        self._cache.clear()
+
+    def warmup(self, datasets=None, connections=4):
+        """Prepare the client for fast first requests.
+
+        Runs concurrently: obtaining the access token, opening `connections`
+        pooled connections to the API host, preloading reference datasets into
+        the client cache and importing the DataFrame/geometry stack.
+
+        Args:
+            datasets (list[str] or dict, optional): Methods to preload, e.g.
+                ['crops', 'observations_parameters'], or a dict mapping method
+                name to keyword arguments. Defaults to crops and
+                observations_parameters.
+            connections (int): Number of connections to open in the pool.
+        Returns:
+            dict: Seconds per step ('token', 'connections', 'imports', one per
+            dataset) and 'total'. Failed steps are reported with a warning.
+        """
+        if datasets is None:
+            datasets = ["crops", "observations_parameters"]
+        if not isinstance(datasets, dict):
+            datasets = {name: {} for name in datasets}
+
+        # The origin of the configured host (which may be overridden, e.g. for
+        # a stub server), not the default API URL.
+        parts = urlsplit(self.host)
+        origin = f"{parts.scheme}://{parts.netloc}/"
+
+        def open_connections():
+            # HEAD on the host root is cheap; the point is the handshake.
+            with ThreadPoolExecutor(max_workers=connections) as pool:
+                list(pool.map(lambda _: self.session.head(origin, timeout=10),
+                              range(connections)))
+
+        def import_stack():
+            if self.output_format == "df":
+                import pandas  # noqa: F401
+            if self.output_format == "df" or self.spatial:
+                import geopandas  # noqa: F401
+                import shapely  # noqa: F401
+
+        steps = {"token": self._ensure_token, "connections": open_connections,
+                 "imports": import_stack}
+        for name, kwargs in datasets.items():
+            steps[name] = functools.partial(getattr(self, name), **kwargs)
+
+        def timed(item):
+            name, step = item
+            t0 = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                warn(f"warmup step '{name}' failed: {e}")
+            return name, time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+            timings = dict(pool.map(timed, steps.items()))
+        timings["total"] = time.perf_counter() - t0
+        for name, seconds in timings.items():
+            self._log(f"warmup {name}: {seconds * 1000:.0f} ms")
+        return timings
+
     def authenticate(self, client_id, client_secret):
         # Cache credentials so the token can be re-fetched automatically on expiry.
         self._client_id = client_id
@@ -97,9 +353,10 @@ class BaseAPI:
         when it is close to expiring (tracked via `expires_in`).
         """
         data = {'grant_type': 'client_credentials'}
-        session = requests.Session()
-        session.auth = HTTPBasicAuth(self._client_id, self._client_secret)
-        response = session.post(self.token_url, data=data, headers={'Accept': 'application/json'})
+        response = (self.transport or self.session).request(
+            "POST", self.token_url, data=data, headers={'Accept': 'application/json'},
+            auth=HTTPBasicAuth(self._client_id, self._client_secret),
+        )
         response.raise_for_status()
         if response.status_code != 200:
             raise Exception(f"Authentication failed: {response.status_code} {response.text}")
@@ -122,7 +379,10 @@ class BaseAPI:
             return
         if not self._client_id or not self._client_secret:
             raise Exception("Call authenticate() first")
-        self._fetch_token()
+        with self._token_lock:
+            # Another thread may have refreshed the token while we waited.
+            if not self._token_valid():
+                self._fetch_token()
 
     def _check_auth(self):
         self._ensure_token()
@@ -131,18 +391,99 @@ class BaseAPI:
         self._check_auth()
         return {'Authorization': f'Bearer {self.access_token}', 'Content-Type': 'application/json'}
 
-    def _get(self, endpoint, params=None, verbose=False):
-        """Internal GET request helper."""
+    def _send(self, method, endpoint, **kwargs):
+        """Send an HTTP request to the API host, recording metrics when enabled."""
+        url = f"{self.host}{endpoint}"
+        metrics, profiler = self.metrics, self._profiler
+        transport = self.transport or self.session
+        if metrics is None and profiler is None:
+            return transport.request(method, url, **kwargs)
+        template = endpoint_template(endpoint)
+        self._local.call = (method, template)
+        start, t0 = time.time(), time.perf_counter()
+        response = error = None
+        try:
+            response = transport.request(method, url, **kwargs)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            if metrics is not None:
+                status = nbytes = None
+                if response is not None:
+                    status = response.status_code
+                    # Don't consume a streamed body just to measure it.
+                    nbytes = (int(response.headers.get("Content-Length") or 0)
+                              if kwargs.get("stream") else len(response.content or b""))
+                metrics.record_request(method, template, start, elapsed,
+                                       status=status, nbytes=nbytes or 0, error=error)
+            if profiler is not None:
+                profiler.add("network", elapsed)
+
+    def _decode(self, response):
+        """response.json(), timed against the current endpoint when metrics are on."""
+        metrics, profiler = self.metrics, self._profiler
+        if metrics is None and profiler is None:
+            return response.json()
+        t0 = time.perf_counter()
+        try:
+            return response.json()
+        finally:
+            elapsed = time.perf_counter() - t0
+            call = getattr(self._local, "call", None)
+            if metrics is not None and call is not None:
+                metrics.record_decode(*call, elapsed)
+            if profiler is not None:
+                profiler.add("decode", elapsed)
+
+    def _get(self, endpoint, params=None, verbose=False, cache=False):
+        """Internal GET request helper.
+
+        Concurrent calls for the same endpoint + params + client are coalesced
+        into a single request; each caller receives its own copy of the data.
+        With cache=True the result is served from (and stored in) the
+        reference-data cache for reference_ttl seconds.
+        """
+        if self.metrics is not None:
+            # Coalesced followers never reach _send; tag the call here so
+            # their formatting time is still attributed to this endpoint.
+            self._local.call = ("GET", endpoint_template(endpoint))
+        key = (
+            self._client_id,
+            f"{self.host}{endpoint}",
+            json.dumps(params, sort_keys=True, default=str) if params else None,
+        )
+        cache = cache and self.reference_ttl > 0
+        if cache:
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] > time.monotonic():
+                return clone(hit[1])
+        if self.coalesce_requests:
+            data = self._flights.do(key, self._get_uncoalesced, endpoint, params, verbose)
+        else:
+            data = self._get_uncoalesced(endpoint, params, verbose)
+        if cache and data:
+            # Store a private copy: callers (e.g. _unwrap_dicts) mutate theirs.
+            self._cache[key] = (time.monotonic() + self.reference_ttl, clone(data))
+        return data
+
+    def _get_uncoalesced(self, endpoint, params=None, verbose=False, envelope=False):
+        """Send a GET request and return the response's 'data' payload, or
+        the whole decoded body (including e.g. 'count') when envelope=True."""
         try:
             self._check_auth()
         
-            response = requests.get(
-                f"{self.host}{endpoint}",
+            response = self._send(
+                "GET", endpoint,
                 headers=self._get_headers(),
                 params=params  # requests will handle encoding
             )
             response.raise_for_status()
-            response_json = response.json()
+            response_json = self._decode(response)
+            if envelope:
+                return response_json
             data = response_json.get("data", response_json)
             if verbose:
                 count = response_json.get("count", len(data) if hasattr(data, "__len__") else 1)
@@ -157,6 +498,58 @@ class BaseAPI:
             else:
                 raise Exception(f"GET request failed: {e}")
 
+    def _get_stream(self, endpoint, params=None, key="features", chunksize=1000):
+        """GET a large array response and yield it in lists of `chunksize` items.
+
+        The body is parsed incrementally (see streaming.iter_json_array), so
+        memory stays bounded by the chunk size rather than the payload size.
+        Not coalesced or cached.
+        """
+        self._check_auth()
+        response = self._send("GET", endpoint, headers=self._get_headers(),
+                              params=params, stream=True)
+        try:
+            if not response.ok:
+                text = response.text
+                if response.status_code // 100 == 4 and "not found" in text.lower():
+                    warn(text)
+                    return
+                raise Exception(f"GET request failed: {response.status_code} {text}")
+            items = iter_json_array(response.iter_content(chunk_size=64 * 1024), key)
+            yield from iter_batches(items, chunksize)
+        finally:
+            response.close()
+
+    def _format_stream(self, endpoint, params=None, key="features", chunksize=1000, crs=None):
+        """Yield formatted chunks of a streamed array response.
+
+        Feature chunks become GeoDataFrames (spatial df), FeatureCollections
+        (json) or flattened DataFrames (non-spatial df); record chunks go
+        through _format_output. `crs` is the CRS the geometries are in.
+        """
+        for batch in self._get_stream(endpoint, params, key=key, chunksize=chunksize):
+            if key != "features":
+                yield self._format_output(batch, crs)
+            elif self.output_format == "json":
+                yield {"type": "FeatureCollection", "features": batch}
+            elif self.spatial:
+                with self._phase("geodataframe"):
+                    yield features_to_geodataframe(batch, crs or "EPSG:4326")
+            else:
+                yield self._format_output({"type": "FeatureCollection", "features": batch})
+
+    def _json_body(self, payload, headers):
+        """requests kwargs sending `payload` as JSON, gzip-compressed (and
+        `headers` updated) when compress_requests is on and the encoded body
+        exceeds compression_threshold bytes."""
+        if not self.compress_requests:
+            return {"json": payload}
+        body = json.dumps(payload, separators=(",", ":"), allow_nan=False).encode("utf-8")
+        if len(body) <= self.compression_threshold:
+            return {"data": body}
+        headers["Content-Encoding"] = "gzip"
+        return {"data": gzip.compress(body, compresslevel=self.compression_level)}
+
     def _post(self, endpoint, payload=None, files=None):
         """
         Internal helper to send a POST request to the API.
@@ -173,18 +566,18 @@ class BaseAPI:
         # If sending JSON (no files)
         if files is None:
             headers['Content-Type'] = 'application/json'
-            request_args = {"json": payload or {}}
+            request_args = self._json_body(payload or {}, headers)
         else:
             # multipart/form-data automatically set by requests if files are provided
             request_args = {"data": payload or {}, "files": files}
 
         try:
-            response = requests.post(f"{self.host}{endpoint}", headers=headers, **request_args)
+            response = self._send("POST", endpoint, headers=headers, **request_args)
 
             # First, check if the response has content
             if response.content:
                 try:
-                    response_json = response.json()
+                    response_json = self._decode(response)
                 except ValueError:
                     # Non-JSON response
                     raise Exception(
@@ -216,14 +609,14 @@ class BaseAPI:
             'Content-Type': 'application/json',
         }
         try:
-            response = requests.patch(
-                f"{self.host}{endpoint}",
+            response = self._send(
+                "PATCH", endpoint,
                 headers=headers,
-                json=payload or {},
+                **self._json_body(payload or {}, headers),
             )
             if response.content:
                 try:
-                    response_json = response.json()
+                    response_json = self._decode(response)
                 except ValueError:
                     raise Exception(
                         f"PATCH request to {endpoint} did not return valid JSON. "
@@ -248,12 +641,12 @@ class BaseAPI:
             'Content-Type': 'application/json',
         }
         try:
-            response = requests.delete(f"{self.host}{endpoint}", headers=headers)
+            response = self._send("DELETE", endpoint, headers=headers)
             if response.status_code == 204:
                 return True
             if response.content:
                 try:
-                    response_json = response.json()
+                    response_json = self._decode(response)
                 except ValueError:
                     raise Exception(
                         f"DELETE request to {endpoint} did not return valid JSON. "
@@ -271,6 +664,10 @@ class BaseAPI:
             raise Exception(f"DELETE request failed: {e}")
     def _parse_geometry(self, geom):
         """Parse geometry from string (WKT/WKB) or dict (GeoJSON) to shapely geometry."""
+        from shapely.geometry import shape
+        from shapely.wkb import loads as wkb_loads
+        from shapely.wkt import loads as wkt_loads
+
         if geom is None:
             return None
         if isinstance(geom, dict):
@@ -287,6 +684,31 @@ class BaseAPI:
                     raise ValueError(f"Cannot parse geometry string: {geom[:100]}")
         raise ValueError(f"Unexpected geometry type: {type(geom)}")
 
+    def reproject(self, data, crs=4326, source_crs=None):
+        """
+        Reproject data client-side, e.g. survey geometries before an upload or
+        a response fetched with a `crs` parameter.
+        Transformers are cached per (source, target) pair and every coordinate
+        of the dataset is transformed in one vectorized call. Without a CRS on
+        the data or source_crs, the CRS is detected once from the dataset's
+        bounds (lon/lat or Dutch RD New).
+        Args:
+            data (GeoDataFrame, GeoSeries or list): Data to reproject; a list
+                may hold shapely geometries, GeoJSON dicts, WKT or hex WKB.
+            crs (int or str, optional): Target CRS (default EPSG:4326).
+            source_crs (int or str, optional): CRS of `data`.
+        Returns:
+            GeoDataFrame, GeoSeries or ndarray of shapely geometries.
+        """
+        return reproject(data, crs, source_crs)
+
+    def _prepare_geometries(self, values):
+        """Apply geometry_preprocessing, when enabled, to upload geometries."""
+        options = self.geometry_preprocessing
+        if not options:
+            return list(values)
+        return preprocess_geometries(values, **({} if options is True else options))
+
     def _has_geometry(self, data):
         """True if the response carries geometry (a GeoJSON FeatureCollection,
         a single feature/record with a 'geometry' key, or a list of such records).
@@ -297,26 +719,50 @@ class BaseAPI:
             return isinstance(data[0], dict) and "geometry" in data[0]
         return False
 
-    def _to_geodataframe(self, data):
+    def _to_geodataframe(self, data, crs=None):
         """Build a GeoDataFrame from a FeatureCollection or list/dict of records
-        whose 'geometry' may be GeoJSON, WKT, or hex-WKB."""
+        whose 'geometry' may be GeoJSON, WKT, or hex-WKB, in `crs` (default
+        EPSG:4326)."""
+        import geopandas as gpd
+
         if isinstance(data, dict) and "features" in data:
-            gdf = gpd.GeoDataFrame.from_features(data["features"])
+            with self._phase("geodataframe"):
+                gdf = gpd.GeoDataFrame.from_features(data["features"])
         else:
             items = data if isinstance(data, list) else [data]
-            rows = []
-            for item in items:
-                item = dict(item)
-                item["geometry"] = self._parse_geometry(item.get("geometry"))
-                rows.append(item)
-            gdf = gpd.GeoDataFrame(rows, geometry="geometry")
+            with self._phase("parse_geometry"):
+                # Decode all geometries in one vectorized call.
+                geometry = parse_geometries(item.get("geometry") for item in items)
+            with self._phase("geodataframe"):
+                rows = [{k: v for k, v in item.items() if k != "geometry"} for item in items]
+                gdf = gpd.GeoDataFrame(rows, geometry=geometry)
         if "geometry" in gdf.columns and gdf.crs is None:
-            gdf.set_crs(epsg=4326, inplace=True)
+            gdf.set_crs(crs or "EPSG:4326", inplace=True)
         return gdf
 
-    def _format_output(self, data):
+    def _format_output(self, data, crs=None):
         """Format an API response according to self.output_format + self.spatial.
 
+        `crs` is the CRS the response geometries are in when the request asked
+        for one (default EPSG:4326). Formatting time is recorded against the
+        current endpoint when metrics are enabled (and per phase while
+        profiling); see _shape_output for the formatting rules.
+        """
+        metrics, profiler = self.metrics, self._profiler
+        if metrics is None and profiler is None:
+            return self._shape_output(data, crs)
+        t0 = time.perf_counter()
+        try:
+            with profiler.formatting() if profiler is not None else _NO_PHASE:
+                return self._shape_output(data, crs)
+        finally:
+            call = getattr(self._local, "call", None)
+            if metrics is not None and call is not None:
+                metrics.record_format(*call, time.perf_counter() - t0)
+
+    def _shape_output(self, data, crs=None):
+        """Shape data into the configured container.
+
         output_format selects the container ('df' or 'json'); spatial selects
         whether geometry-bearing responses are returned geometry-aware. When
         spatial is requested but the endpoint returns no geometry, formatting
@@ -324,6 +770,9 @@ class BaseAPI:
         """
         if self.output_format not in ("json", "df"):
             raise ValueError("output_format must be 'df' or 'json'")
+        if self.output_format == "df":
+            # pandas is only needed once a DataFrame is actually produced.
+            import pandas as pd
         
         spatial = bool(getattr(self, "spatial", False)) and self._has_geometry(data)
         is_feature_collection = isinstance(data, dict) and "features" in data
@@ -332,11 +781,18 @@ class BaseAPI:
             return data  # already a FeatureCollection
 
         elif spatial and self.output_format == "json":
-            return self._to_geodataframe(data).__geo_interface__
+            gdf = self._to_geodataframe(data, crs)
+            with self._phase("geojson"):
+                return gdf.__geo_interface__
+
+        elif spatial and self.output_format == "df" and is_feature_collection:
+            return self._to_geodataframe(data, crs)
 
         elif spatial and self.output_format == "df":
-            flattened = [self._unwrap_dicts(item) for item in data]
-            return self._to_geodataframe(flattened)
+            with self._phase("unwrap"):
+                items = data if isinstance(data, list) else [data]
+                flattened = [self._unwrap_dicts(item) for item in items]
+            return self._to_geodataframe(flattened, crs)
         
         elif self.output_format == "json":
             return data
@@ -345,10 +801,12 @@ class BaseAPI:
             # FeatureCollection but non-spatial: flatten properties + geometry
             rows = [{**f.get("properties", {}), "geometry": f.get("geometry")}
                     for f in data["features"]]
-            return pd.json_normalize(rows)
+            with self._phase("normalize"):
+                return pd.json_normalize(rows)
         
         else:
-            return pd.json_normalize(data)
+            with self._phase("normalize"):
+                return pd.json_normalize(data)
 
     def _unwrap_dicts(self, data):
         for key in ["field", "crop", "address", "layer_type", "statistics", "preview"]:
@@ -358,6 +816,85 @@ class BaseAPI:
                 data.pop(key, None)
         return data
 
+    def _map_concurrent(self, fn, items, max_workers=None):
+        """Call fn(item) for every item with bounded concurrency.
+
+        Exceptions are captured rather than raised, so one failing item does
+        not abort the batch.
+
+        Returns:
+            list: (result, error) tuples in input order; error is None on success.
+        """
+        items = list(items)
+
+        def call(item):
+            try:
+                return fn(item), None
+            except Exception as e:
+                return None, e
+
+        if not items:
+            return []
+        workers = min(max_workers or self.max_workers, len(items))
+        if workers <= 1:
+            return [call(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(call, items))
+
+    def _id_list(self, kind, ids):
+        """Unique ids, in order, from a list, Series, scalar or DataFrame
+        (its '<kind>_id' column, else 'id')."""
+        if hasattr(ids, "columns"):
+            column = f"{kind}_id" if f"{kind}_id" in ids.columns else "id"
+            if column not in ids.columns:
+                raise ValueError(f"DataFrame has no '{kind}_id' or 'id' column")
+            ids = ids[column]
+        if hasattr(ids, "tolist"):
+            ids = ids.tolist()
+        elif isinstance(ids, (str, int)):
+            ids = [ids]
+        return list(dict.fromkeys(ids))
+
+    def _delete_many(self, kind, template, ids, max_workers=None, rate=None, dry_run=False,
+                     quiet=False):
+        """Delete records concurrently through `template` (e.g. 'layers/{id}').
+
+        ids may be a list, a Series or a DataFrame (its '<kind>_id' or 'id'
+        column, e.g. 'field_id' for kind 'field'); duplicates are sent once.
+        rate caps requests per second across all workers. With dry_run nothing
+        is sent and every row gets status 'would delete'. Progress goes to a
+        single stderr line unless quiet.
+
+        Returns:
+            pd.DataFrame: One row per id with 'kind', 'id', 'status'
+            ('deleted', 'failed' or 'would delete') and 'error' columns.
+        """
+        import pandas as pd
+
+        ids = self._id_list(kind, ids)
+        status = pd.DataFrame({"kind": kind, "id": ids, "status": "would delete", "error": None})
+        if dry_run or not ids:
+            self._log(f"{kind} delete{' (dry run)' if dry_run else ''}: {len(ids)} records")
+            return status
+        limiter = RateLimiter(rate) if rate else None
+        progress = Progress(f"Deleting {kind}s", len(ids), quiet=quiet)
+
+        def delete(record_id):
+            if limiter:
+                limiter.acquire()
+            try:
+                self._delete(template.format(id=record_id))
+            except Exception:
+                progress.update(ok=False)
+                raise
+            progress.update()
+
+        outcomes = self._map_concurrent(delete, ids, max_workers)
+        status["status"] = ["failed" if error else "deleted" for _, error in outcomes]
+        status["error"] = [str(error) if error else None for _, error in outcomes]
+        self._log(f"{kind} delete: {status['status'].value_counts().to_dict()}")
+        return status
+
     def _validate_numeric_fields(self, data: dict, fields: list[str]):
         for field in fields:
             if field in data and data[field] is not None:
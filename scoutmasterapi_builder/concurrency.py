@@ -0,0 +1,256 @@
+import functools
+import json
+import sys
+import threading
+import time
+from concurrent.futures import wait
+
+from .singleflight import clone
+
+
+class Submitter:
+    """Non-blocking counterparts of every public client method.
+
+    >>> futures = [api.submit.field_by_id(i) for i in field_ids]
+    >>> fields = api.gather(futures)
+
+    Each call is queued on the client's shared, bounded thread pool (see
+    BaseAPI._get_executor) and returns a concurrent.futures.Future; all calls
+    share the client's connection pool, token and caches. Methods must not
+    wait on other submitted calls, or a full pool deadlocks.
+    """
+
+    def __init__(self, api):
+        self._api = api
+
+    def __getattr__(self, name):
+        method = getattr(self._api, name, None) if not name.startswith("_") else None
+        if not callable(method) or not callable(getattr(type(self._api), name, None)):
+            raise AttributeError(f"'{type(self._api).__name__}' has no method '{name}' to submit")
+
+        @functools.wraps(method)
+        def submit(*args, **kwargs):
+            return self._api._get_executor().submit(method, *args, **kwargs)
+
+        return submit
+
+    def __dir__(self):
+        cls = type(self._api)
+        return sorted(name for name in dir(cls)
+                      if not name.startswith("_") and callable(getattr(cls, name, None)))
+
+
+def gather(futures, return_exceptions=False, timeout=None):
+    """Wait for futures and return their results in input order.
+
+    Args:
+        futures (iterable[Future]): Futures, e.g. from api.submit.
+        return_exceptions (bool): Put a failed call's exception in its slot
+            instead of raising the first failure (in input order).
+        timeout (float, optional): Seconds to wait for all futures; raises
+            TimeoutError when exceeded.
+    Returns:
+        list: One result (or exception) per future.
+    """
+    futures = list(futures)
+    _, pending = wait(futures, timeout=timeout)
+    if pending:
+        raise TimeoutError(f"{len(pending)} of {len(futures)} calls did not finish in {timeout}s")
+    results = []
+    for future in futures:
+        error = future.exception()
+        if error is not None and not return_exceptions:
+            raise error
+        results.append(error if error is not None else future.result())
+    return results
+
+
+class BatchCall:
+    """Handle for one call recorded in a Batch; result() is available once
+    the batch has run. `index` is the call's position in the batch (unique);
+    `key` its first argument, for display."""
+
+    def __init__(self, method, args, kwargs, index=None):
+        self.index = index
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.key = args[0] if args else next(iter(kwargs.values()), None)
+        self.done = False
+        self.value = None
+        self.error = None
+
+    def result(self):
+        if not self.done:
+            raise RuntimeError("The batch has not run yet")
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def __repr__(self):
+        state = "pending" if not self.done else "failed" if self.error else "done"
+        return f"<BatchCall #{self.index} {self.method}({self.key!r}) {state}>"
+
+
+class Batch:
+    """Collects client calls and dispatches them concurrently on exit.
+
+    >>> with api.batch(max_concurrency=16) as b:
+    ...     for field_id in field_ids:
+    ...         b.layers(field_id, layer_type_id=t)
+    >>> b.combined    # one DataFrame with 'batch_call' and 'batch_key' columns (df output)
+    >>> b.errors      # failed calls, with their exceptions
+
+    Identical calls (same method and arguments) are sent once and their result
+    is copied to every duplicate. Failures are captured per call rather than
+    raised. Calls are identified by their position in the batch ('batch_call');
+    their key ('batch_key') is the first argument (or first keyword value),
+    which need not be unique.
+    """
+
+    def __init__(self, api, max_concurrency=None):
+        self._api = api
+        self.max_concurrency = max_concurrency
+        self.calls = []
+        self.ran = False
+
+    def __getattr__(self, name):
+        method = getattr(self._api, name, None) if not name.startswith("_") else None
+        if not callable(method) or not callable(getattr(type(self._api), name, None)):
+            raise AttributeError(f"'{type(self._api).__name__}' has no method '{name}' to batch")
+
+        @functools.wraps(method)
+        def record(*args, **kwargs):
+            if self.ran:
+                raise RuntimeError("This batch has already run")
+            call = BatchCall(name, args, kwargs, index=len(self.calls))
+            self.calls.append(call)
+            return call
+
+        return record
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.run()
+
+    def run(self):
+        """Dispatch all recorded calls; returns self."""
+        unique = {}
+        for call in self.calls:
+            unique.setdefault(_call_key(call), []).append(call)
+        groups = list(unique.values())
+        outcomes = self._api._map_concurrent(
+            lambda group: getattr(self._api, group[0].method)(*group[0].args, **group[0].kwargs),
+            groups, self.max_concurrency)
+        for group, (value, error) in zip(groups, outcomes):
+            for i, call in enumerate(group):
+                call.value = value if i == 0 or error is not None else _copy(value)
+                call.error = error
+                call.done = True
+        self.ran = True
+        self._api._log(f"batch: {len(self.calls)} calls, {len(groups)} sent, "
+                       f"{len(self.errors)} failed")
+        return self
+
+    @property
+    def results(self):
+        """Result per recorded call in call order (None for failed calls)."""
+        return [call.value for call in self.calls]
+
+    @property
+    def errors(self):
+        """Recorded calls that failed."""
+        return [call for call in self.calls if call.error is not None]
+
+    @property
+    def combined(self):
+        """All successful results in one DataFrame with 'batch_call' (the
+        call's position), 'batch_key' (and 'batch_method' when several methods
+        were batched) columns when the results are DataFrames; otherwise a
+        {call position: result} dict."""
+        ok = [call for call in self.calls if call.error is None]
+        if ok and all(hasattr(call.value, "assign") for call in ok):
+            import pandas as pd
+
+            several = len({call.method for call in ok}) > 1
+            frames = []
+            for call in ok:
+                frame = call.value.copy()
+                frame.insert(0, "batch_call", call.index)
+                frame.insert(1, "batch_key", [call.key] * len(frame))
+                if several:
+                    frame.insert(2, "batch_method", call.method)
+                frames.append(frame)
+            return pd.concat(frames, ignore_index=True)
+        return {call.index: call.value for call in ok}
+
+
+def _call_key(call):
+    try:
+        return call.method, json.dumps([call.args, call.kwargs], sort_keys=True)
+    except (TypeError, ValueError):
+        return call.method, id(call)  # non-JSON arguments (e.g. DataFrames): never deduplicated
+
+
+def _copy(value):
+    if hasattr(value, "copy") and not isinstance(value, (dict, list)):
+        return value.copy()
+    return clone(value)
+
+
+class RateLimiter:
+    """Token bucket shared by concurrent workers: at most `rate` acquisitions
+    per second on average, with bursts of up to `burst` (default: one
+    second's worth). acquire() blocks until a token is available."""
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(burst or max(rate, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rate
+            time.sleep(wait_for)
+
+
+class Progress:
+    """Thread-safe done/failed counter that redraws one status line on
+    stderr at most every `interval` seconds (never when quiet)."""
+
+    def __init__(self, label, total, quiet=False, interval=0.5):
+        self.label = label
+        self.total = total
+        self.quiet = quiet
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self._shown = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, ok=True):
+        with self._lock:
+            self.done += 1
+            self.failed += not ok
+            now = time.monotonic()
+            if not self.quiet and (now - self._shown >= self.interval or self.done == self.total):
+                self._shown = now
+                sys.stderr.write(f"\r{self.label}: {self.done}/{self.total}"
+                                 f"{f', {self.failed} failed' if self.failed else ''}")
+                if self.done == self.total:
+                    sys.stderr.write("\n")
+                sys.stderr.flush()
@@ -0,0 +1,169 @@
+import json
+import os
+import time
+
+# Per-field child tables: table -> endpoint template (records get a field_id column).
+FIELD_CHILDREN = {
+    "layers": "fields/{id}/layers",
+    "cultivations": "fields/{id}/calendars",
+    "subscriptions": "fields/{id}/subscriptions",
+}
+TABLES = ("environments", "projects", "environment_projects", "fields") + tuple(FIELD_CHILDREN)
+CHECKPOINT_VERSION = 1
+
+
+class EnvironmentCrawler:
+    """Walks environments -> projects -> fields -> layers / cultivations /
+    subscriptions, level by level, with bounded concurrency at every level.
+
+    Every entity is stored once by id, however many paths lead to it (a
+    project in two environments is fetched, and its fields crawled, once;
+    the membership is kept in the environment_projects link table). With a
+    checkpoint file the crawl state is saved every `checkpoint_every`
+    requests and after each level, and a new crawler with the same file skips
+    everything already fetched. Failed fetches are recorded in `errors` and
+    retried on the next run.
+    """
+
+    def __init__(self, api, environment_ids=None, checkpoint=None, include=None,
+                 max_workers=None, checkpoint_every=200):
+        self.api = api
+        self.environment_ids = environment_ids
+        self.checkpoint = checkpoint
+        self.include = list(include or FIELD_CHILDREN)
+        for table in self.include:
+            if table not in FIELD_CHILDREN:
+                raise ValueError(f"Unknown table '{table}'. Choose from {sorted(FIELD_CHILDREN)}")
+        self.max_workers = max_workers
+        self.checkpoint_every = checkpoint_every
+        self.records = {table: {} for table in TABLES if table != "environment_projects"}
+        self.links = set()  # (environment_id, project_id)
+        self.done = set()  # "table:parent_id" fetches already completed
+        self.errors = []
+        self.requests = 0
+        if checkpoint and os.path.exists(checkpoint):
+            self._load()
+
+    # ── Checkpoint ───────────────────────────────────────────────────────────
+
+    def _load(self):
+        with open(self.checkpoint) as f:
+            state = json.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {state.get('version')}")
+        for table, records in state["records"].items():
+            self.records.setdefault(table, {}).update(records)
+        self.links = {tuple(link) for link in state["links"]}
+        self.done = set(state["done"])
+        self.api._log(f"crawl: resumed from {self.checkpoint} ({len(self.done)} fetches done)")
+
+    def save(self):
+        """Write the crawl state to the checkpoint file (atomically)."""
+        if not self.checkpoint:
+            return
+        state = {"version": CHECKPOINT_VERSION, "records": self.records,
+                 "links": sorted(self.links), "done": sorted(self.done)}
+        tmp = f"{self.checkpoint}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.checkpoint)
+
+    # ── Crawl ────────────────────────────────────────────────────────────────
+
+    def run(self):
+        """Crawl everything not yet fetched; returns tables()."""
+        t0 = time.perf_counter()
+        if self.environment_ids is None:
+            self._fetch([("environments", None, "environments")], self._store_environments)
+            environment_ids = list(self.records["environments"])
+        else:
+            environment_ids = list(self.environment_ids)
+        self._fetch([("projects", e, f"environments/{e}/projects") for e in environment_ids],
+                    self._store_projects)
+        project_ids = sorted({p for e, p in self.links if e in set(environment_ids)})
+        self._fetch([("fields", p, f"projects/{p}/fields") for p in project_ids],
+                    self._store_children)
+        field_ids = [f for f, r in self.records["fields"].items() if r.get("project_id") in set(project_ids)]
+        self._fetch([(table, f, FIELD_CHILDREN[table].format(id=f))
+                     for f in field_ids for table in self.include], self._store_children)
+        self.api._log(f"crawl: {self.requests} requests, {len(self.errors)} failed, "
+                      f"{time.perf_counter() - t0:.1f}s")
+        return self.tables()
+
+    def _fetch(self, tasks, store):
+        """Fetch (table, parent_id, endpoint) tasks concurrently, skipping done ones."""
+        tasks = [t for t in tasks if f"{t[0]}:{t[1]}" not in self.done]
+        for start in range(0, len(tasks), self.checkpoint_every):
+            chunk = tasks[start:start + self.checkpoint_every]
+            results = self.api._map_concurrent(lambda task: self.api._get(task[2]) or [],
+                                               chunk, self.max_workers)
+            self.requests += len(chunk)
+            for (table, parent_id, endpoint), (records, error) in zip(chunk, results):
+                if error is not None:
+                    self.errors.append({"table": table, "parent_id": parent_id,
+                                        "endpoint": endpoint, "error": str(error)})
+                    continue
+                store(table, parent_id, records if isinstance(records, list) else [records])
+                self.done.add(f"{table}:{parent_id}")
+            self.save()
+
+    def _store_environments(self, table, parent_id, records):
+        for record in records:
+            self.records["environments"][str(record["id"])] = record
+
+    def _store_projects(self, table, environment_id, records):
+        for record in records:
+            project_id = str(record["id"])
+            self.records["projects"][project_id] = record
+            self.links.add((environment_id, project_id))
+
+    def _store_children(self, table, parent_id, records):
+        key = "project_id" if table == "fields" else "field_id"
+        for record in records:
+            self.records[table][str(record["id"])] = dict(record, **{key: parent_id})
+
+    # ── Output ───────────────────────────────────────────────────────────────
+
+    def tables(self):
+        """Normalized DataFrames keyed by table name. Nested objects are
+        flattened (e.g. 'crop.name'); foreign keys: projects via
+        environment_projects (environment_id, project_id), fields.project_id,
+        and field_id on layers, cultivations and subscriptions."""
+        import pandas as pd
+
+        out = {}
+        for table, records in self.records.items():
+            out[table] = pd.json_normalize(list(records.values())) if records else pd.DataFrame(columns=["id"])
+        out["environment_projects"] = pd.DataFrame(sorted(self.links),
+                                                   columns=["environment_id", "project_id"])
+        return {table: out[table] for table in TABLES if table in out}
+
+
+class Crawler:
+    def environment_crawl(self, environment_ids=None, checkpoint=None, include=None,
+                          max_workers=None):
+        """
+        Crawl environments and everything below them into normalized tables.
+        Walks environments -> projects -> fields -> layers, cultivations and
+        subscriptions with bounded concurrency per level, fetching every
+        entity once even when it is reachable through several environments.
+        Args:
+            environment_ids (list[str], optional): Environments to crawl
+                (default: all accessible environments).
+            checkpoint (str, optional): JSON file to save progress to and
+                resume from after an interruption.
+            include (list[str], optional): Per-field tables to crawl, from
+                'layers', 'cultivations' and 'subscriptions' (default all).
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+        Returns:
+            dict[str, pd.DataFrame]: 'environments', 'projects',
+            'environment_projects', 'fields', 'layers', 'cultivations' and
+            'subscriptions', linked by environment_id / project_id / field_id.
+        """
+        crawler = EnvironmentCrawler(self, environment_ids, checkpoint=checkpoint,
+                                     include=include, max_workers=max_workers)
+        tables = crawler.run()
+        if crawler.errors:
+            self._log(f"environment_crawl: {len(crawler.errors)} fetches failed; "
+                      f"run again with the same checkpoint to retry them")
+        return tables
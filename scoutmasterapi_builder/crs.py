@@ -0,0 +1,103 @@
+import functools
+
+from .streaming import parse_geometries
+
+# CRSs recognised from a dataset's total bounds when it carries no CRS, tried
+# in order: lon/lat, then Dutch RD New (the usual survey CRS of our fields).
+# Anything else (UTM, Web Mercator, ...) is ambiguous and must be given.
+KNOWN_EXTENTS = (
+    ("EPSG:4326", (-180.0, -90.0, 180.0, 90.0)),
+    ("EPSG:28992", (-7000.0, 289000.0, 300000.0, 629000.0)),
+)
+
+
+def _crs_key(crs):
+    """Hashable, normalised form of an EPSG code, CRS string or pyproj CRS."""
+    if isinstance(crs, int):
+        return f"EPSG:{crs}"
+    if isinstance(crs, str):
+        return crs.strip().upper() if crs.strip().lower().startswith("epsg:") else crs.strip()
+    return crs.to_string()
+
+
+@functools.lru_cache(maxsize=32)
+def _transformer(src, dst):
+    from pyproj import Transformer
+
+    return Transformer.from_crs(src, dst, always_xy=True)
+
+
+def get_transformer(src, dst):
+    """Cached pyproj Transformer (always_xy) from `src` to `dst`.
+
+    Building a Transformer costs milliseconds (a PROJ database lookup), so one
+    is created per (src, dst) pair and reused for every later call.
+    """
+    return _transformer(_crs_key(src), _crs_key(dst))
+
+
+def detect_crs(geometries):
+    """Guess the CRS of a whole dataset from its total bounds (see KNOWN_EXTENTS).
+
+    Raises:
+        ValueError: When the bounds fit no known CRS.
+    """
+    import shapely
+
+    xmin, ymin, xmax, ymax = (float(v) for v in shapely.total_bounds(geometries))
+    for crs, (x0, y0, x1, y1) in KNOWN_EXTENTS:
+        if x0 <= xmin and xmax <= x1 and y0 <= ymin and ymax <= y1:
+            return crs
+    raise ValueError(f"Cannot detect the CRS of bounds {(xmin, ymin, xmax, ymax)}; "
+                     f"pass the source CRS explicitly")
+
+
+def transform_xy(x, y, src, dst):
+    """Reproject coordinate arrays in one vectorized call; returns (x, y) arrays."""
+    import numpy as np
+
+    return get_transformer(src, dst).transform(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+
+
+def _transform_geometries(geometries, src, dst):
+    import numpy as np
+    import shapely
+
+    transformer = get_transformer(src, dst)
+    return shapely.transform(
+        geometries, lambda coords: np.column_stack(transformer.transform(coords[:, 0], coords[:, 1])))
+
+
+def reproject(data, crs=4326, source_crs=None):
+    """Reproject a dataset client-side with a cached transformer.
+
+    All coordinates of all geometries go through the transformer in a single
+    call. The source CRS is taken from `source_crs`, else from the data (for
+    GeoDataFrames/GeoSeries), else detected once from the dataset's bounds.
+
+    Args:
+        data (GeoDataFrame, GeoSeries or list): Data to reproject; a list may
+            hold shapely geometries, GeoJSON dicts, WKT or hex WKB.
+        crs (int or str, optional): Target CRS (default EPSG:4326).
+        source_crs (int or str, optional): CRS of `data`, overriding its own.
+    Returns:
+        Same type as `data` for GeoDataFrames and GeoSeries (with the target
+        CRS set); an ndarray of shapely geometries for lists.
+    """
+    import geopandas as gpd
+
+    if isinstance(data, (gpd.GeoDataFrame, gpd.GeoSeries)):
+        geometries = data.geometry.array if isinstance(data, gpd.GeoDataFrame) else data.array
+        src = source_crs or data.crs or detect_crs(geometries)
+        if _crs_key(src) == _crs_key(crs):
+            return data.set_crs(crs, allow_override=True)
+        series = gpd.GeoSeries(_transform_geometries(geometries, src, crs), index=data.index, crs=crs)
+        if isinstance(data, gpd.GeoSeries):
+            return series.rename(data.name)
+        return data.set_geometry(series.rename(data.geometry.name))
+
+    geometries = parse_geometries(data)
+    src = source_crs or detect_crs(geometries)
+    if _crs_key(src) == _crs_key(crs):
+        return geometries
+    return _transform_geometries(geometries, src, crs)
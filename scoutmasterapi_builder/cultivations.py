@@ -1,5 +1,3 @@
-import pandas as pd
-
 from .base import conceptual_class
 
 
@@ -70,6 +68,8 @@ class Cultivations:
         if self.output_format == "json":
             return data
         elif self.output_format == "df":
+            import pandas as pd
+
             # Convert the 'tsum' list of dicts into a DataFrame
             if len(data) == 0 or len(data["tsum"]) == 0: return pd.DataFrame()
             df = pd.DataFrame(data['tsum'])
@@ -114,3 +114,21 @@ class Cultivations:
         endpoint = f"calendars/{calendar_id}"
         self._delete(endpoint)
 
+    def cultivations_delete_many(self, calendar_ids, max_workers=None, rate=None,
+                                 dry_run=False, quiet=False):
+        """
+        Delete many cultivation calendars concurrently.
+        Args:
+            calendar_ids (list, pd.Series or pd.DataFrame): Calendar IDs, or a
+                frame with a 'calendar_id' or 'id' column.
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+            rate (float, optional): Maximum delete requests per second.
+            dry_run (bool): Only report what would be deleted.
+            quiet (bool): Suppress the progress line.
+        Returns:
+            pd.DataFrame: Per-id 'status' ('deleted', 'failed' or
+            'would delete') and 'error'.
+        """
+        return self._delete_many("calendar", "calendars/{id}", calendar_ids, max_workers,
+                                 rate, dry_run, quiet)
+
@@ -1,4 +1,13 @@
 from .base import conceptual_class
+from .concurrency import RateLimiter
+
+# Reconcilable environment memberships: collection -> (member id key, add, remove).
+MEMBERSHIPS = {
+    "users": ("user_id", "environment_user_add", "environment_user_remove"),
+    "owners": ("user_id", "environment_owner_add", "environment_owner_remove"),
+    "projects": ("project_id", "environment_project_add", "environment_project_remove"),
+    "services": ("service_id", "environment_service_add", "environment_service_remove"),
+}
 
 
 @conceptual_class
@@ -215,3 +224,72 @@ class Environments:
         """
         data = self._delete(f"environments/{environment_id}/services/{service_id}")
         return data
+
+    # ── Reconciliation ───────────────────────────────────────────────────────
+
+    def environment_reconcile(self, environment_id, desired, dry_run=False, max_workers=None,
+                              rate=None):
+        """
+        Bring an environment's users, owners, projects and services to a
+        desired state with the fewest calls.
+        Current memberships are fetched once (concurrently), only the
+        differences are applied, and an environment already in the desired
+        state costs no write calls. Users and projects are added before owners,
+        and owners removed before users.
+        Args:
+            environment_id (str): ID of the environment.
+            desired (dict): Collection -> member ids, for any of 'users',
+                'owners', 'projects' and 'services' (lists, Series, or frames
+                with a 'user_id' / 'project_id' / 'service_id' or 'id' column).
+                Collections that are left out are not touched; an empty list
+                removes every member.
+            dry_run (bool): Only return the planned changes.
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+            rate (float, optional): Maximum write requests per second.
+        Returns:
+            pd.DataFrame: One row per change with 'collection', 'action'
+            ('add' or 'remove'), 'id', 'status' ('planned', 'done' or 'failed')
+            and 'error'.
+        """
+        import pandas as pd
+
+        unknown = set(desired) - set(MEMBERSHIPS)
+        if unknown:
+            raise ValueError(f"Unknown collections {sorted(unknown)}. Choose from {list(MEMBERSHIPS)}")
+        collections = [c for c in MEMBERSHIPS if c in desired]
+        fetched = self._map_concurrent(
+            lambda c: self._get(f"environments/{environment_id}/{c}") or [], collections, max_workers)
+        changes = []
+        for collection, (records, error) in zip(collections, fetched):
+            if error is not None:
+                raise Exception(f"Fetching environment {collection} failed: {error}")
+            key = MEMBERSHIPS[collection][0]
+            current = {str(r.get(key) or r.get("id")): r.get(key) or r.get("id") for r in records}
+            wanted = {str(m): m for m in self._id_list(key[:-3], desired[collection])}
+            changes += [(collection, "add", wanted[m]) for m in wanted if m not in current]
+            changes += [(collection, "remove", current[m]) for m in current if m not in wanted]
+        status = pd.DataFrame(changes, columns=["collection", "action", "id"])
+        status["status"], status["error"] = "planned", None
+        if dry_run or not changes:
+            self._log(f"environment_reconcile: {len(changes)} changes planned")
+            return status
+
+        limiter = RateLimiter(rate) if rate else None
+
+        def apply(change):
+            collection, action, member_id = change
+            _, add, remove = MEMBERSHIPS[collection]
+            if limiter:
+                limiter.acquire()
+            return getattr(self, add if action == "add" else remove)(environment_id, member_id)
+
+        # Owners must be members: add members (and drop owners) first.
+        first = [i for i, (c, a, _) in enumerate(changes) if (c == "owners") == (a == "remove")]
+        second = [i for i in range(len(changes)) if i not in set(first)]
+        for phase in (first, second):
+            outcomes = self._map_concurrent(apply, [changes[i] for i in phase], max_workers)
+            for i, (_, error) in zip(phase, outcomes):
+                status.at[i, "status"] = "failed" if error else "done"
+                status.at[i, "error"] = str(error) if error else None
+        self._log(f"environment_reconcile: {status.groupby(['action', 'status']).size().to_dict()}")
+        return status
@@ -1,9 +1,15 @@
-import pandas as pd
+import time
+
 import requests
 
+from .crs import reproject
+from .geometry import validate_geometries
+from .spatial import FieldIndex
+
 
 class Fields:
-    def fields(self, project_id, page=None, limit=None, order=None, lang=None, sort_by=None, crs=None):
+    def fields(self, project_id, page=None, limit=None, order=None, lang=None, sort_by=None, crs=None,
+               chunksize=None):
         """
         Get all the fields that are used within the specified project.
         Args:
@@ -14,8 +20,11 @@ class Fields:
             lang (str, optional): Language for field labels.
             sort_by (str, optional): 'name', 'created_at' or 'updated_at'.
             crs (int, optional): Output CRS EPSG code (default 4326).
+            chunksize (int, optional): Stream the response and yield it in
+                chunks of this many fields instead of loading it whole.
         Returns:
-            pd.DataFrame or list: Fields as DataFrame or JSON list.
+            pd.DataFrame or list: Fields as DataFrame or JSON list; a generator
+            of those (one per chunk) when chunksize is given.
         """
         endpoint = f"projects/{project_id}/fields"
         params = {}
@@ -28,8 +37,32 @@ class Fields:
         # spatial shaping is done client-side from the WKT geometry the regular
         # endpoint returns, so pagination is preserved. Use fields_geojson() for
         # the server's GeoJSON FeatureCollection.
+        if chunksize:
+            return self._format_stream(endpoint, params, key="data", chunksize=chunksize, crs=crs)
         data = self._get(endpoint, params=params)
-        return self._format_output(data)
+        return self._format_output(data, crs)
+
+    def fields_geojson(self, project_id, lang=None, crs=None, chunksize=None):
+        """
+        Get a project's fields as a GeoJSON FeatureCollection.
+        Args:
+            project_id (str): UUID of the project.
+            lang (str, optional): Language for field labels.
+            crs (int, optional): Output CRS EPSG code (default 4326).
+            chunksize (int, optional): Stream the FeatureCollection and yield
+                it in chunks of this many features instead of loading it whole.
+        Returns:
+            GeoDataFrame, dict, or JSON depending on output_format; a generator
+            of those (one per chunk) when chunksize is given.
+        """
+        endpoint = f"projects/{project_id}/fields/geojson"
+        params = {}
+        if lang: params["lang"] = lang
+        if crs: params["crs"] = crs
+        if chunksize:
+            return self._format_stream(endpoint, params, chunksize=chunksize, crs=crs)
+        data = self._get(endpoint, params=params)
+        return self._format_output(data, crs)
 
     def field_by_id(self, field_id):
         """
@@ -62,6 +95,67 @@ class Fields:
         data = self._get(endpoint, params=params)
         return self._format_output(data)
         
+    def fields_index(self, project_id, refresh=False, max_age=None):
+        """
+        Get the client-side spatial index (STRtree) of a project's fields.
+        The index is cached per project; refreshing re-lists the fields and
+        re-parses only geometries that changed.
+        Args:
+            project_id (str): The ID of the project.
+            refresh (bool, optional): Re-list the fields and update the index.
+            max_age (float, optional): Refresh when the index is older than
+                this many seconds.
+        Returns:
+            FieldIndex: index with locate() and nearest() bulk queries.
+        """
+        index = self._field_indexes.get(project_id)
+        stale = max_age is not None and index is not None and time.time() - index.built_at > max_age
+        if index is None or refresh or stale:
+            records = self._get(f"projects/{project_id}/fields")
+            if index is None:
+                index = self._field_indexes[project_id] = FieldIndex(records)
+            else:
+                index.update(records)
+        return index
+
+    def fields_by_locations(self, project_id, lat, lon, nearest=False, max_distance=None,
+                            refresh=False):
+        """
+        Assign many points to the fields of a project in one vectorized call,
+        using the cached spatial index instead of one request per point (see
+        field_by_location).
+        Args:
+            project_id (str): The ID of the project
+            lat (array-like): Latitudes of the points.
+            lon (array-like): Longitudes of the points.
+            nearest (bool, optional): Also assign points outside every field
+                to the nearest field, and report the distance.
+            max_distance (float, optional): With nearest=True, leave points
+                further than this (in degrees) unassigned.
+            refresh (bool, optional): Refresh the index first.
+        Returns:
+            pd.DataFrame or list: One row per point with lat, lon, field_id
+            (None when unmatched) and, with nearest=True, distance.
+        """
+        index = self.fields_index(project_id, refresh=refresh)
+        if nearest:
+            field_ids, distances = index.nearest(lon, lat, max_distance=max_distance)
+        else:
+            field_ids, distances = index.locate(lon, lat), None
+        if self.output_format == "json":
+            rows = [{"lat": float(y), "lon": float(x), "field_id": f}
+                    for y, x, f in zip(_as_list(lat), _as_list(lon), field_ids)]
+            if distances is not None:
+                for row, d in zip(rows, distances):
+                    row["distance"] = None if d != d else float(d)
+            return rows
+        import pandas as pd
+
+        df = pd.DataFrame({"lat": _as_list(lat), "lon": _as_list(lon), "field_id": field_ids})
+        if distances is not None:
+            df["distance"] = distances
+        return df
+
     def fields_create(self, project_id, field_data):
         """
         Create a new field in the specified project.
@@ -80,6 +174,8 @@ class Fields:
             pd.DataFrame or dict: Created field.
         """
         endpoint = f"projects/{project_id}/fields"
+        if field_data.get("geometry") is not None:
+            field_data = dict(field_data, geometry=self._prepare_geometries([field_data["geometry"]])[0])
         try:
             data = self._post(endpoint, field_data)
             return self._format_output(data)
@@ -87,6 +183,107 @@ class Fields:
         except requests.exceptions.RequestException as e:
             raise Exception(f"Request failed: {e}")
 
+    def fields_validate(self, fields, repair=True, min_area=None, max_area=None,
+                        allow_multipart=True):
+        """
+        Check and repair field geometries locally, all at once.
+        Detects empty, non-polygon, invalid (e.g. self-intersecting),
+        degenerate and multi-part geometries, coordinates outside lon/lat
+        bounds and areas outside the given limits. Invalid polygons are
+        repaired with make_valid where the result is still a polygon.
+        Args:
+            fields (GeoDataFrame): Fields to check; reprojected to EPSG:4326
+                when in another CRS.
+            repair (bool, optional): Repair invalid polygons instead of rejecting them.
+            min_area (float, optional): Minimum field area in square metres.
+            max_area (float, optional): Maximum field area in square metres.
+            allow_multipart (bool, optional): Accept multi-part polygons.
+        Returns:
+            (GeoDataFrame, pd.DataFrame): The fields in EPSG:4326 with repaired
+            geometries, and a report indexed like `fields` with 'valid',
+            'repaired', 'rejected', 'area_m2' and 'issues'.
+        """
+        import pandas as pd
+        import geopandas as gpd
+
+        if not isinstance(fields, gpd.GeoDataFrame):
+            fields = gpd.GeoDataFrame(fields, geometry="geometry", crs="EPSG:4326")
+        if fields.crs is not None and not fields.crs.equals("EPSG:4326"):
+            fields = reproject(fields, "EPSG:4326")
+        geoms, result = validate_geometries(fields.geometry.array, repair=repair, min_area=min_area,
+                                            max_area=max_area, allow_multipart=allow_multipart)
+        fields = fields.set_geometry(gpd.GeoSeries(geoms, index=fields.index, crs="EPSG:4326"))
+        report = pd.DataFrame({
+            "valid": [not issues for issues in result["issues"]],
+            "repaired": result["repaired"],
+            "rejected": result["rejected"],
+            "area_m2": result["area_m2"],
+            "issues": ["; ".join(issues) or None for issues in result["issues"]],
+        }, index=fields.index)
+        return fields, report
+
+    def fields_create_many(self, project_id, fields, user_id=None, repair=True, min_area=None,
+                           max_area=None, allow_multipart=True, max_workers=None):
+        """
+        Validate and create many fields.
+        All geometries are checked (and repaired where safe) with
+        fields_validate before any request is sent; rejected rows are reported
+        and skipped. The remaining fields are created concurrently.
+        Args:
+            project_id (str): UUID of the project.
+            fields (GeoDataFrame): One row per field with 'name', geometry and
+                optionally 'user_id', 'description' and 'properties' (dict).
+            user_id (str, optional): User for rows without a 'user_id' value.
+            repair, min_area, max_area, allow_multipart: See fields_validate.
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+        Returns:
+            pd.DataFrame: Per-row status indexed like `fields`, with 'status'
+            ('created', 'failed' or 'invalid'), 'field_id', 'repaired', 'issues'
+            and 'error'.
+        """
+        if not fields.index.is_unique:
+            raise ValueError("fields must have a unique index")
+        fields, report = self.fields_validate(fields, repair=repair, min_area=min_area,
+                                              max_area=max_area, allow_multipart=allow_multipart)
+        status = report[["repaired", "issues"]].copy()
+        status.insert(0, "status", "pending")
+        status.insert(1, "field_id", None)
+        status["error"] = None
+
+        payloads = {}
+        for label, row in fields.drop(columns=fields.geometry.name).iterrows():
+            missing = [k for k in ("name",) if not isinstance(row.get(k), str) or not row.get(k)]
+            if not (row.get("user_id") or user_id):
+                missing.append("user_id")
+            if missing or report.at[label, "rejected"]:
+                status.at[label, "status"] = "invalid"
+                status.at[label, "error"] = (f"missing {', '.join(missing)}" if missing
+                                             else report.at[label, "issues"])
+                continue
+            properties = dict(row.get("properties") or {}) if isinstance(row.get("properties"), dict) else {}
+            if isinstance(row.get("description"), str): properties["description"] = row["description"]
+            payloads[label] = {"user_id": row.get("user_id") or user_id, "name": row["name"],
+                               "properties": properties}
+
+        valid = list(payloads)
+        geometries = self._prepare_geometries(fields.geometry[valid].array)
+        for label, geometry in zip(valid, geometries):
+            payloads[label]["geometry"] = geometry.__geo_interface__
+
+        endpoint = f"projects/{project_id}/fields"
+        created = self._map_concurrent(lambda label: self._post(endpoint, payloads[label]),
+                                       valid, max_workers)
+        for label, (result, error) in zip(valid, created):
+            field_id = result.get("id") if isinstance(result, dict) else None
+            if field_id is None:
+                status.at[label, "status"] = "failed"
+                status.at[label, "error"] = str(error) if error else "no field id returned"
+            else:
+                status.at[label, "status"] = "created"
+                status.at[label, "field_id"] = field_id
+        self._log(f"fields_create_many: {status['status'].value_counts().to_dict()}")
+        return status
+
     def field_update(self, field_id, name=None, geometry=None):
         """
         Update a field name and/or geometry.
@@ -100,21 +297,81 @@ class Fields:
         endpoint = f"fields/{field_id}"
         payload = {}
         if name is not None: payload["name"] = name
-        if geometry is not None: payload["geometry"] = geometry
+        if geometry is not None: payload["geometry"] = self._prepare_geometries([geometry])[0]
         data = self._patch(endpoint, payload)
         return data
 
-    def field_delete(self, field_id):
+    def field_delete(self, field_id, quiet=False):
         """
         Delete a field by ID.
         Args:
             field_id (str): UUID of the field.
+            quiet (bool): Do not print a confirmation line.
         Returns:
             bool: True if the field was deleted successfully (204 No Content).
         """
         endpoint = f"fields/{field_id}"
         deleted = self._delete(endpoint)
-        if deleted:
+        if deleted and not quiet:
             print(f" > Field \033[94m{field_id}\033[0m deleted successfully.")
         return deleted
 
+    def fields_delete_many(self, field_ids, cascade=False, max_workers=None, rate=None,
+                           dry_run=False, quiet=False):
+        """
+        Delete many fields concurrently.
+        With cascade, each field's layers, observations and cultivation
+        calendars are deleted before the field itself; a field whose
+        dependents could not all be listed or deleted is skipped.
+        Args:
+            field_ids (list, pd.Series or pd.DataFrame): Field IDs, or a frame
+                with a 'field_id' or 'id' column.
+            cascade (bool): Delete dependent records first (see above).
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+            rate (float, optional): Maximum delete requests per second.
+            dry_run (bool): Only report what would be deleted (dependents are
+                still listed when cascading).
+            quiet (bool): Suppress progress lines.
+        Returns:
+            pd.DataFrame: One row per record with 'kind', 'id', 'status'
+            ('deleted', 'failed', 'skipped' or 'would delete'), 'error' and,
+            for dependents, their 'field_id'.
+        """
+        import pandas as pd
+
+        if not cascade:
+            return self._delete_many("field", "fields/{id}", field_ids, max_workers, rate,
+                                     dry_run, quiet)
+        ids = self._id_list("field", field_ids)
+        blocked = {}  # field_id -> reason it cannot be deleted
+        stages = []
+        for kind, collection in (("layer", "layers"), ("observation", "observations"),
+                                 ("calendar", "calendars")):
+            listed = self._map_concurrent(
+                lambda field_id: self._get(f"fields/{field_id}/{collection}") or [],
+                ids, max_workers)
+            children = {}
+            for field_id, (records, error) in zip(ids, listed):
+                if error is not None:
+                    blocked.setdefault(field_id, f"listing {collection} failed: {error}")
+                for record in records or []:
+                    children[record["id"]] = field_id
+            status = self._delete_many(kind, collection + "/{id}", list(children),
+                                       max_workers, rate, dry_run, quiet)
+            status["field_id"] = status["id"].map(children)
+            for field_id in status.loc[status["status"] == "failed", "field_id"]:
+                blocked.setdefault(field_id, f"deleting {kind}s failed")
+            stages.append(status)
+        remaining = [field_id for field_id in ids if field_id not in blocked]
+        deleted = self._delete_many("field", "fields/{id}", remaining, max_workers, rate,
+                                    dry_run, quiet)
+        skipped = pd.DataFrame({"kind": "field", "id": list(blocked), "status": "skipped",
+                                "error": list(blocked.values())})
+        result = pd.concat([*stages, deleted, skipped], ignore_index=True)
+        counts = result.groupby(["kind", "status"]).size().to_dict()
+        self._log(f"fields_delete_many: {counts}")
+        return result
+
+
+def _as_list(values):
+    return list(values) if hasattr(values, "__len__") and not isinstance(values, str) else [values]
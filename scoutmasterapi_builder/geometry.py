@@ -0,0 +1,164 @@
+import json
+
+from .streaming import _is_hex, parse_geometries
+
+# Metres per degree of latitude, and of longitude at the equator.
+_M_PER_DEG_LAT = 110540.0
+_M_PER_DEG_LON = 111320.0
+
+
+def preprocess_geometries(values, decimals=7, tolerance=None, remove_repeated=True, orient=True):
+    """Shrink upload geometries without visible change, in bulk.
+
+    All geometries are processed with vectorized shapely operations, in this
+    order: topology-preserving simplification, duplicate-vertex removal,
+    coordinate quantization and ring orientation (exterior counter-clockwise,
+    holes clockwise, as RFC 7946 prescribes). Each value is returned in the
+    encoding it came in: GeoJSON dict, WKT, hex WKB or shapely geometry.
+
+    Args:
+        values (iterable): Geometries; None passes through.
+        decimals (int, optional): Decimal places to keep; 7 is ~1 cm in
+            degrees. None disables quantization.
+        tolerance (float, optional): Simplification tolerance in metres. Lon/lat
+            input is simplified in a local metric frame around the dataset's
+            mean latitude; other coordinates are taken to be in metres.
+        remove_repeated (bool): Drop consecutive duplicate vertices.
+        orient (bool): Fix polygon ring orientation.
+    Returns:
+        list: The processed geometries.
+    """
+    import numpy as np
+    import shapely
+
+    values = list(values)
+    geoms = parse_geometries(values)
+    present = np.array([g is not None for g in geoms], dtype=bool)
+    if not present.any():
+        return values
+    g = geoms[present]
+
+    if tolerance:
+        xmin, ymin, xmax, ymax = shapely.total_bounds(g)
+        if -180 <= xmin and xmax <= 180 and -90 <= ymin and ymax <= 90:
+            lat0 = np.radians((ymin + ymax) / 2)
+            scale = np.array([_M_PER_DEG_LON * np.cos(lat0), _M_PER_DEG_LAT])
+        else:
+            scale = np.array([1.0, 1.0])
+        g = shapely.transform(g, lambda coords: coords * scale)
+        g = shapely.simplify(g, tolerance, preserve_topology=True)
+        g = shapely.transform(g, lambda coords: coords / scale)
+    if remove_repeated:
+        g = shapely.remove_repeated_points(g)
+    if decimals is not None:
+        g = shapely.set_precision(g, 10.0 ** -decimals)
+    if orient:
+        # set_precision normalizes rings, so orientation is fixed last.
+        g = shapely.orient_polygons(g, exterior_cw=False)
+    geoms[present] = g
+
+    # Encode back per input encoding, one vectorized writer call each.
+    out = list(values)
+    kinds = {}
+    for i, value in enumerate(values):
+        if geoms[i] is not None:
+            kind = ("geojson" if isinstance(value, dict) else
+                    ("wkb" if _is_hex(value) else "wkt") if isinstance(value, str) else "shapely")
+            kinds.setdefault(kind, []).append(i)
+    for kind, idx in kinds.items():
+        subset = geoms[idx]
+        if kind == "geojson":
+            encoded = [json.loads(s) for s in shapely.to_geojson(subset)]
+        elif kind == "wkb":
+            encoded = shapely.to_wkb(subset, hex=True)
+        elif kind == "wkt":
+            encoded = shapely.to_wkt(subset, rounding_precision=-1 if decimals is None else decimals)
+        else:
+            encoded = subset
+        for i, value in zip(idx, encoded):
+            out[i] = value
+    return out
+
+
+def validate_geometries(values, repair=True, min_area=None, max_area=None, allow_multipart=True):
+    """Check and repair field geometries in bulk, before anything is uploaded.
+
+    Runs vectorized checks over all geometries at once: missing or empty,
+    not a (multi)polygon, invalid (self-intersections, bad rings; the GEOS
+    reason is reported), degenerate (zero area), multi-part, lon/lat out of
+    bounds and area limits. With repair=True invalid polygons are fixed with
+    make_valid (structure method, collapsed parts dropped); a repair counts as
+    safe when the result is still a non-empty polygon, otherwise the
+    geometry is rejected.
+
+    Args:
+        values (iterable): Lon/lat geometries as shapely geometries, GeoJSON
+            dicts, WKT or hex WKB.
+        repair (bool): Repair invalid polygons instead of rejecting them.
+        min_area (float, optional): Minimum area in square metres.
+        max_area (float, optional): Maximum area in square metres.
+        allow_multipart (bool): Accept MultiPolygons with several parts.
+    Returns:
+        (ndarray, dict): The (repaired) shapely geometries and a report of
+        equal-length arrays: 'issues' (list of messages per geometry),
+        'repaired' (bool), 'rejected' (bool) and 'area_m2'.
+    """
+    import numpy as np
+    import shapely
+
+    values = list(values)
+    geoms = parse_geometries(values)
+    n = len(geoms)
+    issues = [[] for _ in range(n)]
+    rejected = np.zeros(n, dtype=bool)
+    repaired = np.zeros(n, dtype=bool)
+
+    def flag(mask, message, reject=True):
+        for i in np.flatnonzero(mask):
+            issues[i].append(message if isinstance(message, str) else message[i])
+        if reject:
+            rejected[mask] = True
+
+    missing = shapely.is_missing(geoms) | shapely.is_empty(geoms)
+    flag(missing, "empty geometry")
+    type_id = shapely.get_type_id(geoms)
+    polygonal = (type_id == 3) | (type_id == 6)
+    flag(~missing & ~polygonal, "not a polygon")
+    candidates = ~missing & polygonal
+
+    invalid = candidates & ~shapely.is_valid(geoms)
+    if invalid.any():
+        reasons = np.full(n, None, dtype=object)
+        reasons[invalid] = shapely.is_valid_reason(geoms[invalid])
+        flag(invalid, reasons, reject=not repair)
+        if repair:
+            fixed = shapely.make_valid(geoms[invalid], method="structure", keep_collapsed=False)
+            fixed_type = shapely.get_type_id(fixed)
+            safe = ~shapely.is_empty(fixed) & ((fixed_type == 3) | (fixed_type == 6))
+            idx = np.flatnonzero(invalid)
+            geoms[idx[safe]] = fixed[safe]
+            repaired[idx[safe]] = True
+            unrepairable = np.zeros(n, dtype=bool)
+            unrepairable[idx[~safe]] = True
+            flag(unrepairable, "not repairable")
+
+    checked = ~missing & polygonal & ~rejected
+    area = np.full(n, np.nan)
+    if checked.any():
+        g = geoms[checked]
+        xmin, ymin, xmax, ymax = shapely.bounds(g).T
+        inside = np.zeros(n, dtype=bool)
+        inside[checked] = (xmin >= -180) & (xmax <= 180) & (ymin >= -90) & (ymax <= 90)
+        flag(checked & ~inside, "coordinates outside lon/lat bounds")
+        lat = np.radians(shapely.get_y(shapely.centroid(g)))
+        area[checked] = shapely.area(g) * _M_PER_DEG_LON * np.cos(lat) * _M_PER_DEG_LAT
+        flag(checked & (area <= 0), "degenerate (zero area)")
+        multipart = np.zeros(n, dtype=bool)
+        multipart[checked] = shapely.get_num_geometries(g) > 1
+        flag(multipart, "multi-part polygon", reject=not allow_multipart)
+        if min_area is not None:
+            flag(checked & (area < min_area), f"area below {min_area} m2")
+        if max_area is not None:
+            flag(checked & (area > max_area), f"area above {max_area} m2")
+
+    return geoms, {"issues": issues, "repaired": repaired, "rejected": rejected, "area_m2": area}
@@ -165,6 +165,24 @@ class Layers:
         data = self._delete(endpoint)
         return data
 
+    def layers_delete_many(self, layer_ids, max_workers=None, rate=None, dry_run=False,
+                           quiet=False):
+        """
+        Delete many layers concurrently.
+        Args:
+            layer_ids (list, pd.Series or pd.DataFrame): Layer IDs, or a frame
+                with a 'layer_id' or 'id' column.
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+            rate (float, optional): Maximum delete requests per second.
+            dry_run (bool): Only report what would be deleted.
+            quiet (bool): Suppress the progress line.
+        Returns:
+            pd.DataFrame: Per-id 'status' ('deleted', 'failed' or
+            'would delete') and 'error'.
+        """
+        return self._delete_many("layer", "layers/{id}", layer_ids, max_workers, rate,
+                                 dry_run, quiet)
+
     @conceptual
     def layer_metadata(self, layer_id):
         """
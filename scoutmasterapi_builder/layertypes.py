@@ -60,7 +60,7 @@ class LayerTypes:
         endpoint = f"layer-types/{layer_type_id}"
         params = {}
         if lang: params["lang"] = lang
-        data = self._get(endpoint, params=params)
+        data = self._get(endpoint, params=params, cache=True)
         return data
 
     def layer_type_colormap(self, layer_type_id):
@@ -72,7 +72,7 @@ class LayerTypes:
             colormap
         """
         endpoint = f"layer-types/{layer_type_id}/colormap"
-        data = self._get(endpoint)
+        data = self._get(endpoint, cache=True)
         return data
         
         
@@ -0,0 +1,313 @@
+"""Load generator for mixed ScoutMasterAPI workloads.
+
+N virtual users (threads) call a weighted mix of client methods for a fixed
+duration, against the real API or a local stub server:
+
+    python -m scoutmasterapi_builder.loadtest --stub --users 16 --duration 30
+    python -m scoutmasterapi_builder.loadtest --host https://dev-api.scoutmaster.nl/v3/ \\
+        --project-id ... --users 8 --duration 60   # credentials from SCOUTMASTER_CLIENT_ID/SECRET
+
+Reports p50/p95/p99 latency, throughput and error rate per call, and samples
+RSS, thread count and completed calls over time.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+# Default workload: name -> (weight, fn(api, ctx)). Listings, by-id lookups,
+# statistics and uploads in roughly the proportions of interactive use.
+DEFAULT_MIX = {
+    "fields": (4, lambda api, ctx: api.fields(ctx.project_id)),
+    "observations": (3, lambda api, ctx: api.observations(ctx.project_id)),
+    "field_by_id": (3, lambda api, ctx: api.field_by_id(ctx.pick("fields"))),
+    "observation_by_id": (2, lambda api, ctx: api.observation_by_id(ctx.pick("observations"))),
+    "layer_statistics": (2, lambda api, ctx: api.layer_statistics_get(ctx.pick("layers"))),
+    "cultivations_tsum": (1, lambda api, ctx: api.cultivations_tsum(ctx.pick("calendars"))),
+    "observation_create": (1, lambda api, ctx: api.observation_create(
+        ctx.project_id, ctx.user_id, f"LOAD-{ctx.rng.randrange(1 << 30)}",
+        datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        {"type": "Point", "coordinates": [5.0 + ctx.rng.random() / 10, 52.0 + ctx.rng.random() / 10]})),
+}
+
+
+class WorkloadContext:
+    """Ids the workload draws from, discovered once before the run."""
+
+    def __init__(self, api, project_id, user_id=None, seed=0):
+        self.project_id = project_id
+        self.user_id = user_id
+        self.rng = random.Random(seed)
+        self.ids = {}
+        for kind, endpoint in (("fields", f"projects/{project_id}/fields"),
+                               ("observations", f"projects/{project_id}/observations"),
+                               ("layers", f"projects/{project_id}/layers"),
+                               ("calendars", f"projects/{project_id}/calendars")):
+            self.ids[kind] = [r["id"] for r in api._get(endpoint) or []]
+        if self.user_id is None:
+            users = [r.get("user_id") for r in api._get(f"projects/{project_id}/observations") or []]
+            self.user_id = next((u for u in users if u), None)
+
+    def for_user(self, index):
+        """A copy with its own random generator, for one virtual user."""
+        ctx = object.__new__(WorkloadContext)
+        ctx.__dict__.update(self.__dict__)
+        ctx.rng = random.Random(hash((self.rng.random(), index)))
+        return ctx
+
+    def pick(self, kind):
+        ids = self.ids.get(kind)
+        if not ids:
+            raise LookupError(f"No {kind} in project {self.project_id}")
+        return self.rng.choice(ids)
+
+
+def rss_bytes():
+    """Resident set size of this process (Linux /proc; peak RSS elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+
+class LoadTestResult:
+    """Samples of one load test run.
+
+    Attributes:
+        calls (list): (name, start offset, seconds, error message or None).
+        timeline (list[dict]): Periodic samples with 't', 'rss_bytes',
+            'threads' and 'completed'.
+        duration (float): Wall-clock seconds of the run.
+    """
+
+    def __init__(self, calls, timeline, duration, users):
+        self.calls = calls
+        self.timeline = timeline
+        self.duration = duration
+        self.users = users
+
+    def summary(self):
+        """Per call name plus 'ALL': count, errors, error_rate, throughput
+        (calls/s) and mean/p50/p95/p99/max latency in seconds."""
+        groups = {}
+        for name, _, seconds, error in self.calls:
+            groups.setdefault(name, []).append((seconds, error))
+        groups["ALL"] = [(seconds, error) for _, _, seconds, error in self.calls]
+        out = {}
+        for name, samples in groups.items():
+            latencies = sorted(seconds for seconds, _ in samples)
+            errors = sum(1 for _, error in samples if error is not None)
+            out[name] = {
+                "count": len(samples), "errors": errors,
+                "error_rate": errors / len(samples) if samples else 0.0,
+                "throughput": len(samples) / self.duration if self.duration else 0.0,
+                "mean": sum(latencies) / len(latencies) if latencies else float("nan"),
+                "p50": _percentile(latencies, 0.50), "p95": _percentile(latencies, 0.95),
+                "p99": _percentile(latencies, 0.99), "max": latencies[-1] if latencies else float("nan"),
+            }
+        return out
+
+    def errors(self, limit=10):
+        """Most common error messages as (message, count)."""
+        return Counter(error for _, _, _, error in self.calls if error is not None).most_common(limit)
+
+    def report(self):
+        """summary() as a DataFrame, one row per call name."""
+        import pandas as pd
+
+        return pd.DataFrame.from_dict(self.summary(), orient="index")
+
+    def __str__(self):
+        lines = [f"{self.users} users, {self.duration:.1f}s",
+                 f"{'call':<22}{'count':>8}{'err%':>7}{'calls/s':>9}"
+                 f"{'p50':>10}{'p95':>10}{'p99':>10}"]
+        for name, row in self.summary().items():
+            lines.append(f"{name:<22}{row['count']:>8}{row['error_rate'] * 100:>6.1f}%"
+                         f"{row['throughput']:>9.1f}{row['p50'] * 1000:>8.1f}ms"
+                         f"{row['p95'] * 1000:>8.1f}ms{row['p99'] * 1000:>8.1f}ms")
+        lines.append(f"{'t':>6}{'RSS MB':>10}{'threads':>9}{'calls':>8}")
+        for sample in self.timeline:
+            lines.append(f"{sample['t']:>5.0f}s{sample['rss_bytes'] / 1e6:>10.1f}"
+                         f"{sample['threads']:>9}{sample['completed']:>8}")
+        for message, count in self.errors(5):
+            lines.append(f"error x{count}: {message[:120]}")
+        return "\n".join(lines)
+
+
+def run_load_test(api_factory, ctx, users=8, duration=30.0, mix=None, think_time=0.0,
+                  ramp_up=0.0, shared_client=True, sample_interval=1.0, token_refresh=None):
+    """Run virtual users against the API for `duration` seconds.
+
+    Args:
+        api_factory (callable): Returns an authenticated ScoutMasterAPI.
+        ctx (WorkloadContext): Ids to draw from.
+        users (int): Number of concurrent virtual users (threads).
+        duration (float): Seconds to run after ramp-up starts.
+        mix (dict, optional): name -> (weight, fn(api, ctx)); default DEFAULT_MIX.
+        think_time (float): Seconds each user pauses between calls.
+        ramp_up (float): Seconds over which user start times are spread.
+        shared_client (bool): All users share one client (and so its token,
+            connection pool and caches) instead of one client each.
+        sample_interval (float): Seconds between RSS/thread samples.
+        token_refresh (float, optional): Expire the shared token every this
+            many seconds, to exercise concurrent token refreshes.
+    Returns:
+        LoadTestResult
+    """
+    mix = mix or DEFAULT_MIX
+    names = list(mix)
+    weights = [mix[name][0] for name in names]
+    shared = api_factory() if shared_client else None
+    clients = [shared or api_factory() for _ in range(users)]
+    calls, lock = [], threading.Lock()
+    t_start = time.perf_counter()
+    deadline = t_start + duration
+    stop = threading.Event()
+
+    def user(index):
+        api, user_ctx = clients[index], ctx.for_user(index)
+        if ramp_up:
+            time.sleep(ramp_up * index / users)
+        while time.perf_counter() < deadline:
+            name = user_ctx.rng.choices(names, weights)[0]
+            t0 = time.perf_counter()
+            error = None
+            try:
+                mix[name][1](api, user_ctx)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            sample = (name, t0 - t_start, time.perf_counter() - t0, error)
+            with lock:
+                calls.append(sample)
+            if think_time:
+                time.sleep(think_time)
+
+    timeline = []
+
+    def sampler():
+        last_refresh = time.perf_counter()
+        while not stop.is_set():
+            now = time.perf_counter()
+            with lock:
+                completed = len(calls)
+            timeline.append({"t": now - t_start, "rss_bytes": rss_bytes(),
+                             "threads": threading.active_count(), "completed": completed})
+            if token_refresh and now - last_refresh >= token_refresh:
+                for api in {id(c): c for c in clients}.values():
+                    api._token_expiry = 0.0
+                last_refresh = now
+            stop.wait(sample_interval)
+
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(users)]
+    monitor = threading.Thread(target=sampler, daemon=True)
+    monitor.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t_start
+    stop.set()
+    monitor.join()
+    timeline.append({"t": elapsed, "rss_bytes": rss_bytes(),
+                     "threads": threading.active_count(), "completed": len(calls)})
+    return LoadTestResult(calls, timeline, elapsed, users)
+
+
+def _parse_mix(text):
+    """'fields=4,field_by_id=2' -> mix dict over DEFAULT_MIX's calls."""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown call '{name}'. Choose from {sorted(DEFAULT_MIX)}")
+        mix[name] = (float(weight or 1), DEFAULT_MIX[name][1])
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scoutmasterapi_builder.loadtest")
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--mix", help="weights, e.g. 'fields=4,field_by_id=2' (default: all calls)")
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--ramp-up", type=float, default=0.0)
+    parser.add_argument("--per-user-clients", action="store_true",
+                        help="one client per virtual user instead of a shared client")
+    parser.add_argument("--token-refresh", type=float, help="expire the token every N seconds")
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--pool-size", type=int, help="connection pool size of each client")
+    parser.add_argument("--stub", action="store_true", help="run against a local stub server")
+    parser.add_argument("--latency", type=float, default=0.01, help="stub response latency")
+    parser.add_argument("--fields", type=int, default=200, help="stub fields")
+    parser.add_argument("--observations", type=int, default=500, help="stub observations")
+    parser.add_argument("--host", help="API base URL, e.g. https://dev-api.scoutmaster.nl/v3/")
+    parser.add_argument("--token-url")
+    parser.add_argument("--project-id")
+    parser.add_argument("--output-format", default="df")
+    args = parser.parse_args(argv)
+
+    stub = None
+    if args.stub:
+        from .stub import StubData, StubServer
+
+        stub = StubServer(StubData(fields=args.fields, observations=args.observations),
+                          latency=args.latency).start()
+        host, token_url = stub.url, stub.token_url
+        client_id, client_secret = "stub-client", "stub-secret"
+        project_id = args.project_id or stub.data.project_ids[0]
+    else:
+        if not args.host or not args.project_id:
+            parser.error("--host and --project-id are required without --stub")
+        host, token_url, project_id = args.host, args.token_url, args.project_id
+        client_id = os.environ.get("SCOUTMASTER_CLIENT_ID")
+        client_secret = os.environ.get("SCOUTMASTER_CLIENT_SECRET")
+        if not client_id or not client_secret:
+            parser.error("set SCOUTMASTER_CLIENT_ID and SCOUTMASTER_CLIENT_SECRET")
+
+    def api_factory():
+        from .api import ScoutMasterAPI
+
+        api = ScoutMasterAPI(output_format=args.output_format, verbose=False)
+        if args.pool_size:
+            api.pool_size = args.pool_size
+            api.session = api._make_session()
+        api.host = host
+        if token_url:
+            api.token_url = token_url
+        api.authenticate(client_id, client_secret)
+        return api
+
+    import warnings
+
+    warnings.simplefilter("ignore")  # conceptual-endpoint warnings on every call
+    try:
+        ctx = WorkloadContext(api_factory(), project_id)
+        result = run_load_test(api_factory, ctx, users=args.users, duration=args.duration,
+                               mix=_parse_mix(args.mix) if args.mix else None,
+                               think_time=args.think_time, ramp_up=args.ramp_up,
+                               shared_client=not args.per_user_clients,
+                               sample_interval=args.sample_interval,
+                               token_refresh=args.token_refresh)
+    finally:
+        if stub is not None:
+            stub.stop()
+    print(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
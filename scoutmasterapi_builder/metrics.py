@@ -0,0 +1,211 @@
+import os
+import re
+import threading
+from bisect import bisect_left
+from collections import deque
+
+# Latency buckets in seconds (upper bounds, Prometheus style).
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Response size buckets in bytes.
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+_ID_SEGMENT = re.compile(r"\d")
+
+
+def endpoint_template(endpoint):
+    """Collapse a concrete endpoint into its route template.
+
+    Path segments carrying an identifier (UUIDs, numeric ids, invite tokens —
+    anything containing a digit) become '{id}' and the query string is
+    dropped, so 'fields/3f2c…/layers?x=1' maps to 'fields/{id}/layers'.
+    """
+    path = endpoint.split("?", 1)[0].strip("/")
+    return "/".join("{id}" if _ID_SEGMENT.search(seg) else seg for seg in path.split("/"))
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a running count and sum."""
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """(upper_bound, cumulative_count) pairs, ending with +Inf."""
+        total, out = 0, []
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            total += n
+            out.append((bound, total))
+        return out
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {("+Inf" if b == float("inf") else b): n for b, n in self.cumulative()},
+        }
+
+
+class EndpointStats:
+    """Counters and histograms for one (method, endpoint template) pair."""
+
+    def __init__(self, buckets):
+        self.requests = 0
+        self.errors = 0
+        self.status = {}
+        self.latency = Histogram(buckets)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+        self.decode_seconds = 0.0
+        self.format_seconds = 0.0
+        self.format_calls = 0
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "status": dict(self.status),
+            "latency_seconds": self.latency.as_dict(),
+            "response_bytes": self.response_bytes.as_dict(),
+            "decode_seconds": self.decode_seconds,
+            "format_seconds": self.format_seconds,
+            "format_calls": self.format_calls,
+        }
+
+
+class MetricsRegistry:
+    """Per-endpoint request metrics for a BaseAPI client.
+
+    Endpoints are keyed by HTTP method and route template (see
+    endpoint_template). Export with as_dict(), to_prometheus() or spans()
+    (OTLP/JSON shaped span records for OpenTelemetry collectors).
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, max_spans=1000):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._spans = deque(maxlen=max_spans)
+
+    def _entry(self, method, template):
+        key = (method, template)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = EndpointStats(self.buckets)
+        return stats
+
+    def record_request(self, method, template, start, elapsed, status=None, nbytes=0, error=None):
+        """Record one HTTP exchange. `status` is None when the request raised."""
+        failed = error is not None or status is None or status >= 400
+        with self._lock:
+            stats = self._entry(method, template)
+            stats.requests += 1
+            stats.latency.observe(elapsed)
+            stats.response_bytes.observe(nbytes)
+            if status is not None:
+                stats.status[status] = stats.status.get(status, 0) + 1
+            if failed:
+                stats.errors += 1
+            self._spans.append(_span(method, template, start, elapsed, status, nbytes, error))
+
+    def record_decode(self, method, template, seconds):
+        with self._lock:
+            self._entry(method, template).decode_seconds += seconds
+
+    def record_format(self, method, template, seconds):
+        with self._lock:
+            stats = self._entry(method, template)
+            stats.format_seconds += seconds
+            stats.format_calls += 1
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._spans.clear()
+
+    # ── Exporters ────────────────────────────────────────────────────────────
+
+    def as_dict(self):
+        """{'GET fields/{id}/layers': {...}, ...}"""
+        with self._lock:
+            return {f"{m} {t}": s.as_dict() for (m, t), s in sorted(self._stats.items())}
+
+    def to_prometheus(self, prefix="scoutmaster_client"):
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._stats.items())
+            lines = []
+
+            def family(name, kind, help_text):
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+            def labels(method, template, **extra):
+                pairs = {"method": method, "endpoint": template, **extra}
+                return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs.items()) + "}"
+
+            family("requests_total", "counter", "HTTP requests sent.")
+            for (m, t), s in items:
+                lines.append(f"{prefix}_requests_total{labels(m, t)} {s.requests}")
+            family("errors_total", "counter", "Failed HTTP requests (transport error or status >= 400).")
+            for (m, t), s in items:
+                lines.append(f"{prefix}_errors_total{labels(m, t)} {s.errors}")
+            for name, attr, help_text in (
+                ("request_duration_seconds", "latency", "Time until the response body was received."),
+                ("response_size_bytes", "response_bytes", "Response body size."),
+            ):
+                family(name, "histogram", help_text)
+                for (m, t), s in items:
+                    hist = getattr(s, attr)
+                    for bound, n in hist.cumulative():
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{prefix}_{name}_bucket{labels(m, t, le=le)} {n}")
+                    lines.append(f"{prefix}_{name}_sum{labels(m, t)} {hist.sum}")
+                    lines.append(f"{prefix}_{name}_count{labels(m, t)} {hist.count}")
+            family("decode_seconds_total", "counter", "Time spent decoding JSON responses.")
+            for (m, t), s in items:
+                lines.append(f"{prefix}_decode_seconds_total{labels(m, t)} {s.decode_seconds}")
+            family("format_seconds_total", "counter", "Time spent formatting output (DataFrame/GeoJSON).")
+            for (m, t), s in items:
+                lines.append(f"{prefix}_format_seconds_total{labels(m, t)} {s.format_seconds}")
+        return "\n".join(lines) + "\n"
+
+    def spans(self):
+        """Recent requests as OTLP/JSON span dicts (oldest first)."""
+        with self._lock:
+            return list(self._spans)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _span(method, template, start, elapsed, status, nbytes, error):
+    start_ns = int(start * 1e9)
+    attributes = [
+        {"key": "http.request.method", "value": {"stringValue": method}},
+        {"key": "http.route", "value": {"stringValue": template}},
+        {"key": "http.response.body.size", "value": {"intValue": nbytes}},
+    ]
+    if status is not None:
+        attributes.append({"key": "http.response.status_code", "value": {"intValue": status}})
+    if error is not None:
+        attributes.append({"key": "error.type", "value": {"stringValue": type(error).__name__}})
+    failed = error is not None or status is None or status >= 400
+    return {
+        "traceId": os.urandom(16).hex(),
+        "spanId": os.urandom(8).hex(),
+        "name": f"{method} {template}",
+        "kind": 3,  # SPAN_KIND_CLIENT
+        "startTimeUnixNano": start_ns,
+        "endTimeUnixNano": start_ns + int(elapsed * 1e9),
+        "attributes": attributes,
+        "status": {"code": 2 if failed else 1},  # STATUS_CODE_ERROR / _OK
+    }
@@ -0,0 +1,246 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+
+# kind -> endpoint template of the project-level listing it is synced from.
+MIRROR_KINDS = {
+    "fields": "projects/{project_id}/fields",
+    "layers": "projects/{project_id}/layers",
+    "observations": "projects/{project_id}/observations",
+    "cultivations": "projects/{project_id}/calendars",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    project_id TEXT NOT NULL,
+    kind       TEXT NOT NULL,
+    id         TEXT NOT NULL,
+    updated_at TEXT,
+    data       TEXT NOT NULL,
+    PRIMARY KEY (project_id, kind, id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    project_id TEXT NOT NULL,
+    kind       TEXT NOT NULL,
+    watermark  TEXT,
+    synced_at  REAL,
+    PRIMARY KEY (project_id, kind)
+);
+"""
+
+
+class ProjectMirror:
+    """Local SQLite mirror of one project's fields, layers, observations and
+    cultivations, kept up to date with delta syncs.
+
+    sync() pages through each listing sorted by updated_at (newest first) and
+    stops at the first record older than the previous sync's watermark,
+    so an unchanged project costs one small request per kind. Removals are
+    reconciled with a full id listing when the server's record count differs
+    from the local one, or always with full=True.
+
+    Reads (fields(), layers(), ...) are served from the local database and
+    formatted like the live endpoints according to the client's
+    output_format / spatial settings.
+    """
+
+    def __init__(self, api, project_id, path, page_size=500):
+        self.api = api
+        self.project_id = project_id
+        self.path = path
+        self.page_size = page_size
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        with closing(sqlite3.connect(self.path)) as db:
+            with db:  # commit on success, roll back on error
+                yield db
+
+    # ── Sync ─────────────────────────────────────────────────────────────────
+
+    def sync(self, kinds=None, full=False):
+        """Bring the mirror up to date.
+
+        Args:
+            kinds (list[str], optional): Subset of MIRROR_KINDS to sync.
+            full (bool): Re-list everything and reconcile removals regardless
+                of counts.
+        Returns:
+            dict: Per kind: 'upserted', 'removed', 'requests' and 'seconds'.
+        """
+        summary = {}
+        for kind in kinds or MIRROR_KINDS:
+            if kind not in MIRROR_KINDS:
+                raise ValueError(f"Unknown kind '{kind}'. Choose from {sorted(MIRROR_KINDS)}")
+            t0 = time.perf_counter()
+            summary[kind] = self._sync_kind(kind, full)
+            summary[kind]["seconds"] = time.perf_counter() - t0
+            self.api._log(f"mirror {kind}: {summary[kind]['upserted']} upserted, "
+                          f"{summary[kind]['removed']} removed")
+        return summary
+
+    def _sync_kind(self, kind, full):
+        endpoint = MIRROR_KINDS[kind].format(project_id=self.project_id)
+        watermark = None if full else self._watermark(kind)
+        changed, seen, requests, total = [], set(), 0, None
+        page = 1
+        while True:
+            params = {"sort_by": "updated_at", "order": "desc",
+                      "page": page, "limit": self.page_size}
+            body = self.api._get_uncoalesced(endpoint, params, envelope=True)
+            requests += 1
+            records, count = _unpack(body)
+            if total is None:
+                total = count
+            reached_watermark = False
+            # Records updated in the same instant as the watermark are
+            # re-fetched (upserts are idempotent) rather than risk missing one.
+            for record in records:
+                seen.add(str(record["id"]))
+                if watermark is not None and (record.get("updated_at") or "") < watermark:
+                    reached_watermark = True
+                    break
+                changed.append(record)
+            if reached_watermark or len(records) < self.page_size:
+                break
+            page += 1
+
+        removed = 0
+        with self._connect() as db:
+            self._upsert(db, kind, changed)
+            local_count = db.execute(
+                "SELECT COUNT(*) FROM records WHERE project_id = ? AND kind = ?",
+                (self.project_id, kind)).fetchone()[0]
+            listed_everything = watermark is None or not reached_watermark
+            if listed_everything:
+                removed = self._remove_missing(db, kind, seen)
+            elif total is not None and total != local_count:
+                # Something was deleted server-side: list all ids and reconcile.
+                ids, extra = self._list_ids(endpoint)
+                requests += extra
+                removed = self._remove_missing(db, kind, ids)
+            newest = max((r.get("updated_at") or "" for r in changed), default=None)
+            if newest or watermark is None:
+                db.execute(
+                    "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                    (self.project_id, kind, newest or watermark, time.time()))
+            else:
+                db.execute("UPDATE sync_state SET synced_at = ? WHERE project_id = ? AND kind = ?",
+                           (time.time(), self.project_id, kind))
+        return {"upserted": len(changed), "removed": removed, "requests": requests}
+
+    def _list_ids(self, endpoint):
+        ids, page, requests = set(), 1, 0
+        while True:
+            params = {"sort_by": "updated_at", "order": "desc",
+                      "page": page, "limit": self.page_size}
+            records, _ = _unpack(self.api._get_uncoalesced(endpoint, params, envelope=True))
+            requests += 1
+            ids.update(str(r["id"]) for r in records)
+            if len(records) < self.page_size:
+                return ids, requests
+            page += 1
+
+    def _watermark(self, kind):
+        with self._connect() as db:
+            row = db.execute("SELECT watermark FROM sync_state WHERE project_id = ? AND kind = ?",
+                             (self.project_id, kind)).fetchone()
+        return row[0] if row else None
+
+    def _upsert(self, db, kind, records):
+        db.executemany(
+            "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?)",
+            [(self.project_id, kind, str(r["id"]), r.get("updated_at"), json.dumps(r))
+             for r in records])
+
+    def _remove_missing(self, db, kind, ids):
+        local = {row[0] for row in db.execute(
+            "SELECT id FROM records WHERE project_id = ? AND kind = ?", (self.project_id, kind))}
+        stale = local - set(ids)
+        db.executemany("DELETE FROM records WHERE project_id = ? AND kind = ? AND id = ?",
+                       [(self.project_id, kind, i) for i in stale])
+        return len(stale)
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def records(self, kind):
+        """Raw mirrored records of `kind`, newest first."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT data FROM records WHERE project_id = ? AND kind = ? "
+                "ORDER BY updated_at DESC", (self.project_id, kind)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def read(self, kind):
+        """Mirrored records of `kind`, formatted like the live endpoint."""
+        return self.api._format_output(self.records(kind))
+
+    def fields(self):
+        return self.read("fields")
+
+    def layers(self):
+        return self.read("layers")
+
+    def observations(self):
+        return self.read("observations")
+
+    def cultivations(self):
+        return self.read("cultivations")
+
+    def last_synced(self):
+        """{kind: epoch seconds of the last sync}"""
+        with self._connect() as db:
+            rows = db.execute("SELECT kind, synced_at FROM sync_state WHERE project_id = ?",
+                              (self.project_id,)).fetchall()
+        return dict(rows)
+
+    def to_geoparquet(self, kind, path):
+        """Write the mirrored `kind` to a GeoParquet file (requires pyarrow)."""
+        gdf = self.api._to_geodataframe([self.api._unwrap_dicts(r) for r in self.records(kind)])
+        gdf.to_parquet(path)
+        return path
+
+
+def _unpack(body):
+    """(records, total count or None) from a listing response body."""
+    if isinstance(body, list):
+        return body, None
+    records = body.get("data", [])
+    count = body.get("count", body.get("total"))
+    return records, int(count) if count is not None else None
+
+
+class Mirror:
+    def project_mirror(self, project_id, path=None, page_size=500):
+        """
+        Open (or create) a local mirror of a project.
+        Args:
+            project_id (str): UUID of the project.
+            path (str, optional): SQLite database file. Defaults to
+                'scoutmaster_mirror.sqlite' in the working directory; one file
+                can hold several projects.
+            page_size (int, optional): Records per request while syncing.
+        Returns:
+            ProjectMirror: call .sync() to update and .fields(), .layers(),
+            .observations(), .cultivations() to read locally.
+        """
+        path = path or os.path.join(os.getcwd(), "scoutmaster_mirror.sqlite")
+        return ProjectMirror(self, project_id, path, page_size=page_size)
+
+    def project_sync(self, project_id, path=None, kinds=None, full=False):
+        """
+        Delta-sync a project into its local mirror.
+        Args:
+            project_id (str): UUID of the project.
+            path (str, optional): SQLite database file (see project_mirror).
+            kinds (list[str], optional): Subset of 'fields', 'layers',
+                'observations', 'cultivations'.
+            full (bool, optional): Re-list everything and reconcile removals.
+        Returns:
+            dict: Per kind: 'upserted', 'removed', 'requests' and 'seconds'.
+        """
+        return self.project_mirror(project_id, path).sync(kinds=kinds, full=full)
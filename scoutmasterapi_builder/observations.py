@@ -1,6 +1,9 @@
-import pandas as pd
+import numbers
 
 from .base import conceptual_class
+from .streaming import parse_geometries
+
+ALLOWED_OPERATORS = {"=", "!=", "<", "<=", ">", ">="}
 
 
 @conceptual_class
@@ -29,7 +32,7 @@ class Observations:
         if sort_by: params["sort_by"] = sort_by
         if crs: params["crs"] = crs
         data = self._get(endpoint, params=params)
-        return self._format_output(data)
+        return self._format_output(data, crs)
 
     def observations_by_field(self, field_id, page=None, limit=None, order=None,
                                lang=None, sort_by=None, crs=None):
@@ -55,7 +58,7 @@ class Observations:
         if sort_by: params["sort_by"] = sort_by
         if crs: params["crs"] = crs
         data = self._get(endpoint, params=params)
-        return self._format_output(data)
+        return self._format_output(data, crs)
 
     # Legacy alias
     def field_observations(self, field_id, **kwargs):
@@ -75,7 +78,7 @@ class Observations:
         params = {}
         if crs: params["crs"] = crs
         data = self._get(endpoint, params=params)
-        return self._format_output(data)
+        return self._format_output(data, crs)
 
     def observation_create(self, project_id, user_id, reference_code, acquired_at,
                            geometry, reported_at=None, research_category_id=None):
@@ -97,7 +100,7 @@ class Observations:
             "user_id": user_id,
             "reference_code": reference_code,
             "acquired_at": acquired_at,
-            "geometry": geometry,
+            "geometry": self._prepare_geometries([geometry])[0],
         }
         if reported_at: payload["reported_at"] = reported_at
         if research_category_id is not None: payload["research_category_id"] = research_category_id
@@ -133,7 +136,7 @@ class Observations:
         endpoint = f"observations/{observation_id}"
         payload = {}
         if reference_code is not None: payload["reference_code"] = reference_code
-        if geometry is not None: payload["geometry"] = geometry
+        if geometry is not None: payload["geometry"] = self._prepare_geometries([geometry])[0]
         if observed_at is not None: payload["observed_at"] = observed_at
         if research_category_id is not None: payload["research_category_id"] = research_category_id
         data = self._patch(endpoint, payload)
@@ -149,6 +152,24 @@ class Observations:
         """
         self._delete(f"observations/{observation_id}")
 
+    def observations_delete_many(self, observation_ids, max_workers=None, rate=None,
+                                 dry_run=False, quiet=False):
+        """
+        Delete many observations concurrently.
+        Args:
+            observation_ids (list, pd.Series or pd.DataFrame): Observation IDs,
+                or a frame with an 'observation_id' or 'id' column.
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+            rate (float, optional): Maximum delete requests per second.
+            dry_run (bool): Only report what would be deleted.
+            quiet (bool): Suppress the progress line.
+        Returns:
+            pd.DataFrame: Per-id 'status' ('deleted', 'failed' or
+            'would delete') and 'error'.
+        """
+        return self._delete_many("observation", "observations/{id}", observation_ids,
+                                 max_workers, rate, dry_run, quiet)
+
     def observation_values(self, observation_id):
         """
         Get the measurement values for the given observation.
@@ -174,9 +195,8 @@ class Observations:
         Returns:
             dict: Created observation value.
         """
-        allowed_operators = {"=", "!=", "<", "<=", ">", ">="}
-        if operator and operator not in allowed_operators:
-            raise ValueError(f"Invalid operator '{operator}'. Allowed: {sorted(allowed_operators)}")
+        if operator and operator not in ALLOWED_OPERATORS:
+            raise ValueError(f"Invalid operator '{operator}'. Allowed: {sorted(ALLOWED_OPERATORS)}")
         payload = {"parameter_id": parameter_id, "value": float(value)}
         if operator: payload["operator"] = operator
         if target_min is not None: payload["target_min"] = float(target_min)
@@ -196,40 +216,377 @@ class Observations:
             target_max=obs_data.get("target_max"),
         )
 
+    def observations_create_many(self, project_id, observations, values=None,
+                                 value_columns=None, user_id=None, max_workers=None):
+        """
+        Create many observations and their measurement values in one pipeline.
+        Rows are validated locally first (required columns, operators and
+        parameter ids against the cached observations_parameters table), so
+        invalid rows cost no requests. Valid observations are then created
+        concurrently, followed by all of their values.
+        Args:
+            project_id (str): UUID of the project.
+            observations (pd.DataFrame or GeoDataFrame): One row per observation
+                with 'reference_code', 'acquired_at' and 'geometry' (shapely
+                geometry, GeoJSON dict or WKT; always sent as GeoJSON) and
+                optionally 'user_id', 'reported_at' and 'research_category_id'.
+            values (pd.DataFrame, optional): Long-format values with 'row' (the
+                index label of the observation), 'parameter_id', 'value' and
+                optionally 'operator', 'target_min' and 'target_max'.
+            value_columns (list or dict, optional): Wide-format value columns of
+                `observations`: a list of columns named after a parameter id or
+                name, or a dict mapping column name to parameter id.
+            user_id (str, optional): User for rows without a 'user_id' column value.
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+        Returns:
+            pd.DataFrame: Per-row status indexed like `observations`, with
+            'status' ('created', 'partial', 'failed' or 'invalid'),
+            'observation_id', 'values_created', 'values_failed' and 'error'.
+        """
+        import pandas as pd
+
+        if not observations.index.is_unique:
+            raise ValueError("observations must have a unique index")
+        parameters, parameter_names = {}, {}
+        for parameter in self._get("observation-parameters", cache=True) or []:
+            parameters[str(parameter["id"])] = parameter["id"]
+            if parameter.get("name"):
+                parameter_names.setdefault(parameter["name"], parameter["id"])
+
+        def parameter_lookup(reference):
+            # Numbers are ids (3 or 3.0 from a float column); strings are an
+            # id ('3', e.g. a column name) or a parameter name.
+            if isinstance(reference, str):
+                return parameters.get(reference, parameter_names.get(reference))
+            if isinstance(reference, numbers.Real) and not _missing(reference) \
+                    and float(reference).is_integer():
+                return parameters.get(str(int(reference)))
+            return None
+
+        status = pd.DataFrame(index=observations.index)
+        status["status"] = "pending"
+        status["observation_id"] = None
+        status["values_created"] = 0
+        status["values_failed"] = 0
+        status["error"] = None
+        errors = {}  # row label -> list of validation messages
+
+        # Collect values (long + wide) as plain dicts keyed by row label.
+        value_rows = []
+        if values is not None:
+            value_rows.extend(values.to_dict("records"))
+        if value_columns is not None:
+            mapping = value_columns if isinstance(value_columns, dict) else {c: c for c in value_columns}
+            for column, parameter in mapping.items():
+                for label, value in observations[column].items():
+                    if not _missing(value):
+                        value_rows.append({"row": label, "parameter_id": parameter, "value": value})
+
+        values_by_row = {}
+        for item in value_rows:
+            label = item.get("row")
+            if label not in status.index:
+                raise KeyError(f"Value row {label!r} does not match an observation index label")
+            parameter_id = parameter_lookup(item.get("parameter_id"))
+            operator = None if _missing(item.get("operator")) else item.get("operator")
+            problem = None
+            if parameter_id is None:
+                problem = f"unknown parameter {item.get('parameter_id')!r}"
+            elif operator is not None and operator not in ALLOWED_OPERATORS:
+                problem = f"invalid operator {operator!r}"
+            else:
+                try:
+                    payload = {"parameter_id": parameter_id, "value": float(item["value"])}
+                    for key in ("target_min", "target_max"):
+                        if not _missing(item.get(key)):
+                            payload[key] = float(item[key])
+                except (KeyError, TypeError, ValueError):
+                    problem = f"non-numeric value for parameter {item.get('parameter_id')!r}"
+            if problem:
+                errors.setdefault(label, []).append(problem)
+                continue
+            if operator is not None:
+                payload["operator"] = operator
+            values_by_row.setdefault(label, []).append(payload)
+
+        payloads = {}
+        for label, row in observations.iterrows():
+            payload = {"user_id": row.get("user_id") if not _missing(row.get("user_id")) else user_id,
+                       "reference_code": row.get("reference_code"),
+                       "acquired_at": _isoformat(row.get("acquired_at")),
+                       "geometry": row.get("geometry")}
+            missing = [k for k, v in payload.items() if _missing(v)]
+            if missing:
+                errors.setdefault(label, []).append(f"missing {', '.join(missing)}")
+            else:
+                try:
+                    payload["geometry"] = _geometry_payload(payload["geometry"])
+                except Exception as e:
+                    errors.setdefault(label, []).append(f"invalid geometry: {e}")
+            if not _missing(row.get("reported_at")):
+                payload["reported_at"] = _isoformat(row.get("reported_at"))
+            if not _missing(row.get("research_category_id")):
+                payload["research_category_id"] = int(row.get("research_category_id"))
+            payloads[label] = payload
+
+        for label, messages in errors.items():
+            status.at[label, "status"] = "invalid"
+            status.at[label, "error"] = "; ".join(messages)
+        valid = [label for label in payloads if label not in errors]
+        prepared = self._prepare_geometries(payloads[label]["geometry"] for label in valid)
+        for label, geometry in zip(valid, prepared):
+            payloads[label]["geometry"] = geometry
+
+        # Stage 1: observations.
+        endpoint = f"projects/{project_id}/observations"
+        created = self._map_concurrent(lambda label: self._post(endpoint, payloads[label]),
+                                       valid, max_workers)
+        tasks = []
+        for label, (result, error) in zip(valid, created):
+            observation_id = result.get("id") if isinstance(result, dict) else None
+            if observation_id is None:
+                status.at[label, "status"] = "failed"
+                status.at[label, "error"] = str(error) if error else "no observation id returned"
+                continue
+            status.at[label, "observation_id"] = observation_id
+            status.at[label, "status"] = "created"
+            tasks.extend((label, observation_id, v) for v in values_by_row.get(label, []))
+
+        # Stage 2: all values of all created observations.
+        results = self._map_concurrent(
+            lambda task: self._post(f"observations/{task[1]}/values", task[2]), tasks, max_workers)
+        for (label, _, _), (_, error) in zip(tasks, results):
+            if error is None:
+                status.at[label, "values_created"] += 1
+            else:
+                status.at[label, "values_failed"] += 1
+                status.at[label, "status"] = "partial"
+                status.at[label, "error"] = str(error)
+        self._log(f"observations_create_many: {status['status'].value_counts().to_dict()}")
+        return status
+
+    def observation_values_export(self, project_id, refresh=False, max_workers=None):
+        """
+        Export all measurement values of a project as one long-format table.
+        Values are fetched concurrently for every observation and cached per
+        observation until its updated_at changes, so repeated exports only
+        fetch what changed. Observation attributes, geometry and the field
+        each observation lies in are joined on.
+        Args:
+            project_id (str): UUID of the project.
+            refresh (bool, optional): Ignore cached values.
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+        Returns:
+            GeoDataFrame: One row per value with 'observation_id', parameter
+            columns, a numeric 'value', observation columns, 'field_id' and
+            the observation geometry.
+        """
+        import pandas as pd
+        import geopandas as gpd
+
+        observations = self._get(f"projects/{project_id}/observations") or []
+        observations = [self._unwrap_dicts(dict(o)) for o in observations]
+        todo = []
+        for o in observations:
+            cached = self._observation_values.get(o["id"])
+            if refresh or cached is None or cached[0] != o.get("updated_at"):
+                todo.append(o)
+        fetched = self._map_concurrent(
+            lambda o: self._get(f"observations/{o['id']}/values"), todo, max_workers)
+        for o, (values, error) in zip(todo, fetched):
+            if error is not None:
+                raise Exception(f"Fetching values of observation {o['id']} failed: {error}")
+            self._observation_values[o["id"]] = (o.get("updated_at"), values or [])
+
+        records = [{**value, "observation_id": o["id"]}
+                   for o in observations
+                   for value in self._observation_values[o["id"]][1]]
+        values = pd.json_normalize(records) if records else pd.DataFrame(columns=["observation_id", "value"])
+        if "value" in values.columns:
+            values["value"] = pd.to_numeric(values["value"], errors="coerce")
+        values = values.rename(columns={"id": "value_id"})
+        if "parameter.id" in values.columns and "parameter_id" not in values.columns:
+            values = values.rename(columns={"parameter.id": "parameter_id"})
+
+        if not observations:
+            return gpd.GeoDataFrame(columns=["observation_id", "parameter_id", "value", "field_id",
+                                             "geometry"], geometry="geometry", crs="EPSG:4326")
+        obs = pd.DataFrame([{k: v for k, v in o.items() if k != "geometry"} for o in observations])
+        geometry = parse_geometries(o.get("geometry") for o in observations)
+        obs = gpd.GeoDataFrame(obs, geometry=geometry, crs="EPSG:4326")
+        if "field_id" not in obs.columns:
+            obs["field_id"] = obs.pop("field.id") if "field.id" in obs.columns else None
+        unassigned = obs["field_id"].isna() & obs.geometry.notna()
+        if unassigned.any():
+            index = self.fields_index(project_id)
+            points = obs.geometry[unassigned].representative_point()
+            obs.loc[unassigned, "field_id"] = index.locate(points.x.values, points.y.values)
+        obs = obs.rename(columns={"id": "observation_id"})
+        overlap = [c for c in obs.columns if c in values.columns and c != "observation_id"]
+        table = values.merge(obs.drop(columns=overlap), on="observation_id", how="left")
+        return gpd.GeoDataFrame(table, geometry="geometry", crs="EPSG:4326")
+
+    def observation_values_wide(self, project_id, parameter_column=None, refresh=False,
+                                max_workers=None):
+        """
+        Export a project's measurement values as a wide table: one row per
+        observation and one numeric column per parameter.
+        Args:
+            project_id (str): UUID of the project.
+            parameter_column (str, optional): Long-table column naming the
+                parameter. Defaults to 'parameter.name' when present, else
+                'parameter_id'.
+            refresh (bool, optional): Ignore cached values.
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+        Returns:
+            GeoDataFrame: Indexed by observation_id with 'field_id', geometry
+            and one column per parameter.
+        """
+        import geopandas as gpd
+
+        long = self.observation_values_export(project_id, refresh=refresh, max_workers=max_workers)
+        if long.empty:
+            return gpd.GeoDataFrame({"field_id": [], "geometry": []}, geometry="geometry",
+                                    crs="EPSG:4326").rename_axis("observation_id")
+        if parameter_column is None:
+            parameter_column = "parameter.name" if "parameter.name" in long.columns else "parameter_id"
+        wide = long.pivot_table(index="observation_id", columns=parameter_column,
+                                values="value", aggfunc="first")
+        wide.columns = [str(c) for c in wide.columns]
+        attributes = (long.drop_duplicates("observation_id")
+                      .set_index("observation_id")[["field_id", "geometry"]])
+        wide = attributes.join(wide, how="inner")
+        return gpd.GeoDataFrame(wide, geometry="geometry", crs="EPSG:4326")
+
+    def observations_joined(self, project_id, nearest=False, max_distance=None):
+        """
+        Get a project's observations with the field and the active cultivation
+        each one belongs to.
+        Observations, fields and cultivations are each fetched once. Fields
+        are assigned with a vectorized spatial-index lookup; cultivations with
+        a sorted interval lookup (merge_asof) on the observation's acquisition
+        date within its field. A cultivation is active from its earliest to
+        its latest event date; without an end it lasts until the next
+        cultivation on the same field starts.
+        Args:
+            project_id (str): UUID of the project.
+            nearest (bool, optional): Assign observations outside every field
+                to the nearest field.
+            max_distance (float, optional): With nearest=True, leave
+                observations further than this (in degrees) unassigned.
+        Returns:
+            GeoDataFrame: Observations with 'field_id', 'cultivation_id',
+            'cultivation_start' and 'cultivation_end' (None/NaT when unmatched).
+        """
+        import pandas as pd
+        import geopandas as gpd
+
+        observations = [self._unwrap_dicts(dict(o)) for o in
+                        self._get(f"projects/{project_id}/observations") or []]
+        geometry = parse_geometries(o.pop("geometry", None) for o in observations)
+        obs = gpd.GeoDataFrame(pd.DataFrame(observations), geometry=geometry, crs="EPSG:4326")
+        obs = obs.drop(columns=[c for c in ("field.id", "field_id") if c in obs.columns])
+
+        # Fields: one bulk spatial-index query.
+        index = self.fields_index(project_id)
+        points = obs.geometry.representative_point()
+        has_point = points.notna().to_numpy()
+        field_ids = pd.Series(None, index=obs.index, dtype=object)
+        if has_point.any():
+            x, y = points[has_point].x.to_numpy(), points[has_point].y.to_numpy()
+            found = index.nearest(x, y, max_distance)[0] if nearest else index.locate(x, y)
+            field_ids[has_point] = found
+        obs["field_id"] = field_ids
+
+        # Cultivations: [start, end] windows per field, sorted by start.
+        windows = []
+        for calendar in self._get(f"projects/{project_id}/calendars") or []:
+            calendar = self._unwrap_dicts(dict(calendar))
+            dates = [e.get("date") for e in calendar.get("events") or [] if e.get("date")]
+            start = calendar.get("start_date") or (min(dates) if dates else None)
+            end = calendar.get("end_date") or (max(dates) if len(dates) > 1 else None)
+            windows.append({"cultivation_field_id": calendar.get("field_id", calendar.get("field.id")),
+                            "cultivation_id": calendar.get("id"),
+                            "cultivation_start": start, "cultivation_end": end})
+        cult = pd.DataFrame(windows, columns=["cultivation_field_id", "cultivation_id",
+                                              "cultivation_start", "cultivation_end"])
+        for column in ("cultivation_start", "cultivation_end"):
+            cult[column] = pd.to_datetime(cult[column], utc=True, errors="coerce")
+        cult = cult.dropna(subset=["cultivation_field_id", "cultivation_start"])
+        cult = cult.sort_values(["cultivation_field_id", "cultivation_start"])
+        next_start = cult.groupby("cultivation_field_id")["cultivation_start"].shift(-1)
+        cult["cultivation_end"] = cult["cultivation_end"].fillna(next_start)
+        cult = cult.sort_values("cultivation_start")
+
+        acquired = pd.to_datetime(obs.get("acquired_at"), utc=True, errors="coerce")
+        left = pd.DataFrame({"row": range(len(obs)), "field_id": obs["field_id"].to_numpy(),
+                             "acquired": acquired.to_numpy() if acquired is not None else pd.NaT})
+        left = left.dropna(subset=["field_id", "acquired"]).sort_values("acquired")
+        for column in ("cultivation_id", "cultivation_start", "cultivation_end"):
+            obs[column] = None
+        if left.empty or cult.empty:
+            return obs
+        # merge_asof needs identical key dtypes: pandas 3 infers str for one side only,
+        # and datetime resolutions differ between parsed sources.
+        left["field_id"] = left["field_id"].astype(object)
+        cult["cultivation_field_id"] = cult["cultivation_field_id"].astype(object)
+        left["acquired"] = left["acquired"].astype("datetime64[ns, UTC]")
+        for column in ("cultivation_start", "cultivation_end"):
+            cult[column] = cult[column].astype("datetime64[ns, UTC]")
+        matched = pd.merge_asof(left, cult, left_on="acquired", right_on="cultivation_start",
+                                left_by="field_id", right_by="cultivation_field_id",
+                                direction="backward")
+        expired = matched["cultivation_end"].notna() & (matched["acquired"] > matched["cultivation_end"])
+        matched.loc[expired, ["cultivation_id", "cultivation_start", "cultivation_end"]] = None
+        matched = matched.set_index("row").reindex(range(len(obs)))
+        for column in ("cultivation_id", "cultivation_start", "cultivation_end"):
+            obs[column] = matched[column].to_numpy()
+        return obs
+
     # ── GeoJSON variants (not paginated; return a FeatureCollection) ─────────
-    def observations_geojson(self, project_id, lang=None, crs=None):
+    def observations_geojson(self, project_id, lang=None, crs=None, chunksize=None):
         """
         Get a project's observations as a GeoJSON FeatureCollection.
         Args:
             project_id (str): UUID of the project.
             lang (str, optional): Language for field labels.
             crs (int, optional): Output CRS EPSG code (default 4326).
+            chunksize (int, optional): Stream the FeatureCollection and yield
+                it in chunks of this many features instead of loading it whole.
         Returns:
-            GeoDataFrame, dict, or JSON depending on output_format.
+            GeoDataFrame, dict, or JSON depending on output_format; a generator
+            of those (one per chunk) when chunksize is given.
         """
         endpoint = f"projects/{project_id}/observations/geojson"
         params = {}
         if lang: params["lang"] = lang
         if crs: params["crs"] = crs
+        if chunksize:
+            return self._format_stream(endpoint, params, chunksize=chunksize, crs=crs)
         data = self._get(endpoint, params=params)
-        return self._format_output(data)
+        return self._format_output(data, crs)
 
-    def observations_by_field_geojson(self, field_id, lang=None, crs=None):
+    def observations_by_field_geojson(self, field_id, lang=None, crs=None, chunksize=None):
         """
         Get a field's observations as a GeoJSON FeatureCollection.
         Args:
             field_id (str): UUID of the field.
             lang (str, optional): Language for field labels.
             crs (int, optional): Output CRS EPSG code (default 4326).
+            chunksize (int, optional): Stream the FeatureCollection and yield
+                it in chunks of this many features instead of loading it whole.
         Returns:
-            GeoDataFrame, dict, or JSON depending on output_format.
+            GeoDataFrame, dict, or JSON depending on output_format; a generator
+            of those (one per chunk) when chunksize is given.
         """
         endpoint = f"fields/{field_id}/observations/geojson"
         params = {}
         if lang: params["lang"] = lang
         if crs: params["crs"] = crs
+        if chunksize:
+            return self._format_stream(endpoint, params, chunksize=chunksize, crs=crs)
         data = self._get(endpoint, params=params)
-        return self._format_output(data)
+        return self._format_output(data, crs)
 
     def observation_by_id_geojson(self, observation_id, lang=None, crs=None):
         """
@@ -246,4 +603,23 @@ class Observations:
         if lang: params["lang"] = lang
         if crs: params["crs"] = crs
         data = self._get(endpoint, params=params)
-        return self._format_output(data)
+        return self._format_output(data, crs)
+
+
+def _missing(value):
+    """True for None/NaN/NaT cell values."""
+    return (value is None or (isinstance(value, float) and value != value)
+            or type(value).__name__ == "NaTType")
+
+
+def _isoformat(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _geometry_payload(geometry):
+    """GeoJSON dict for a shapely geometry or a WKT / hex WKB string; dicts pass through."""
+    if isinstance(geometry, str):
+        geometry = parse_geometries([geometry])[0]
+    if hasattr(geometry, "__geo_interface__") and not isinstance(geometry, dict):
+        return geometry.__geo_interface__
+    return geometry
@@ -1,6 +1,3 @@
-import pandas as pd
-import requests
-
 from .base import conceptual_class
 
 
@@ -23,6 +20,6 @@ class ObservationsParameters:
         if limit: params["limit"] = limit
         if order: params["order"] = order
         if lang: params["lang"] = lang
-        data = self._get(endpoint, params=params)
+        data = self._get(endpoint, params=params, cache=True)
         return self._format_output(data)
     
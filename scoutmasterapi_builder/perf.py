@@ -0,0 +1,275 @@
+"""Client-side performance checks for the ScoutMaster API builder.
+
+Run from the command line:
+
+    python -m scoutmasterapi_builder.perf import-time [--budget SECONDS]
+    python -m scoutmasterapi_builder.perf compression [--fields N] [--level L]
+    python -m scoutmasterapi_builder.perf suite [--fields N] [--latency S] [--json PATH]
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+
+# Cold-start budget for `import scoutmasterapi_builder.api`. requests is the
+# only heavy dependency that should be loaded at import time.
+IMPORT_BUDGET_SECONDS = 0.35
+# Modules that must only be imported once a DataFrame/spatial output is produced.
+LAZY_MODULES = ("pandas", "geopandas", "shapely", "pyproj")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_time(module="scoutmasterapi_builder.api", repeat=3):
+    """Measure the cold import time of `module` with `python -X importtime`.
+
+    Each run uses a fresh interpreter. The fastest run is reported, as is
+    usual for timing benchmarks.
+
+    Args:
+        module (str): Module to import.
+        repeat (int): Number of fresh-interpreter runs.
+    Returns:
+        dict: 'seconds' (cumulative import time of `module`), 'top' (the
+        ten slowest direct and nested imports as (module, seconds)) and
+        'lazy_loaded' (any LAZY_MODULES pulled in by the import).
+    """
+    best = None
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))")
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                              capture_output=True, text=True, check=True)
+        timings = {}
+        for line in proc.stderr.splitlines():
+            match = _IMPORTTIME_LINE.match(line)
+            if match:
+                timings[match.group(4)] = int(match.group(2)) / 1e6
+        seconds = timings.get(module)
+        if seconds is None:
+            raise RuntimeError(f"'{module}' not found in -X importtime output")
+        if best is None or seconds < best["seconds"]:
+            top = sorted(timings.items(), key=lambda kv: kv[1], reverse=True)
+            best = {
+                "seconds": seconds,
+                "top": [kv for kv in top if kv[0] != module][:10],
+                "lazy_loaded": [m for m in proc.stdout.strip().split(",") if m],
+            }
+    return best
+
+
+def check_import_budget(budget=IMPORT_BUDGET_SECONDS, module="scoutmasterapi_builder.api"):
+    """Raise AssertionError when importing `module` exceeds `budget` seconds
+    or eagerly loads one of LAZY_MODULES. Returns the import_time() result.
+    """
+    result = import_time(module)
+    if result["lazy_loaded"]:
+        raise AssertionError(f"import {module} eagerly loads {result['lazy_loaded']}")
+    if result["seconds"] > budget:
+        slowest = ", ".join(f"{m} {s * 1000:.0f}ms" for m, s in result["top"][:5])
+        raise AssertionError(
+            f"import {module} took {result['seconds'] * 1000:.0f}ms "
+            f"(budget {budget * 1000:.0f}ms); slowest: {slowest}")
+    return result
+
+
+def compression_benchmark(fields=2000, vertices=200, level=6, repeat=3):
+    """Compare bytes on the wire and end-to-end time with and without
+    compression against a local stub server.
+
+    Downloads a project's fields as GeoJSON (fields_geojson) and posts a large
+    field polygon (fields_create), once with 'Accept-Encoding: identity' and
+    uncompressed request bodies and once with the client defaults plus
+    compress_requests=True.
+
+    Args:
+        fields (int): Features in the downloaded FeatureCollection.
+        vertices (int): Vertices per field polygon.
+        level (int): gzip level used by the server and the client.
+        repeat (int): Timed repetitions; the fastest is reported.
+    Returns:
+        list[dict]: One row per mode with 'download_bytes', 'upload_bytes',
+        'download_seconds' and 'upload_seconds'.
+    """
+    from .stub import StubData, StubServer, _circle
+
+    data = StubData(fields=fields, vertices=vertices, layers=0, observations=0)
+    project_id = data.project_ids[0]
+    upload = {"user_id": "u", "name": "Large field", "geometry": _circle(5.0, 52.0, 0.01, vertices * 20)}
+    rows = []
+    with StubServer(data, compress_level=level) as stub:
+        for mode in ("identity", "gzip"):
+            api = stub.client(output_format="json")
+            api.coalesce_requests = False
+            if mode == "identity":
+                api.session.headers["Accept-Encoding"] = "identity"
+            else:
+                api.compress_requests = True
+                api.compression_level = level
+            row = {"mode": mode}
+            for label, call, counter in (
+                    ("download", lambda: api.fields_geojson(project_id), "bytes_sent"),
+                    ("upload", lambda: api.fields_create(project_id, upload), "bytes_received")):
+                best = None
+                for _ in range(repeat):
+                    stub.reset_stats()
+                    t0 = time.perf_counter()
+                    call()
+                    elapsed = time.perf_counter() - t0
+                    best = elapsed if best is None else min(best, elapsed)
+                row[f"{label}_bytes"] = stub.stats[counter]
+                row[f"{label}_seconds"] = best
+            rows.append(row)
+    return rows
+
+
+# Client calls measured by benchmark_suite(): name -> fn(api, ids).
+SUITE_CALLS = {
+    "projects": lambda api, ids: api.projects(),
+    "fields": lambda api, ids: api.fields(ids["project"]),
+    "fields_geojson": lambda api, ids: api.fields_geojson(ids["project"]),
+    "field_by_id": lambda api, ids: api.field_by_id(ids["field"]),
+    "project_layers": lambda api, ids: api.project_layers(ids["project"]),
+    "observations": lambda api, ids: api.observations(ids["project"]),
+    "observations_geojson": lambda api, ids: api.observations_geojson(ids["project"]),
+    "cultivations": lambda api, ids: api.cultivations(ids["project"]),
+    "cultivations_tsum": lambda api, ids: api.cultivations_tsum(ids["calendar"]),
+}
+# Output configurations: name -> ScoutMasterAPI keyword arguments.
+SUITE_FORMATS = {
+    "json": {"output_format": "json"},
+    "df": {"output_format": "df"},
+    "gdf": {"output_format": "df", "spatial": True},
+    "geojson": {"output_format": "json", "spatial": True},
+}
+
+
+def _count_records(result):
+    if isinstance(result, dict):
+        return len(result["features"]) if "features" in result else 1
+    return len(result) if hasattr(result, "__len__") else 1
+
+
+def benchmark_suite(fields=500, observations=1000, vertices=64, latency=0.0, repeat=5,
+                    calls=None, formats=None, memory=True):
+    """Measure latency, throughput and memory of the main client calls per
+    output format against a local stub server.
+
+    Args:
+        fields (int): Fields in the stub project.
+        observations (int): Observations in the stub project.
+        vertices (int): Vertices per field polygon.
+        latency (float): Server-side latency added to every response, in seconds.
+        repeat (int): Timed repetitions per call and format.
+        calls (list[str], optional): Subset of SUITE_CALLS.
+        formats (list[str], optional): Subset of SUITE_FORMATS.
+        memory (bool): Also record the tracemalloc peak of one extra call.
+    Returns:
+        list[dict]: One row per (call, format) with 'records', 'requests',
+        'bytes', 'seconds_min', 'seconds_median', 'seconds_p95',
+        'records_per_second' and 'memory_peak_bytes'.
+    """
+    import statistics
+    import tracemalloc
+    import warnings
+
+    from .stub import StubData, StubServer
+
+    data = StubData(fields=fields, observations=observations, vertices=vertices)
+    ids = {"project": data.project_ids[0], "field": data.ids("fields")[0],
+           "calendar": data.ids("calendars")[0]}
+    rows = []
+    with StubServer(data, latency=latency) as stub, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for fmt in formats or SUITE_FORMATS:
+            api = stub.client(**SUITE_FORMATS[fmt])
+            for name in calls or SUITE_CALLS:
+                call = SUITE_CALLS[name]
+                call(api, ids)  # warm up connections and lazy imports
+                stub.reset_stats()
+                timings = []
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    result = call(api, ids)
+                    timings.append(time.perf_counter() - t0)
+                requests, nbytes = stub.stats["requests"] / repeat, stub.stats["bytes_sent"] / repeat
+                timings.sort()
+                median = statistics.median(timings)
+                records = _count_records(result)
+                row = {"call": name, "format": fmt, "records": records, "requests": requests,
+                       "bytes": nbytes, "seconds_min": timings[0], "seconds_median": median,
+                       "seconds_p95": timings[min(len(timings) - 1, int(0.95 * len(timings)))],
+                       "records_per_second": records / median if median else float("inf")}
+                if memory:
+                    tracemalloc.start()
+                    try:
+                        call(api, ids)
+                        row["memory_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+                    finally:
+                        tracemalloc.stop()
+                rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scoutmasterapi_builder.perf")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_import = sub.add_parser("import-time", help="check the cold import time budget")
+    p_import.add_argument("--budget", type=float, default=IMPORT_BUDGET_SECONDS)
+    p_import.add_argument("--module", default="scoutmasterapi_builder.api")
+    p_compress = sub.add_parser("compression", help="benchmark compressed transfers locally")
+    p_compress.add_argument("--fields", type=int, default=2000)
+    p_compress.add_argument("--vertices", type=int, default=200)
+    p_compress.add_argument("--level", type=int, default=6)
+    p_compress.add_argument("--repeat", type=int, default=3)
+    p_suite = sub.add_parser("suite", help="benchmark client calls against a local stub server")
+    p_suite.add_argument("--fields", type=int, default=500)
+    p_suite.add_argument("--observations", type=int, default=1000)
+    p_suite.add_argument("--vertices", type=int, default=64)
+    p_suite.add_argument("--latency", type=float, default=0.0)
+    p_suite.add_argument("--repeat", type=int, default=5)
+    p_suite.add_argument("--calls", help="comma-separated subset of: " + ", ".join(SUITE_CALLS))
+    p_suite.add_argument("--formats", help="comma-separated subset of: " + ", ".join(SUITE_FORMATS))
+    p_suite.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.command == "suite":
+        rows = benchmark_suite(args.fields, args.observations, args.vertices, args.latency,
+                               args.repeat, args.calls.split(",") if args.calls else None,
+                               args.formats.split(",") if args.formats else None)
+        print(f"{'call':<22}{'format':<9}{'records':>8}{'median':>10}{'p95':>10}"
+              f"{'records/s':>12}{'MB':>8}{'peak MB':>9}")
+        for row in rows:
+            print(f"{row['call']:<22}{row['format']:<9}{row['records']:>8}"
+                  f"{row['seconds_median'] * 1000:>8.1f}ms{row['seconds_p95'] * 1000:>8.1f}ms"
+                  f"{row['records_per_second']:>12.0f}{row['bytes'] / 1e6:>8.2f}"
+                  f"{row.get('memory_peak_bytes', 0) / 1e6:>9.2f}")
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(rows, f, indent=2)
+        return 0
+
+    if args.command == "compression":
+        rows = compression_benchmark(args.fields, args.vertices, args.level, args.repeat)
+        print(f"{'mode':<10}{'download':>14}{'':>10}{'upload':>14}{'':>10}")
+        for row in rows:
+            print(f"{row['mode']:<10}"
+                  f"{row['download_bytes'] / 1e6:>11.2f} MB{row['download_seconds'] * 1000:>8.0f}ms"
+                  f"{row['upload_bytes'] / 1e6:>11.2f} MB{row['upload_seconds'] * 1000:>8.0f}ms")
+        return 0
+
+    if args.command == "import-time":
+        try:
+            result = check_import_budget(args.budget, args.module)
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            return 1
+        print(f"OK: import {args.module} took {result['seconds'] * 1000:.0f}ms "
+              f"(budget {args.budget * 1000:.0f}ms)")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
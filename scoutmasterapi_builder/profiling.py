@@ -0,0 +1,159 @@
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Phases in report order. 'format' is the whole of _format_output; the
+# phases listed after it are sub-phases of formatting.
+PHASES = ("network", "decode", "format", "unwrap", "parse_geometry",
+          "normalize", "geodataframe", "geojson")
+FORMAT_SUBPHASES = PHASES[3:]
+
+
+class Profiler:
+    """Phase-level timings of ScoutMasterAPI calls, grouped per public method.
+
+    Created by BaseAPI.profile(); every request made while it is active is
+    broken down into network, JSON decode and output formatting time, and the
+    formatting time further into _unwrap_dicts, geometry parsing,
+    json_normalize, GeoDataFrame construction and GeoJSON conversion.
+
+    With cprofile=True a cProfile.Profile is collected per method for the
+    formatting phase (see stats()); with memory=True the tracemalloc peak of
+    each formatting call is tracked. Both are process-wide instruments, so
+    their numbers are only exact when calls are not running concurrently.
+    """
+
+    def __init__(self, api, cprofile=False, memory=False):
+        self._api = api
+        self._lock = threading.Lock()
+        self._seconds = {}  # (method, phase) -> [calls, seconds]
+        self._memory_peak = {}  # method -> peak bytes during formatting
+        self._profiles = {} if cprofile else None
+        self.memory = memory
+        self._started_tracemalloc = False
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def close(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # ── Recording (called from BaseAPI) ──────────────────────────────────────
+
+    def _method(self):
+        """Name of the outermost public API method on the current call stack."""
+        cls = type(self._api)
+        method = "<internal>"
+        frame = sys._getframe(2)
+        while frame is not None:
+            name = frame.f_code.co_name
+            if (not name.startswith("_") and frame.f_locals.get("self") is self._api
+                    and hasattr(cls, name)):
+                method = name
+            frame = frame.f_back
+        return method
+
+    def add(self, phase, seconds, method=None):
+        method = method or self._method()
+        with self._lock:
+            entry = self._seconds.setdefault((method, phase), [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    @contextmanager
+    def phase(self, name):
+        method = self._method()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0, method)
+
+    @contextmanager
+    def formatting(self):
+        """Time one _format_output call, with optional cProfile/tracemalloc capture."""
+        method = self._method()
+        profile = None
+        if self._profiles is not None:
+            with self._lock:
+                profile = self._profiles.setdefault(method, cProfile.Profile())
+        if self.memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            self.add("format", time.perf_counter() - t0, method)
+            if self.memory:
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                with self._lock:
+                    self._memory_peak[method] = max(self._memory_peak.get(method, 0), peak)
+
+    # ── Reporting ────────────────────────────────────────────────────────────
+
+    def methods(self):
+        with self._lock:
+            return sorted({method for method, _ in self._seconds})
+
+    def as_dict(self):
+        """{method: {phase: {'calls': n, 'seconds': s}, ..., 'memory_peak_bytes': b}}"""
+        with self._lock:
+            out = {}
+            for (method, phase), (calls, seconds) in self._seconds.items():
+                out.setdefault(method, {})[phase] = {"calls": calls, "seconds": seconds}
+            for method, peak in self._memory_peak.items():
+                out.setdefault(method, {})["memory_peak_bytes"] = peak
+            return out
+
+    def report(self):
+        """Per-method DataFrame with seconds per phase.
+
+        'format_other' is formatting time not covered by a named sub-phase and
+        'total' is network + decode + format.
+        """
+        import pandas as pd
+
+        rows = []
+        for method, phases in sorted(self.as_dict().items()):
+            row = {"method": method}
+            for phase in PHASES:
+                row[phase] = phases.get(phase, {}).get("seconds", 0.0)
+            row["format_other"] = max(row["format"] - sum(row[p] for p in FORMAT_SUBPHASES), 0.0)
+            row["total"] = row["network"] + row["decode"] + row["format"]
+            row["requests"] = phases.get("network", {}).get("calls", 0)
+            if self.memory:
+                row["memory_peak_bytes"] = phases.get("memory_peak_bytes", 0)
+            rows.append(row)
+        return pd.DataFrame(rows).set_index("method") if rows else pd.DataFrame()
+
+    def stats(self, method):
+        """pstats.Stats of the formatting phase of `method` (requires cprofile=True)."""
+        if self._profiles is None:
+            raise ValueError("Profiler was created without cprofile=True")
+        if method not in self._profiles:
+            raise KeyError(f"No formatting profile recorded for '{method}'")
+        return pstats.Stats(self._profiles[method], stream=io.StringIO())
+
+    def print_stats(self, method, limit=20, sort="cumulative"):
+        stats = self.stats(method)
+        stats.stream = sys.stdout
+        stats.sort_stats(sort).print_stats(limit)
+
+    def __str__(self):
+        lines = [f"{'method':<32}" + "".join(f"{p:>15}" for p in PHASES)]
+        for method, phases in sorted(self.as_dict().items()):
+            lines.append(f"{method:<32}" + "".join(
+                f"{phases.get(p, {}).get('seconds', 0.0) * 1000:>13.1f}ms" for p in PHASES))
+        return "\n".join(lines)
@@ -2,7 +2,6 @@ import requests
 import mimetypes
 import os.path
 import datetime
-import pandas as pd
 
 from .base import conceptual
 
@@ -98,9 +97,6 @@ class Projects:
         Returns:
             Formatted response (DataFrame or dict) depending on self.output_format.
         """
-        # Initialise
-        if self.output_format == "df": response = pd.DataFrame()
-        else: response = {}
         self._check_auth()
         endpoint = f"projects/{project_id}/logo"
         
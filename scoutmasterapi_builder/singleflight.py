@@ -0,0 +1,69 @@
+import threading
+
+
+def clone(data):
+    """Return an independent copy of a decoded JSON value.
+
+    Much cheaper than copy.deepcopy for the plain dict/list/scalar trees that
+    response.json() produces; anything else is returned as-is.
+    """
+    if isinstance(data, dict):
+        return {key: clone(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [clone(value) for value in data]
+    return data
+
+
+class _Call:
+    """A single in-flight call that other threads can wait on."""
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight block until it finishes and share its outcome (result or
+    exception). Results are handed out as independent copies whenever more
+    than one caller received them, so callers may mutate what they get back.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                call.waiters += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return clone(call.result)
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                shared = call.waiters > 0
+            call.done.set()
+        # Waiters clone from call.result, so the leader must not hand out
+        # the same object once anyone else is reading it.
+        return clone(call.result) if shared else call.result
@@ -0,0 +1,111 @@
+import time
+
+from .streaming import parse_geometries
+
+
+class FieldIndex:
+    """Client-side STRtree over a project's field geometries.
+
+    Answers point-in-field and nearest-field queries for whole coordinate
+    arrays in one vectorized call. Coordinates are in the fields' CRS
+    (EPSG:4326 lon/lat unless the fields were fetched with another crs), and
+    so are distances.
+
+    update() applies a fresh field listing: only geometries whose record
+    changed are re-parsed and the tree is rebuilt only when something changed.
+    """
+
+    def __init__(self, records=()):
+        self._entries = {}  # field id -> (version, geometry)
+        self.ids = []
+        self.geometries = None
+        self.tree = None
+        self.built_at = 0.0
+        self.update(records)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def update(self, records):
+        """Sync the index with a list of field records.
+
+        Returns:
+            bool: True when any field was added, changed or removed.
+        """
+        changed, current = [], set()
+        for record in records:
+            field_id = str(record["id"])
+            current.add(field_id)
+            version = (record.get("updated_at"), _geometry_key(record.get("geometry")))
+            entry = self._entries.get(field_id)
+            if entry is None or entry[0] != version:
+                changed.append((field_id, version, record.get("geometry")))
+        removed = set(self._entries) - current
+        for field_id in removed:
+            del self._entries[field_id]
+        if changed:
+            geometries = parse_geometries(geometry for _, _, geometry in changed)
+            for (field_id, version, _), geometry in zip(changed, geometries):
+                self._entries[field_id] = (version, geometry)
+        self.built_at = time.time()
+        if changed or removed or self.tree is None:
+            self._build()
+            return bool(changed or removed)
+        return False
+
+    def _build(self):
+        import numpy as np
+        import shapely
+
+        items = [(i, e[1]) for i, e in self._entries.items() if e[1] is not None]
+        self.ids = np.array([i for i, _ in items], dtype=object)
+        self.geometries = np.array([g for _, g in items], dtype=object)
+        self.tree = shapely.STRtree(self.geometries)
+
+    def _points(self, lon, lat):
+        import numpy as np
+        import shapely
+
+        return shapely.points(np.asarray(lon, dtype=float), np.asarray(lat, dtype=float))
+
+    def locate(self, lon, lat):
+        """Field id containing each point (None where no field matches).
+
+        Points on a boundary count as inside; where fields overlap the first
+        match is returned.
+        """
+        import numpy as np
+
+        points = np.atleast_1d(self._points(lon, lat))
+        out = np.full(len(points), None, dtype=object)
+        if len(self.ids):
+            point_idx, tree_idx = self.tree.query(points, predicate="intersects")
+            first_point, first = np.unique(point_idx, return_index=True)
+            out[first_point] = self.ids[tree_idx[first]]
+        return out
+
+    def nearest(self, lon, lat, max_distance=None):
+        """Nearest field id and distance for each point.
+
+        Args:
+            max_distance (float, optional): Ignore fields further away than
+                this (in CRS units); such points get None / NaN.
+        Returns:
+            (ndarray, ndarray): field ids and distances (0 for points inside).
+        """
+        import numpy as np
+
+        points = np.atleast_1d(self._points(lon, lat))
+        ids = np.full(len(points), None, dtype=object)
+        distances = np.full(len(points), np.nan)
+        if len(self.ids):
+            (point_idx, tree_idx), dist = self.tree.query_nearest(
+                points, max_distance=max_distance, return_distance=True, all_matches=False)
+            ids[point_idx] = self.ids[tree_idx]
+            distances[point_idx] = dist
+        return ids, distances
+
+
+def _geometry_key(geometry):
+    """Cheap change marker for a geometry value (WKT/WKB string or GeoJSON dict)."""
+    return hash(geometry if isinstance(geometry, str) or geometry is None else repr(geometry))
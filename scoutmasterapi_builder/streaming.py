@@ -0,0 +1,162 @@
+import codecs
+import json
+import re
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+_NUMBER_CONTINUATION = ".eE+-"  # characters that can extend a number decoded so far
+
+
+def iter_json_array(chunks, key):
+    """Incrementally yield the items of a JSON array from a byte stream.
+
+    The array is either the top-level value or the first array found under
+    `key` (e.g. 'features' in a FeatureCollection, also when it is wrapped in a
+    {"data": ...} envelope). Items are decoded one at a time, so only the item
+    being parsed plus one network chunk is held in memory.
+
+    Args:
+        chunks (iterable[bytes]): Raw body chunks, e.g. response.iter_content().
+        key (str): Object key holding the array.
+    Yields:
+        The decoded array items.
+    """
+    chunks = iter(chunks)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buf, pos, eof = "", 0, False
+    array_start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+
+    def read():
+        nonlocal buf, eof
+        for chunk in chunks:
+            if chunk:
+                buf += decoder.decode(chunk)
+                return
+        buf += decoder.decode(b"", final=True)
+        eof = True
+
+    # Locate the opening bracket of the array.
+    while True:
+        stripped = buf.lstrip(_WHITESPACE)
+        if stripped.startswith("["):
+            pos = len(buf) - len(stripped) + 1
+            break
+        match = array_start.search(buf)
+        if match:
+            pos = match.end()
+            break
+        if eof:
+            return  # no such array (e.g. an error body or an empty object)
+        read()
+
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE + ",":
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("Unexpected end of JSON stream inside array")
+            read()
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = _DECODER.raw_decode(buf, pos)
+            # A bare scalar at the end of the buffer may have been cut short,
+            # and a number may continue past a chunk edge: "-2500." + "0".
+            complete = eof or isinstance(item, (dict, list)) or (
+                end < len(buf) and not (isinstance(item, (int, float)) and buf[end] in _NUMBER_CONTINUATION))
+        except json.JSONDecodeError:
+            complete = False
+        if not complete:
+            if eof:
+                raise ValueError(f"Invalid JSON in stream near: {buf[pos:pos + 100]!r}")
+            # Grow the buffer to at least twice the pending bytes before
+            # retrying, so a large item is not re-parsed once per chunk.
+            target = 2 * (len(buf) - pos)
+            while not eof and len(buf) - pos < target:
+                read()
+            continue
+        yield item
+        pos = end
+        if pos > 1 << 20:
+            buf, pos = buf[pos:], 0
+
+
+def iter_batches(items, size):
+    """Group an iterable into lists of at most `size` items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parse_geometries(values):
+    """Decode a sequence of geometries in bulk.
+
+    Accepts GeoJSON dicts, WKT strings, hex-encoded WKB strings or shapely
+    geometries (mixed is fine) and returns a numpy array of shapely geometries. Point GeoJSON is
+    built straight from the coordinates; everything else goes through the
+    vectorized shapely readers.
+    """
+    import numpy as np
+    import shapely
+
+    values = list(values)
+    out = np.empty(len(values), dtype=object)
+    kinds = {}
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        if hasattr(value, "geom_type"):
+            out[i] = value
+            continue
+        if isinstance(value, dict):
+            kind = "point" if value.get("type") == "Point" and value.get("coordinates") else "geojson"
+        elif isinstance(value, str):
+            kind = "wkb" if _is_hex(value) else "wkt"
+        else:
+            raise ValueError(f"Unexpected geometry type: {type(value)}")
+        kinds.setdefault(kind, []).append(i)
+
+    for kind, idx in kinds.items():
+        if kind == "point":
+            coords = [values[i]["coordinates"] for i in idx]
+            if all(len(c) == 2 for c in coords):
+                geoms = shapely.points(np.asarray(coords, dtype=float))
+            else:
+                geoms = shapely.from_geojson([json.dumps(values[i]) for i in idx])
+        elif kind == "geojson":
+            geoms = shapely.from_geojson([json.dumps(values[i]) for i in idx])
+        elif kind == "wkb":
+            geoms = shapely.from_wkb([values[i] for i in idx])
+        else:
+            geoms = shapely.from_wkt([values[i] for i in idx])
+        out[idx] = geoms
+    return out
+
+
+def features_to_geodataframe(features, crs="EPSG:4326"):
+    """Build a GeoDataFrame from a list of GeoJSON features, decoding all
+    geometries in one bulk call."""
+    import geopandas as gpd
+    import pandas as pd
+
+    props = []
+    for feature in features:
+        row = dict(feature.get("properties") or {})
+        if "id" in feature and "id" not in row:
+            row["id"] = feature["id"]
+        props.append(row)
+    geometry = parse_geometries(f.get("geometry") for f in features)
+    return gpd.GeoDataFrame(pd.DataFrame(props), geometry=geometry, crs=crs)
+
+
+_HEX = re.compile(r"[0-9A-Fa-f]+")
+
+
+def _is_hex(value):
+    return len(value) % 2 == 0 and _HEX.fullmatch(value) is not None
@@ -0,0 +1,564 @@
+"""Local stand-in for the ScoutMaster API, for benchmarks and offline runs.
+
+StubServer serves synthetic projects, fields, layers, observations (with
+values), cultivation calendars (with tsum series) and layer files over plain
+HTTP, in the same response shapes as the real API, plus a Cognito-style
+token endpoint:
+
+    with StubServer(StubData(fields=500), latency=0.02) as stub:
+        api = stub.client(output_format="df")
+        api.fields(stub.data.project_ids[0])
+
+Writes (POST/PATCH/DELETE) are applied to the in-memory data, so created
+records show up in later listings. Responses are gzip-compressed when the
+client accepts it, and gzip-compressed request bodies are accepted.
+Multipart uploads (layer files) are stored and served back by the layer's
+export URL.
+"""
+import gzip
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+_NAMESPACE = uuid.UUID("6f1c2d3e-0000-4000-8000-5c0a7a57e500")
+
+# Child collection -> attribute linking a record to its parent collection.
+PARENT_KEYS = {"environments": "environment_id", "projects": "project_id", "fields": "field_id",
+               "observations": "observation_id", "calendars": "calendar_id",
+               "layers": "layer_id"}
+# Global catalogues that are also listed per project (projects/{id}/layer-types).
+PROJECT_CATALOGUES = ("layer-types", "services")
+
+
+def _uid(*parts):
+    return str(uuid.uuid5(_NAMESPACE, "/".join(str(p) for p in parts)))
+
+
+def _iso(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class StubData:
+    """Deterministic synthetic ScoutMaster data.
+
+    Args:
+        projects (int): Number of projects, spread over `environments`.
+        fields (int): Fields per project.
+        vertices (int): Vertices per field polygon.
+        layers (int): Layers per field.
+        observations (int): Observations per project.
+        values (int): Measurement values per observation.
+        tsum_days (int): Length of each cultivation's tsum series.
+        environments (int): Number of environments.
+        layer_size (int): Size in bytes of each generated layer file.
+        seed (int): Random seed.
+    """
+
+    def __init__(self, projects=1, fields=100, vertices=64, layers=2, observations=200,
+                 values=3, tsum_days=120, environments=1, layer_size=64 * 1024, seed=0):
+        self.lock = threading.RLock()
+        self.records = {kind: {} for kind in ("environments", "projects", "fields", "layers",
+                                              "observations", "values", "calendars",
+                                              "subscriptions", "observation-parameters",
+                                              "layer-types", "services", "research-categories",
+                                              "users", "invites")}
+        self.version = 0  # bumped on every write; part of the response cache key
+        self.tsum_days = tsum_days
+        self.layer_size = layer_size
+        self.files = {}  # layer id -> uploaded file bytes
+        self.members = {}  # (environment id, 'users' | 'owners' | 'services') -> {member id: record}
+        rng = random.Random(seed)
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+        for k, name in enumerate(("Nitrogen", "Moisture", "Height", "Disease score")):
+            self._add("observation-parameters", {"id": k + 1, "name": name, "unit": ""})
+        for t in range(max(layers, 1)):
+            self._add("layer-types", {"id": t + 1, "name": f"Layer type {t + 1}"})
+        self._add("services", {"id": 1, "name": "Crop monitoring"})
+        for k, name in enumerate(("Soil sample", "Disease report")):
+            self._add("research-categories", {"id": k + 1, "name": name})
+        for e in range(environments):
+            self._add("environments", {"id": _uid("environment", e), "name": f"Environment {e}"})
+        for p in range(projects):
+            project_id = _uid("project", p)
+            self._add("projects", {"id": project_id, "name": f"Project {p}", "abbreviation": f"P{p}",
+                                   "environment_id": _uid("environment", p % environments) if environments else None,
+                                   "created_at": _iso(base), "updated_at": _iso(base)})
+            centres = []
+            for f in range(fields):
+                lon = 5.0 + (f % 50) * 0.01 + p
+                lat = 52.0 + (f // 50) * 0.01
+                centres.append((lon, lat))
+                field_id = _uid("field", p, f)
+                updated = _iso(base + timedelta(minutes=f))
+                self._add("fields", {"id": field_id, "project_id": project_id, "name": f"Field {f}",
+                                     "geometry": _circle(lon, lat, 0.003, vertices),
+                                     "created_at": updated, "updated_at": updated})
+                for l in range(layers):
+                    self._add("layers", {
+                        "id": _uid("layer", p, f, l), "field_id": field_id, "project_id": project_id,
+                        "layer_type": {"id": l + 1, "name": f"Layer type {l + 1}"},
+                        "date": (date(2026, 4, 1) + timedelta(days=7 * l)).isoformat(),
+                        "statistics": {"mean": round(rng.uniform(0, 1), 4),
+                                       "min": 0.0, "max": 1.0},
+                        "updated_at": updated})
+                self._add("subscriptions", {
+                    "id": _uid("subscription", p, f), "field_id": field_id, "project_id": project_id,
+                    "subscription_id": 1,
+                    "started_at": "2026-01-01T00:00:00Z", "ended_at": None})
+                sown = date(2026, 3, 1) + timedelta(days=rng.randrange(60))
+                self._add("calendars", {
+                    "id": _uid("calendar", p, f), "field_id": field_id, "project_id": project_id,
+                    "crop": {"code": 2014, "name": "Potato", "variety_name": "Fontane"},
+                    "events": [{"type": "planting", "date": sown.isoformat()},
+                               {"type": "harvest", "date": (sown + timedelta(days=140)).isoformat()}],
+                    "updated_at": updated})
+            for o in range(observations):
+                lon, lat = centres[o % len(centres)] if centres else (5.0, 52.0)
+                observation_id = _uid("observation", p, o)
+                acquired = base + timedelta(days=60 + o % 150)
+                self._add("observations", {
+                    "id": observation_id, "project_id": project_id,
+                    "field_id": _uid("field", p, o % fields) if fields else None,
+                    "reference_code": f"OBS-{o}", "user_id": _uid("user", 0),
+                    "acquired_at": _iso(acquired), "reported_at": _iso(acquired),
+                    "geometry": {"type": "Point", "coordinates": [
+                        round(lon + rng.uniform(-0.001, 0.001), 7),
+                        round(lat + rng.uniform(-0.001, 0.001), 7)]},
+                    "updated_at": _iso(base + timedelta(minutes=o))})
+                for v in range(values):
+                    self._add("values", {
+                        "id": _uid("value", p, o, v), "observation_id": observation_id,
+                        "parameter": {"id": v % 4 + 1}, "operator": "=",
+                        "value": str(round(rng.uniform(0, 100), 2))})
+
+    @property
+    def project_ids(self):
+        return list(self.records["projects"])
+
+    def ids(self, kind):
+        return list(self.records[kind])
+
+    def _add(self, kind, record):
+        self.records[kind][str(record["id"])] = record
+
+    # ── Queries and writes (called by the request handler) ───────────────────
+
+    def children(self, kind, parent_kind, parent_id):
+        key = PARENT_KEYS[parent_kind]
+        return [r for r in self.records[kind].values() if str(r.get(key)) == parent_id]
+
+    def create(self, kind, record, parent_kind=None, parent_id=None):
+        with self.lock:
+            record = dict(record, id=str(uuid.uuid4()))
+            if parent_kind:
+                record[PARENT_KEYS[parent_kind]] = parent_id
+            record["created_at"] = record["updated_at"] = _iso(datetime.now(timezone.utc))
+            self._add(kind, record)
+            self.version += 1
+            return record
+
+    def layer_file(self, layer_id):
+        """The uploaded file of a layer, else deterministic bytes of layer_size."""
+        if layer_id in self.files:
+            return self.files[layer_id]
+        block = hashlib.sha256(layer_id.encode()).digest()
+        return (block * (self.layer_size // len(block) + 1))[:self.layer_size]
+
+    def member_add(self, environment_id, collection, member_id, record=None):
+        with self.lock:
+            key = "service_id" if collection == "services" else "user_id"
+            record = dict(record or {}, **{key: member_id, "environment_id": environment_id})
+            self.members.setdefault((environment_id, collection), {})[member_id] = record
+            self.version += 1
+            return record
+
+    def member_remove(self, environment_id, collection, member_id):
+        with self.lock:
+            removed = self.members.get((environment_id, collection), {}).pop(member_id, None)
+            self.version += removed is not None
+            return removed
+
+    def update(self, kind, record_id, changes):
+        with self.lock:
+            record = self.records[kind].get(record_id)
+            if record is None:
+                return None
+            record.update(changes)
+            record["updated_at"] = _iso(datetime.now(timezone.utc))
+            self.version += 1
+            return record
+
+    def delete(self, kind, record_id):
+        with self.lock:
+            deleted = self.records[kind].pop(record_id, None) is not None
+            self.version += deleted
+            return deleted
+
+    def tsum(self, calendar):
+        sown = date.fromisoformat(calendar["events"][0]["date"]) if calendar.get("events") else date(2026, 4, 1)
+        rows, total = [], 0.0
+        for d in range(self.tsum_days):
+            temperature = round(10 + 8 * math.sin(2 * math.pi * (d + 90) / 365), 2)
+            total += max(temperature, 0)
+            rows.append({"date": (sown + timedelta(days=d)).isoformat(),
+                         "temperature": temperature, "tsum": round(total, 2)})
+        return {"id": calendar["id"], "field_id": calendar.get("field_id"),
+                "crop": calendar.get("crop") or {"name": None, "variety_name": None}, "tsum": rows}
+
+
+def _circle(lon, lat, radius, vertices):
+    ring = [[round(lon + radius * math.cos(2 * math.pi * k / vertices), 7),
+             round(lat + radius * 0.6 * math.sin(2 * math.pi * k / vertices), 7)]
+            for k in range(vertices)]
+    ring.append(ring[0])
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+def _wkt(geometry):
+    """WKT for the GeoJSON Points/Polygons the stub generates (strings pass through)."""
+    if not isinstance(geometry, dict):
+        return geometry
+    coords = geometry["coordinates"]
+    if geometry["type"] == "Point":
+        return f"POINT ({coords[0]} {coords[1]})"
+    if geometry["type"] == "Polygon":
+        rings = ", ".join("(" + ", ".join(f"{x} {y}" for x, y in ring) + ")" for ring in coords)
+        return f"POLYGON ({rings})"
+    import shapely
+
+    return shapely.from_geojson(json.dumps(geometry)).wkt
+
+
+def _geojson(geometry):
+    if geometry is None or isinstance(geometry, dict):
+        return geometry
+    import shapely
+
+    return json.loads(shapely.to_geojson(shapely.from_wkt(geometry)))
+
+
+def _invalid_geometry(kind, body):
+    """Fields accept GeoJSON geometries only, like the real API."""
+    geometry = (body or {}).get("geometry")
+    return kind == "fields" and geometry is not None and not (
+        isinstance(geometry, dict) and "type" in geometry and "coordinates" in geometry)
+
+
+def _as_wkt_record(record):
+    return dict(record, geometry=_wkt(record["geometry"])) if "geometry" in record else record
+
+
+def _feature(record):
+    properties = {k: v for k, v in record.items() if k != "geometry"}
+    return {"type": "Feature", "id": record["id"], "geometry": _geojson(record.get("geometry")),
+            "properties": properties}
+
+
+class StubServer:
+    """Threaded HTTP server answering like the ScoutMaster API from StubData.
+
+    Args:
+        data (StubData, optional): Data to serve (default StubData()).
+        latency (float or (float, float)): Seconds added to every response,
+            fixed or uniformly drawn from a (min, max) range.
+        compress_level (int): gzip level for clients accepting gzip.
+        port (int): Port to listen on; 0 picks a free one.
+    Attributes:
+        stats (dict): 'requests', 'bytes_sent' and 'bytes_received' so far.
+    """
+
+    def __init__(self, data=None, latency=0.0, compress_level=6, host="127.0.0.1", port=0):
+        self.data = data or StubData()
+        self.latency = latency
+        self.compress_level = compress_level
+        self.stats = {"requests": 0, "bytes_sent": 0, "bytes_received": 0}
+        self._stats_lock = threading.Lock()
+        self._bodies = {}  # (path, query, gzip) -> encoded GET body of the current data version
+        self._bodies_version = self.data.version
+        self._server = ThreadingHTTPServer((host, port), _handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v3/"
+
+    @property
+    def token_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/oauth2/token"
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def client(self, **kwargs):
+        """A ScoutMasterAPI pointed at this server and authenticated."""
+        from .api import ScoutMasterAPI
+
+        kwargs.setdefault("verbose", False)
+        api = ScoutMasterAPI(**kwargs)
+        api.host, api.token_url = self.url, self.token_url
+        api.authenticate("stub-client", "stub-secret")
+        return api
+
+    def reset_stats(self):
+        with self._stats_lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def _count(self, sent, received):
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["bytes_sent"] += sent
+            self.stats["bytes_received"] += received
+
+    def _sleep(self):
+        latency = self.latency
+        if isinstance(latency, (tuple, list)):
+            latency = random.uniform(*latency)
+        if latency:
+            time.sleep(latency)
+
+    # ── Routing ──────────────────────────────────────────────────────────────
+
+    def route(self, method, path, query, body):
+        """(status, payload) for one request; payload None means no content."""
+        if path == "oauth2/token":
+            return 200, {"access_token": f"stub-{uuid.uuid4().hex}", "expires_in": 3600,
+                         "token_type": "Bearer"}
+        match = re.fullmatch(r"v\d+/(.*?)/?", path)
+        if not match:
+            return 404, {"message": "Not found"}
+        parts = [p for p in match.group(1).split("/") if p]
+        data = self.data
+        if not parts or parts[0] not in data.records:
+            return 404, {"message": "Not found"}
+        kind = parts[0]
+
+        if method in ("POST", "PATCH") and _invalid_geometry(parts[-1] if len(parts) != 2 else kind, body):
+            return 422, {"message": "Validation failed: geometry must be a GeoJSON object"}
+
+        if len(parts) == 1:
+            if method == "GET":
+                return 200, self._listing(list(data.records[kind].values()), query)
+            if method == "POST":
+                return 201, {"data": data.create(kind, body or {})}
+        elif len(parts) == 2:
+            record_id = parts[1]
+            if method == "GET":
+                record = data.records[kind].get(record_id)
+                return (200, {"data": _as_wkt_record(record)}) if record else (404, {"message": "Not found"})
+            if method == "PATCH":
+                record = data.update(kind, record_id, body or {})
+                return (200, {"data": _as_wkt_record(record)}) if record else (404, {"message": "Not found"})
+            if method == "DELETE":
+                return (204, None) if data.delete(kind, record_id) else (404, {"message": "Not found"})
+        else:
+            record_id, sub = parts[1], parts[2]
+            parent = data.records[kind].get(record_id)
+            if parent is None:
+                return 404, {"message": "Not found"}
+            if method == "GET" and sub == "tsum" and kind == "calendars":
+                return 200, {"data": data.tsum(parent)}
+            if method == "GET" and sub == "statistics" and kind == "layers":
+                return 200, {"data": parent.get("statistics", {})}
+            if method == "GET" and sub == "geojson":
+                return 200, {"data": _feature(parent)}
+            if method == "POST" and sub == "resend-credentials" and kind == "users":
+                return 200, {"data": parent}
+            if method == "POST" and parts[2:] == ["invites", "resend"] and kind == "projects":
+                invite = next((i for i in data.children("invites", "projects", record_id)
+                               if i.get("email") == (body or {}).get("email")), None)
+                return (200, {"data": {"invite_id": invite["id"], "message": "Invite resent"}}
+                        if invite else (404, {"message": "Not found"}))
+            if method == "GET" and sub == "export" and kind == "layers":
+                root = self.url.rsplit("v3/", 1)[0]
+                return 200, {"data": {"url": f"{root}files/layers/{record_id}",
+                                      "format": query.get("format")}}
+            if kind == "environments" and sub in ("users", "owners", "services", "projects"):
+                membership = self._membership(method, record_id, sub, parts[3:], body)
+                if membership is not None:
+                    return membership
+            if sub not in data.records or kind not in PARENT_KEYS:
+                return 404, {"message": "Not found"}
+            if method == "GET" and len(parts) == 3 and kind == "projects" \
+                    and sub in PROJECT_CATALOGUES:
+                return 200, self._listing(list(data.records[sub].values()), query)
+            if method == "GET" and len(parts) == 3:
+                return 200, self._listing(data.children(sub, kind, record_id), query)
+            if method == "GET" and parts[3:] == ["geojson"]:
+                records = data.children(sub, kind, record_id)
+                return 200, {"type": "FeatureCollection", "features": [_feature(r) for r in records]}
+            if method == "POST" and len(parts) == 3:
+                body = dict(body or {})
+                upload = body.pop("_upload", None)
+                record = data.create(sub, body, kind, record_id)
+                if upload is not None:
+                    data.files[record["id"]] = upload
+                return 201, {"data": _as_wkt_record(record)}
+        return 405, {"message": f"{method} not supported on {path}"}
+
+    def _membership(self, method, environment_id, collection, rest, body):
+        """Environment users/owners/services, and adding/removing projects."""
+        data = self.data
+        if collection == "projects":
+            if len(rest) != 1 or method not in ("POST", "DELETE"):
+                return None  # listings go through the generic child routes
+            project = data.records["projects"].get(rest[0])
+            if project is None:
+                return 404, {"message": "Not found"}
+            if method == "DELETE" and project.get("environment_id") != environment_id:
+                return 404, {"message": "Not found"}
+            data.update("projects", rest[0], {"environment_id": environment_id if method == "POST" else None})
+            return (201 if method == "POST" else 200), {"data": project}
+        if method == "GET" and not rest:
+            return 200, {"data": list(data.members.get((environment_id, collection), {}).values())}
+        if method == "POST" and not rest and collection != "services":
+            body = body or {}
+            member_id = body.get("user_id")
+            if member_id is None and collection == "users":  # create the user, then add them
+                member_id = data.create("users", {k: v for k, v in body.items()
+                                                  if k != "temporary_password"})["id"]
+            return 201, {"data": data.member_add(environment_id, collection, member_id, body)}
+        if method == "POST" and len(rest) == 1:
+            member_id = int(rest[0]) if collection == "services" else rest[0]
+            return 201, {"data": data.member_add(environment_id, collection, member_id)}
+        if method == "DELETE" and len(rest) == 1:
+            member_id = int(rest[0]) if collection == "services" else rest[0]
+            removed = data.member_remove(environment_id, collection, member_id)
+            return (200, {"data": removed}) if removed else (404, {"message": "Not found"})
+        return None
+
+    def _listing(self, records, query):
+        sort_by = query.get("sort_by")
+        if sort_by:
+            records = sorted(records, key=lambda r: str(r.get(sort_by) or ""),
+                             reverse=query.get("order") == "desc")
+        count = len(records)
+        if query.get("limit"):
+            limit, page = int(query["limit"]), int(query.get("page") or 1)
+            records = records[(page - 1) * limit:page * limit]
+        return {"data": [_as_wkt_record(r) for r in records], "count": count}
+
+
+def _multipart(content_type, raw):
+    """Form fields of a multipart/form-data body; the (last) file's bytes go
+    under '_upload'."""
+    message = BytesParser(policy=HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + raw)
+    body = {}
+    for part in message.iter_parts():
+        if part.get_filename():
+            body["_upload"] = part.get_payload(decode=True)
+        else:
+            body[part.get_param("name", header="content-disposition")] = part.get_content()
+    return body
+
+
+def _handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+        disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+        def log_message(self, *args):
+            pass
+
+        def _handle(self, method):
+            url = urlsplit(self.path)
+            path = url.path.strip("/")
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            body = None
+            if raw:
+                if self.headers.get("Content-Encoding") == "gzip":
+                    raw_body = gzip.decompress(raw)
+                else:
+                    raw_body = raw
+                content_type = self.headers.get("Content-Type") or ""
+                if "json" in content_type:
+                    body = json.loads(raw_body)
+                elif content_type.startswith("multipart/"):
+                    body = _multipart(content_type, raw_body)
+                else:
+                    body = {k: v[-1] for k, v in parse_qs(raw_body.decode()).items()}
+            stub._sleep()
+            if method == "GET" and path.startswith("files/layers/"):
+                with stub.data.lock:
+                    record_id = path.rsplit("/", 1)[1]
+                    content = (stub.data.layer_file(record_id)
+                               if record_id in stub.data.records["layers"] else None)
+                # Count before replying: once the client has the response it
+                # may read or reset the stats.
+                stub._count(len(content or b""), len(raw))
+                self.send_response(200 if content is not None else 404)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(content or b"")))
+                self.end_headers()
+                self.wfile.write(content or b"")
+                return
+            gzipped = "gzip" in (self.headers.get("Accept-Encoding") or "")
+
+            key = (path, url.query, gzipped) if method == "GET" else None
+            if stub._bodies_version != stub.data.version:
+                stub._bodies, stub._bodies_version = {}, stub.data.version
+            encoded = stub._bodies.get(key) if key else None
+            if encoded is None:
+                with stub.data.lock:
+                    status, payload = stub.route(method, path, query, body)
+                encoded = (status, b"" if payload is None else json.dumps(payload).encode())
+                if gzipped and encoded[1]:
+                    encoded = (status, gzip.compress(encoded[1], compresslevel=stub.compress_level))
+                if key and status == 200:
+                    stub._bodies[key] = encoded
+            status, payload = encoded
+            stub._count(len(payload), len(raw))  # before replying, as above
+            self.send_response(status)
+            if payload:
+                self.send_header("Content-Type", "application/json")
+                if gzipped:
+                    self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def do_PATCH(self):
+            self._handle("PATCH")
+
+        def do_DELETE(self):
+            self._handle("DELETE")
+
+    return Handler
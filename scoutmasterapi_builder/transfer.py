@@ -0,0 +1,383 @@
+import json
+import mimetypes
+import os
+import shutil
+import tempfile
+import time
+
+from .streaming import parse_geometries
+
+ARCHIVE_VERSION = 1
+# kind -> (listing endpoint, parent key, parent kind, create endpoint), in
+# import order: parents before the records that reference them.
+KINDS = {
+    "fields": ("projects/{project_id}/fields", None, None, "projects/{project_id}/fields"),
+    "cultivations": ("projects/{project_id}/calendars", "field_id", "fields", "fields/{parent}/calendars"),
+    "subscriptions": ("projects/{project_id}/subscriptions", "field_id", "fields",
+                      "fields/{parent}/subscriptions"),
+    "layers": ("projects/{project_id}/layers", "field_id", "fields", "fields/{parent}/layers"),
+    "observations": ("projects/{project_id}/observations", None, None,
+                     "projects/{project_id}/observations"),
+    "values": ("observations/{parent}/values", "observation_id", "observations",
+               "observations/{parent}/values"),
+}
+# Catalogue ids differ between hosts and environments, so records keep
+# catalogue references by id only within an archive: the manifest stores each
+# catalogue's id -> code/name, and imports remap to the target's ids by name.
+# catalogue -> (kind referencing it, payload key, listing endpoint)
+REFERENCES = {
+    "layer_types": ("layers", "type_id", "projects/{project_id}/layer-types"),
+    "services": ("subscriptions", "subscription_id", "projects/{project_id}/services"),
+    "research_categories": ("observations", "research_category_id", "research-categories"),
+    "observation_parameters": ("values", "parameter_id", "observation-parameters"),
+}
+CHUNK_SIZE = 1024 * 1024  # bytes per read when streaming layer files
+
+# Archive layout (a directory, e.g. zipped for transport):
+#   manifest.json          source project, record counts, layer format,
+#                          reference catalogues (id -> code/name)
+#   <kind>.json            exported records of each kind
+#   layers/<layer id>      layer files
+#   imports/<project>.json source -> target id map of each import (resume state)
+
+
+def _ref(record, key):
+    """record['field_id'], or record['field']['id'] for nested references."""
+    value = record.get(key)
+    if value is None and isinstance(record.get(key[:-3]), dict):
+        value = record[key[:-3]].get("id")
+    return value
+
+
+def _payload(kind, record, user_id):
+    """Create payload for an exported record (None values dropped)."""
+    if kind == "fields":
+        payload = {"user_id": user_id, "name": record.get("name"),
+                   "geometry": record.get("geometry"), "properties": record.get("properties")}
+    elif kind == "cultivations":
+        payload = {"crop_code": record.get("crop_code") or (record.get("crop") or {}).get("code"),
+                   "crop_variety_code": (record.get("crop_variety_code")
+                                         or (record.get("crop_variety") or {}).get("code")),
+                   "events": record.get("events")}
+    elif kind == "subscriptions":
+        payload = {"user_id": user_id, "subscription_id": _ref(record, "subscription_id"),
+                   "started_at": record.get("started_at"), "ended_at": record.get("ended_at")}
+    elif kind == "layers":
+        payload = {"acquired_at": record.get("acquired_at") or record.get("date"),
+                   "type_id": record.get("type_id") or _ref(record, "layer_type_id"),
+                   "acquired_at_end_date": record.get("acquired_at_end_date")}
+    elif kind == "observations":
+        payload = {"user_id": user_id, "reference_code": record.get("reference_code"),
+                   "acquired_at": record.get("acquired_at"), "geometry": record.get("geometry"),
+                   "reported_at": record.get("reported_at"),
+                   "research_category_id": _ref(record, "research_category_id")}
+    else:  # values
+        value = record.get("value")
+        payload = {"parameter_id": _ref(record, "parameter_id"),
+                   "value": float(value) if value is not None else None,
+                   "operator": record.get("operator"), "target_min": record.get("target_min"),
+                   "target_max": record.get("target_max")}
+    return {k: v for k, v in payload.items() if v is not None}
+
+
+def _catalogue(api, catalogue, project_id):
+    """[(id, code or name)] of a reference catalogue as seen from a project."""
+    endpoint = REFERENCES[catalogue][2].format(project_id=project_id)
+    return [(r["id"], r.get("code") or r.get("name")) for r in api._get(endpoint) or []]
+
+
+def _reference_map(api, manifest, kinds, project_id):
+    """{payload key: (catalogue, {source id: target id or None})} for the kinds imported."""
+    references = manifest.get("references")
+    if references is None:
+        api._log("project_import: archive has no reference catalogues; "
+                 "layer type, service, category and parameter ids are copied as-is")
+        return {}
+    remap = {}
+    for catalogue, (kind, key, _) in REFERENCES.items():
+        if kind not in kinds or catalogue not in references:
+            continue
+        target = {}
+        for target_id, name in _catalogue(api, catalogue, project_id):
+            target.setdefault(name, target_id)
+        remap[key] = (catalogue, {source_id: target.get(name)
+                                  for source_id, name in references[catalogue].items()})
+    return remap
+
+
+def _with_parents(include):
+    kinds = set(include or KINDS)
+    unknown = kinds - set(KINDS)
+    if unknown:
+        raise ValueError(f"Unknown kinds {sorted(unknown)}. Choose from {list(KINDS)}")
+    for kind in list(kinds):
+        while KINDS[kind][2]:
+            kind = KINDS[kind][2]
+            kinds.add(kind)
+    return [kind for kind in KINDS if kind in kinds]
+
+
+def _write_json(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def export_project(api, project_id, path, include=None, layer_format="png", max_workers=None):
+    """Snapshot a project into an archive directory (see project_export).
+
+    Records are re-read on every run; layer files already in the archive are
+    kept, so an interrupted export resumes where its downloads stopped.
+    """
+    kinds = _with_parents(include)
+    os.makedirs(os.path.join(path, "layers"), exist_ok=True)
+    project = api._get(f"projects/{project_id}")
+    if not project:
+        raise Exception(f"Project {project_id} not found")
+    errors, counts = [], {}
+    for kind in kinds:
+        listing, parent_key, parent_kind, _ = KINDS[kind]
+        if parent_kind == "observations":
+            parents = [o["id"] for o in _load(path, "observations")]
+            fetched = api._map_concurrent(lambda o: api._get(listing.format(parent=o)) or [],
+                                          parents, max_workers)
+            records = []
+            for parent, (values, error) in zip(parents, fetched):
+                if error is not None:
+                    errors.append({"kind": kind, "id": parent, "error": str(error)})
+                records.extend(dict(v, observation_id=parent) for v in values or [])
+        else:
+            records = api._get(listing.format(project_id=project_id)) or []
+        _write_json(os.path.join(path, f"{kind}.json"), records)
+        counts[kind] = len(records)
+        api._log(f"project_export: {len(records)} {kind}")
+
+    if "layers" in kinds:
+        todo = [layer["id"] for layer in _load(path, "layers")
+                if not os.path.exists(os.path.join(path, "layers", str(layer["id"])))]
+        downloaded = api._map_concurrent(
+            lambda layer_id: _download_layer(api, layer_id, path, layer_format), todo, max_workers)
+        for layer_id, (_, error) in zip(todo, downloaded):
+            if error is not None:
+                errors.append({"kind": "layers", "id": layer_id, "error": str(error)})
+        api._log(f"project_export: {len(todo)} layer files downloaded")
+
+    references = {}
+    for catalogue, (kind, _, _) in REFERENCES.items():
+        if kind in kinds:
+            try:
+                references[catalogue] = {str(i): name for i, name in _catalogue(api, catalogue, project_id)}
+            except Exception as e:
+                errors.append({"kind": catalogue, "id": None, "error": str(e)})
+
+    manifest_path = os.path.join(path, "manifest.json")
+    if os.path.exists(manifest_path):
+        # Re-exporting some kinds into an archive of the same project keeps the others.
+        with open(manifest_path) as f:
+            previous = json.load(f)
+        if previous.get("project", {}).get("id") == project.get("id"):
+            counts = dict(previous.get("kinds", {}), **counts)
+            references = dict(previous.get("references", {}), **references)
+            if "layers" not in kinds:
+                layer_format = previous.get("layer_format")
+    _write_json(manifest_path, {
+        "version": ARCHIVE_VERSION, "project": project, "kinds": counts, "references": references,
+        "layer_format": layer_format if "layers" in counts else None,
+        "exported_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    })
+    return {"path": path, "counts": counts, "errors": errors}
+
+
+def _download_layer(api, layer_id, path, layer_format):
+    """Stream a layer's file to <path>/layers/<id> without holding it in memory."""
+    data = api._get(f"layers/{layer_id}/export", params={"format": layer_format})
+    url = data.get("url") if isinstance(data, dict) else data
+    if not url:
+        raise Exception(f"No export URL for layer {layer_id}")
+    if not url.startswith(("http://", "https://")):
+        url = f"{api.host}{url.lstrip('/')}"
+    # Export URLs are pre-signed: no Authorization header.
+    response = (api.transport or api.session).request("GET", url, stream=True)
+    target = os.path.join(path, "layers", str(layer_id))
+    try:
+        response.raise_for_status()
+        with open(f"{target}.part", "wb") as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+    finally:
+        response.close()
+    os.replace(f"{target}.part", target)
+
+
+def _load(path, kind):
+    file = os.path.join(path, f"{kind}.json")
+    if not os.path.exists(file):
+        return []
+    with open(file) as f:
+        return json.load(f)
+
+
+def import_project(api, path, project_id, user_id, include=None, max_workers=None,
+                   checkpoint_every=200):
+    """Re-create an archive's records in a project (see project_import)."""
+    import pandas as pd
+
+    manifest_path = os.path.join(path, "manifest.json")
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"No archive manifest at {manifest_path}")
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != ARCHIVE_VERSION:
+        raise ValueError(f"Unsupported archive version: {manifest.get('version')}")
+    kinds = [kind for kind in _with_parents(include) if kind in manifest["kinds"]]
+    remap = _reference_map(api, manifest, kinds, project_id)
+
+    state_path = os.path.join(path, "imports", f"{project_id}.json")
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            ids = json.load(f)["ids"]
+        api._log(f"project_import: resuming ({sum(map(len, ids.values()))} records already imported)")
+    else:
+        ids = {}
+    rows = []
+
+    def create(item):
+        kind, record = item
+        _, parent_key, parent_kind, template = KINDS[kind]
+        parent = None
+        if parent_kind:
+            parent = ids.get(parent_kind, {}).get(str(_ref(record, parent_key)))
+            if parent is None:
+                raise Exception(f"parent {parent_kind[:-1]} {_ref(record, parent_key)} was not imported")
+        endpoint = template.format(project_id=project_id, parent=parent)
+        payload = _payload(kind, record, user_id)
+        for key, (catalogue, ids_by_source) in remap.items():
+            if key in payload:
+                source_id = str(payload[key])
+                if ids_by_source.get(source_id) is None:
+                    name = manifest["references"][catalogue].get(source_id)
+                    raise Exception(f"{key} {source_id} ({name!r}) has no match by name in the "
+                                    f"target's {catalogue.replace('_', ' ')}")
+                payload[key] = ids_by_source[source_id]
+        if kind in ("fields", "observations") and payload.get("geometry") is not None:
+            # Listings return WKT; creates take GeoJSON (as in fields_create_many).
+            geometry = parse_geometries([payload["geometry"]])
+            payload["geometry"] = api._prepare_geometries(geometry)[0].__geo_interface__
+        if kind == "layers":
+            file = os.path.join(path, "layers", str(record["id"]))
+            if not os.path.exists(file):
+                raise Exception("layer file missing from the archive")
+            name = f"{record['id']}.{manifest.get('layer_format') or 'bin'}"
+            mime_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            with open(file, "rb") as f:
+                created = api._post(endpoint, payload=payload, files={"file": (name, f, mime_type)})
+        else:
+            created = api._post(endpoint, payload)
+        created = created[0] if isinstance(created, list) and created else created
+        if not isinstance(created, dict) or "id" not in created:
+            raise Exception("no id returned")
+        return str(created["id"])
+
+    for kind in kinds:
+        mapped = ids.setdefault(kind, {})
+        records = _load(path, kind)
+        rows.extend({"kind": kind, "id": str(r["id"]), "new_id": mapped[str(r["id"])],
+                     "status": "already imported", "error": None}
+                    for r in records if str(r["id"]) in mapped)
+        todo = [(kind, r) for r in records if str(r["id"]) not in mapped]
+        for start in range(0, len(todo), checkpoint_every):
+            chunk = todo[start:start + checkpoint_every]
+            for (_, record), (new_id, error) in zip(chunk, api._map_concurrent(create, chunk, max_workers)):
+                old_id = str(record["id"])
+                if error is None:
+                    mapped[old_id] = new_id
+                rows.append({"kind": kind, "id": old_id, "new_id": new_id,
+                             "status": "failed" if error else "imported",
+                             "error": str(error) if error else None})
+            _write_json(state_path, {"version": ARCHIVE_VERSION, "project_id": project_id,
+                                     "source_project_id": manifest["project"].get("id"), "ids": ids})
+    status = pd.DataFrame(rows, columns=["kind", "id", "new_id", "status", "error"])
+    api._log(f"project_import: {status.groupby(['kind', 'status']).size().to_dict()}")
+    return status
+
+
+class Transfer:
+    def project_export(self, project_id, path, include=None, layer_format="png", max_workers=None):
+        """
+        Export a project's fields, cultivations, subscriptions, layers (with
+        their files), observations and observation values to an archive
+        directory. Layer files are streamed to disk, never held in memory;
+        running the export again resumes unfinished downloads. The names of
+        the layer types, services, research categories and observation
+        parameters the records reference are saved with them.
+        Args:
+            project_id (str): UUID of the project.
+            path (str): Archive directory (created if needed).
+            include (list[str], optional): Kinds to export, from 'fields',
+                'cultivations', 'subscriptions', 'layers', 'observations' and
+                'values' (default all); parents of included kinds are added.
+            layer_format (str): Format layer files are exported in.
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+        Returns:
+            dict: 'path', record 'counts' per kind and 'errors' (failed value
+            listings and layer downloads).
+        """
+        return export_project(self, project_id, path, include, layer_format, max_workers)
+
+    def project_import(self, path, project_id, user_id, include=None, max_workers=None):
+        """
+        Re-create an exported project's records in another (existing) project,
+        e.g. on another host or in another environment. Records are created
+        parents first with bounded concurrency, and references (field_id,
+        observation_id) are remapped to the new ids. Layer type, service,
+        research category and observation parameter ids are remapped by
+        code/name to the target's catalogues; records whose reference has no
+        match there fail (archives without saved catalogues copy these ids
+        as-is). The id map is saved in the archive as the import runs, so
+        running the import again after an interruption or failures only
+        creates what is still missing.
+        Args:
+            path (str): Archive directory written by project_export.
+            project_id (str): UUID of the target project.
+            user_id (str): UUID of the user the records are created for.
+            include (list[str], optional): Kinds to import (default all in the
+                archive); parents of included kinds are added.
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+        Returns:
+            pd.DataFrame: One row per record with 'kind', source 'id',
+            'new_id', 'status' ('imported', 'already imported' or 'failed')
+            and 'error'.
+        """
+        return import_project(self, path, project_id, user_id, include, max_workers)
+
+    def project_clone(self, project_id, target_project_id, user_id, target=None, path=None,
+                      include=None, max_workers=None):
+        """
+        Copy a project's records into another project via an export archive.
+        Args:
+            project_id (str): UUID of the source project.
+            target_project_id (str): UUID of the target project.
+            user_id (str): UUID of the user in the target the records are created for.
+            target (ScoutMasterAPI, optional): Client for the target host,
+                e.g. production when self points at dev (default self).
+            path (str, optional): Archive directory to keep. By default a
+                temporary one is used and removed once everything is copied;
+                on failures it is kept (and logged) so project_import can resume.
+            include (list[str], optional): Kinds to copy (default all).
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+        Returns:
+            pd.DataFrame: The import status (see project_import).
+        """
+        target = target or self
+        temporary = path is None
+        path = path or tempfile.mkdtemp(prefix="scoutmaster-export-")
+        export = self.project_export(project_id, path, include=include, max_workers=max_workers)
+        status = target.project_import(path, target_project_id, user_id, include=include,
+                                       max_workers=max_workers)
+        if temporary and not export["errors"] and not (status["status"] == "failed").any():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            self._log(f"project_clone: archive kept at {path}")
+        return status
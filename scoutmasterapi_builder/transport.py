@@ -0,0 +1,157 @@
+import base64
+import gzip
+import io
+import json
+import threading
+import time
+from http import HTTPStatus
+from urllib.parse import urlencode, urlsplit, parse_qsl
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# A transport is anything with requests.Session's request(method, url,
+# **kwargs) signature; BaseAPI sends every call (token fetch included)
+# through api.transport, falling back to api.session.
+
+CASSETTE_VERSION = 1
+# Response headers that are not recorded: credentials, and framing headers
+# that no longer apply to the decoded body.
+_DROP_HEADERS = {"set-cookie", "authorization", "content-encoding", "content-length",
+                 "transfer-encoding", "connection", "keep-alive"}
+# Keys whose values are replaced in recorded JSON bodies.
+SCRUB_KEYS = {"access_token", "refresh_token", "id_token", "client_secret", "password"}
+REDACTED = "REDACTED"
+
+
+def _request_key(method, url, params=None):
+    """(METHOD, path, canonical query): matches a request regardless of host
+    and parameter order."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        items = params.items() if isinstance(params, dict) else params
+        query.extend((str(k), str(v)) for k, v in items if v is not None)
+    return method.upper(), parts.path, urlencode(sorted(query))
+
+
+def _scrub(value):
+    if isinstance(value, dict):
+        return {k: REDACTED if k in SCRUB_KEYS else _scrub(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_scrub(v) for v in value]
+    return value
+
+
+def _scrub_body(content):
+    """Recorded form of a response body: scrubbed JSON text, else text or base64."""
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+    try:
+        return {"text": json.dumps(_scrub(json.loads(text)))}
+    except ValueError:
+        return {"text": text}
+
+
+class RecordingTransport:
+    """Pass requests through to `inner` and keep every exchange for a cassette.
+
+    Only the request method, path and query and the response status, headers
+    and body are kept; request headers and bodies (credentials, uploads) are
+    never recorded and token-like values in JSON bodies are redacted.
+    Streamed responses are read whole so they can be recorded.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.interactions = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        response = self.inner.request(method, url, **kwargs)
+        method_, path, query = _request_key(method, url, kwargs.get("params"))
+        entry = {
+            "method": method_, "path": path, "query": query,
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+            "body": _scrub_body(response.content or b""),
+            "elapsed": response.elapsed.total_seconds() if response.elapsed else 0.0,
+        }
+        with self._lock:
+            self.interactions.append(entry)
+        return response
+
+    def save(self, path):
+        """Write the recorded interactions to a gzip-compressed cassette."""
+        with self._lock:
+            cassette = {"version": CASSETTE_VERSION, "interactions": list(self.interactions)}
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(cassette, f)
+        return path
+
+
+class ReplayTransport:
+    """Serve responses from a cassette without any network access.
+
+    Requests are matched on method, path and query. Repeated identical
+    requests are answered with the recorded responses in order; once those
+    run out the last one is repeated, so replays are deterministic.
+
+    Args:
+        interactions (list[dict]): Recorded interactions (see load()).
+        latency (bool): Sleep for each response's recorded duration instead
+            of answering at memory speed.
+    """
+
+    def __init__(self, interactions, latency=False):
+        self.latency = latency
+        self._responses = {}  # request key -> [recorded entries]
+        self._served = {}  # request key -> number served so far
+        self._lock = threading.Lock()
+        for entry in interactions:
+            body = entry["body"]
+            entry = dict(entry, content=(base64.b64decode(body["base64"]) if "base64" in body
+                                         else body["text"].encode("utf-8")))
+            key = (entry["method"], entry["path"], entry["query"])
+            self._responses.setdefault(key, []).append(entry)
+
+    @classmethod
+    def load(cls, path, latency=False):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            cassette = json.load(f)
+        if cassette.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version: {cassette.get('version')}")
+        return cls(cassette["interactions"], latency=latency)
+
+    def request(self, method, url, **kwargs):
+        key = _request_key(method, url, kwargs.get("params"))
+        entries = self._responses.get(key)
+        if not entries:
+            raise Exception(f"No recorded response for {key[0]} {key[1]}"
+                            f"{'?' + key[2] if key[2] else ''}")
+        with self._lock:
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+        entry = entries[min(served, len(entries) - 1)]
+        if self.latency and entry.get("elapsed"):
+            time.sleep(entry["elapsed"])
+        return _response(entry, url)
+
+
+def _response(entry, url):
+    response = requests.Response()
+    response.status_code = entry["status"]
+    try:
+        response.reason = HTTPStatus(entry["status"]).phrase
+    except ValueError:
+        response.reason = ""
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.headers["Content-Length"] = str(len(entry["content"]))
+    response._content = entry["content"]
+    response._content_consumed = True  # iter_content() slices _content
+    response.raw = io.BytesIO(entry["content"])
+    response.encoding = "utf-8"
+    response.url = url
+    return response
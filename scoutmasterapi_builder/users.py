@@ -1,6 +1,10 @@
 import requests
 
 from .base import conceptual_class
+from .concurrency import RateLimiter
+
+PROVISION_COLUMNS = ["email", "username", "name", "phone_number", "project_id", "role",
+                     "user_id", "user_status", "invite_status", "error"]
 
 
 @conceptual_class
@@ -96,6 +100,186 @@ class Users:
         data = self._post(f"users/{user_id}/resend-credentials", payload)
         return data
 
+    # ── Bulk provisioning ────────────────────────────────────────────────────
+
+    def users_provision(self, users, environment_id=None, project_id=None, role="member",
+                        message=None, temporary_password=None, dry_run=False, max_workers=None,
+                        rate=None):
+        """
+        Create users and send project invites in bulk.
+        Existing users (get_all_users) and pending invites (project_invites)
+        are fetched once and skipped; everything else is created/sent
+        concurrently. A failing row does not stop the others: see the status
+        table, and pass it to users_provision_retry to retry only failed rows.
+        Args:
+            users (pd.DataFrame or list[dict]): One row per user with 'email'
+                and optionally 'username' (defaults to email), 'name',
+                'phone_number', 'project_id' and 'role' ('member' or 'owner').
+                Rows are deduplicated on email and project.
+            environment_id (str, optional): Environment to add the users to.
+            project_id (str, optional): Project to invite users to, for rows
+                without a 'project_id'.
+            role (str): Invite role for rows without a 'role'.
+            message (str, optional): Personal message for the invites.
+            temporary_password (str, optional): Temporary password for new users.
+            dry_run (bool): Only return the plan ('create', 'add', 'invite').
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+            rate (float, optional): Maximum write requests per second.
+        Returns:
+            pd.DataFrame: Per-row 'user_id', 'user_status' ('exists',
+            'created', 'added' or 'failed'), 'invite_status' ('sent',
+            'pending', 'failed' or None without a project) and 'error'.
+        """
+        import pandas as pd
+
+        rows = pd.DataFrame(users).copy()
+        if "email" not in rows.columns:
+            raise ValueError("users must have an 'email' column")
+        for column in PROVISION_COLUMNS:
+            if column not in rows.columns:
+                rows[column] = None
+        rows["email"] = rows["email"].str.strip()
+        rows["username"] = rows["username"].fillna(rows["email"])
+        rows["project_id"] = rows["project_id"].fillna(project_id) if project_id else rows["project_id"]
+        rows["role"] = rows["role"].fillna(role)
+        bad_roles = set(rows.loc[rows["project_id"].notna(), "role"]) - {"member", "owner"}
+        if bad_roles:
+            raise ValueError(f"Invalid roles {sorted(bad_roles)}: must be 'member' or 'owner'")
+        rows = (rows.assign(_email=rows["email"].str.lower())
+                .drop_duplicates(["_email", "project_id"]).drop(columns="_email")
+                .reset_index(drop=True))
+        status = rows.astype(object).where(rows.notna(), None)[PROVISION_COLUMNS]
+        # Kept on the table for users_provision_retry; the password never is.
+        status.attrs["provision"] = {"environment_id": environment_id, "message": message}
+        options = dict(status.attrs["provision"], temporary_password=temporary_password)
+        return self._provision(status, options, dry_run, max_workers, rate)
+
+    def users_provision_retry(self, status, temporary_password=None, max_workers=None, rate=None):
+        """
+        Retry the failed rows of a users_provision status table.
+        Users whose creation failed but who exist by now get
+        resend_credentials instead of a second create; failed invites that
+        are pending by now get project_invite_resend instead of a new invite.
+        Rows that succeeded are not touched.
+        Args:
+            status (pd.DataFrame): Status table from users_provision (or a
+                previous retry).
+            temporary_password (str, optional): Temporary password for users
+                created or sent new credentials (not stored in the table).
+            max_workers (int, optional): Concurrent requests (default self.max_workers).
+            rate (float, optional): Maximum write requests per second.
+        Returns:
+            pd.DataFrame: Updated copy of the status table.
+        """
+        status = status.copy()
+        options = dict(status.attrs.get("provision", {}), temporary_password=temporary_password)
+        failed = (status["user_status"] == "failed") | (status["invite_status"] == "failed")
+        if not failed.any():
+            return status
+        return self._provision(status, options, False, max_workers, rate, retry=failed)
+
+    def _provision(self, status, options, dry_run, max_workers, rate, retry=None):
+        """Apply (or retry) the user and invite steps of a provisioning table."""
+        environment_id = options.get("environment_id")
+        users = self._get("users") or []
+        user_ids = {str(u.get("email", "")).lower(): u.get("id") or u.get("sub") or u.get("user_id")
+                    for u in users}
+        members = set()
+        if environment_id:
+            members = {str(m.get("user_id") or m.get("id"))
+                       for m in self._get(f"environments/{environment_id}/users") or []}
+        projects = [p for p in status["project_id"].dropna().unique()]
+        fetched = self._map_concurrent(lambda p: self._get(f"projects/{p}/invites") or [],
+                                       projects, max_workers)
+        invited = set()
+        for project, (invites, error) in zip(projects, fetched):
+            if error is not None:
+                raise Exception(f"Fetching invites of project {project} failed: {error}")
+            invited.update((project, str(i.get("email", "")).lower()) for i in invites)
+
+        todo = status.index[retry] if retry is not None else status.index
+        limiter = RateLimiter(rate) if rate else None
+
+        def write(method, *args, **kwargs):
+            if limiter:
+                limiter.acquire()
+            return getattr(self, method)(*args, **kwargs)
+
+        def user_step(row):
+            """(user_id, user_status) of one row, creating/adding as needed."""
+            user_id = user_ids.get(row["email"].lower())
+            if user_id is not None and retry is not None and row["user_status"] == "failed" \
+                    and row["user_id"] is None:
+                # Created by the failed attempt after all: only the credentials are missing.
+                write("resend_credentials", user_id, options.get("temporary_password"))
+                return user_id, "created"
+            if user_id is not None:
+                if environment_id and str(user_id) not in members:
+                    if not dry_run:
+                        write("environment_user_add", environment_id, user_id=user_id)
+                    return user_id, "add" if dry_run else "added"
+                previous = row["user_status"]
+                return user_id, previous if previous in ("created", "added") else "exists"
+            if dry_run:
+                return None, "create"
+            details = dict(username=row["username"], name=row["name"],
+                           phone_number=row["phone_number"],
+                           temporary_password=options.get("temporary_password"))
+            if environment_id:
+                created = write("environment_user_add", environment_id, email=row["email"], **details)
+            else:
+                created = write("create_user", email=row["email"], **details)
+            created = created[0] if isinstance(created, list) and created else created or {}
+            return created.get("user_id") or created.get("id") or created.get("sub"), "created"
+
+        def invite_step(row):
+            project = row["project_id"]
+            if project is None:
+                return None
+            if (project, row["email"].lower()) in invited:
+                if retry is not None and row["invite_status"] == "failed":
+                    write("project_invite_resend", project, row["email"])
+                    return "sent"
+                return "sent" if row["invite_status"] == "sent" else "pending"
+            if dry_run:
+                return "invite"
+            write("project_invite_send", project, row["email"], row["role"], options.get("message"))
+            return "sent"
+
+        # Users are resolved (created / added) once per email, then the
+        # per-project invites fan out; the user outcome is shared by all rows
+        # of that email.
+        emails = {}
+        for label in todo:
+            emails.setdefault(status.at[label, "email"].lower(), []).append(label)
+
+        def provision_user(labels):
+            rows = [status.loc[label] for label in labels]
+            # On a retry the row whose user step failed decides what to redo.
+            row = next((r for r in rows if r["user_status"] == "failed"), rows[0])
+            try:
+                return user_step(row) + (None,)
+            except Exception as e:
+                return row["user_id"], "failed", f"user: {e}"
+
+        def provision_invite(label):
+            try:
+                return invite_step(status.loc[label]), None
+            except Exception as e:
+                return "failed", f"invite: {e}"
+
+        resolved = self._map_concurrent(provision_user, list(emails.values()), max_workers)
+        by_email = {email: outcome for email, (outcome, _) in zip(emails, resolved)}
+        invites = self._map_concurrent(provision_invite, list(todo), max_workers)
+        for label, ((invite_status, invite_error), _) in zip(todo, invites):
+            user_id, user_status, user_error = by_email[status.at[label, "email"].lower()]
+            error = "; ".join(e for e in (user_error, invite_error) if e) or None
+            status.loc[label, ["user_id", "user_status", "invite_status", "error"]] = [
+                user_id, user_status, invite_status, error]
+        self._log(f"users_provision: users {status['user_status'].value_counts().to_dict()}, "
+                  f"invites {status['invite_status'].value_counts().to_dict()}")
+        return status
+
     # ── Project-scoped user methods ──────────────────────────────────────────
 
     def project_users(self, project_id, page=None, limit=None, order=None, sort_by=None):
@@ -0,0 +1,52 @@
+import warnings
+
+import pytest
+
+from scoutmasterapi_builder.stub import StubData, StubServer
+
+
+@pytest.fixture
+def stub():
+    with StubServer(StubData(projects=2, fields=3, layers=0, observations=0)) as server:
+        yield server
+
+
+def _run(api, calls):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with api.batch(max_concurrency=4) as b:
+            for method, *args in calls:
+                getattr(b, method)(*args)
+    return b
+
+
+def test_duplicate_calls_are_sent_once_and_results_keep_call_order(stub):
+    api = stub.client(output_format="json")
+    first, second = stub.data.project_ids
+    api._ensure_token()
+    stub.reset_stats()
+
+    b = _run(api, [("fields", first), ("fields", second), ("fields", first),
+                   ("crop_varieties", None), ("fields", second)])
+
+    assert stub.stats["requests"] == 2  # one per distinct project; the invalid call sends none
+    assert [call.index for call in b.calls] == [0, 1, 2, 3, 4]
+    projects = [None if r is None else {f["project_id"] for f in r} for r in b.results]
+    assert projects == [{first}, {second}, {first}, None, {second}]
+    assert [call.index for call in b.errors] == [3]
+    # Duplicates get their own copy of the shared result.
+    b.results[0][0]["name"] = "changed"
+    assert b.results[2][0]["name"] == "Field 0"
+    assert list(b.combined) == [0, 1, 2, 4]
+
+
+def test_combined_frame_is_ordered_by_call(stub):
+    api = stub.client()
+    first, second = stub.data.project_ids
+
+    b = _run(api, [("fields", second), ("fields", first), ("fields", second)])
+
+    combined = b.combined
+    assert combined["batch_call"].tolist() == [0] * 3 + [1] * 3 + [2] * 3
+    assert combined["batch_key"].tolist() == [second] * 3 + [first] * 3 + [second] * 3
+    assert (combined["project_id"] == combined["batch_key"]).all()
@@ -0,0 +1,86 @@
+import warnings
+
+import pytest
+
+from scoutmasterapi_builder.stub import StubData, StubServer
+
+
+@pytest.fixture
+def stub():
+    with StubServer(StubData(projects=1, fields=3, layers=2, observations=6)) as server:
+        yield server
+
+
+@pytest.fixture
+def api(stub):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        yield stub.client()
+
+
+class _Deletes(list):
+    def __init__(self):
+        super().__init__()
+        self.fail = set()
+
+
+@pytest.fixture
+def deletes(stub):
+    """(kind, id) of every record the stub deletes, in order; ids in `fail` are refused."""
+    data, log = stub.data, _Deletes()
+    delete = data.delete
+
+    def record(kind, record_id):
+        if record_id in log.fail:
+            return False
+        log.append((kind, record_id))
+        return delete(kind, record_id)
+
+    data.delete = record
+    return log
+
+
+def _children(stub, field_id):
+    return {kind: [r["id"] for r in stub.data.children(kind, "fields", field_id)]
+            for kind in ("layers", "observations", "calendars")}
+
+
+def test_cascade_deletes_dependents_before_their_fields(stub, api, deletes):
+    first, second, third = stub.data.ids("fields")
+    untouched = _children(stub, third)
+
+    status = api.fields_delete_many([first, second], cascade=True, quiet=True)
+
+    assert (status["status"] == "deleted").all()
+    kinds = [kind for kind, _ in deletes]
+    assert kinds.index("fields") == len(kinds) - 2 and kinds.count("fields") == 2
+    assert set(kinds[:-2]) == {"layers", "observations", "calendars"}
+    for field_id in (first, second):
+        assert field_id not in stub.data.records["fields"]
+        assert not any(_children(stub, field_id).values())
+    assert _children(stub, third) == untouched
+
+
+def test_field_with_a_failed_dependent_is_skipped(stub, api, deletes):
+    first, second, _ = stub.data.ids("fields")
+    deletes.fail.add(_children(stub, first)["layers"][0])
+
+    status = api.fields_delete_many([first, second], cascade=True, quiet=True)
+
+    fields = status[status["kind"] == "field"].set_index("id")["status"]
+    assert fields.to_dict() == {second: "deleted", first: "skipped"}
+    assert first in stub.data.records["fields"]
+    assert second not in stub.data.records["fields"]
+
+
+def test_dry_run_lists_but_deletes_nothing(stub, api, deletes):
+    first, second, _ = stub.data.ids("fields")
+    expected = {kind[:-1]: sum(len(_children(stub, f)[kind]) for f in (first, second))
+                for kind in ("layers", "observations", "calendars")}
+
+    status = api.fields_delete_many([first, second], cascade=True, dry_run=True, quiet=True)
+
+    assert deletes == []
+    assert (status["status"] == "would delete").all()
+    counts = status["kind"].value_counts().to_dict()
+    assert counts == {"field": 2, **{k: n for k, n in expected.items() if n}}
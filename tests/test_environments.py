@@ -0,0 +1,61 @@
+import warnings
+
+import pytest
+
+from scoutmasterapi_builder.stub import StubData, StubServer
+
+
+@pytest.fixture
+def stub():
+    with StubServer(StubData(projects=3, fields=0, layers=0, observations=0)) as server:
+        yield server
+
+
+@pytest.fixture
+def api(stub):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        yield stub.client()
+
+
+def test_reconcile_applies_the_difference_then_writes_nothing(stub, api):
+    environment_id = stub.data.ids("environments")[0]
+    first, second, third = stub.data.project_ids
+    stub.data.member_add(environment_id, "users", "user-old")
+    stub.data.member_add(environment_id, "owners", "user-old")
+    desired = {"users": ["user-1", "user-2"], "owners": ["user-1"],
+               "projects": [first, second], "services": [1]}
+
+    status = api.environment_reconcile(environment_id, desired)
+
+    assert (status["status"] == "done").all(), status[status["status"] != "done"]
+    planned = set(zip(status["collection"], status["action"], status["id"].astype(str)))
+    assert planned == {("users", "add", "user-1"), ("users", "add", "user-2"),
+                       ("users", "remove", "user-old"), ("owners", "add", "user-1"),
+                       ("owners", "remove", "user-old"), ("projects", "remove", third),
+                       ("services", "add", "1")}
+    members = stub.data.members
+    assert set(members[(environment_id, "users")]) == {"user-1", "user-2"}
+    assert set(members[(environment_id, "owners")]) == {"user-1"}
+    assert set(members[(environment_id, "services")]) == {1}
+    assert stub.data.records["projects"][third]["environment_id"] is None
+
+    version = stub.data.version
+    stub.reset_stats()
+    again = api.environment_reconcile(environment_id, desired)
+
+    assert again.empty
+    assert stub.data.version == version  # no writes
+    assert stub.stats["requests"] == len(desired)  # one listing per collection
+
+
+def test_dry_run_plans_without_writing(stub, api):
+    environment_id = stub.data.ids("environments")[0]
+    version = stub.data.version
+
+    status = api.environment_reconcile(environment_id, {"users": ["user-1"], "services": []},
+                                       dry_run=True)
+
+    assert status[["collection", "action", "id", "status"]].values.tolist() == [
+        ["users", "add", "user-1", "planned"]]
+    assert stub.data.version == version
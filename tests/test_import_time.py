@@ -0,0 +1,11 @@
+import pytest
+
+from scoutmasterapi_builder.perf import IMPORT_BUDGET_SECONDS, check_import_budget
+
+
+@pytest.mark.parametrize("module", ["scoutmasterapi_builder", "scoutmasterapi_builder.api"])
+def test_import_within_budget(module):
+    # Fresh interpreters; fails when the import takes longer than the budget
+    # or eagerly loads pandas/geopandas/shapely/pyproj.
+    result = check_import_budget(IMPORT_BUDGET_SECONDS, module=module)
+    assert result["seconds"] <= IMPORT_BUDGET_SECONDS
@@ -0,0 +1,55 @@
+import warnings
+
+import pandas as pd
+import pytest
+import shapely
+
+from scoutmasterapi_builder.stub import StubData, StubServer
+
+
+@pytest.fixture
+def stub():
+    with StubServer(StubData(projects=1, fields=1, layers=0, observations=0)) as server:
+        yield server
+
+
+@pytest.fixture
+def api(stub):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        yield stub.client()
+
+
+def test_float_parameter_ids_are_matched(stub, api):
+    observations = pd.DataFrame({
+        "reference_code": ["A", "B"],
+        "acquired_at": ["2026-05-01T00:00:00Z", "2026-05-02T00:00:00Z"],
+        "geometry": [{"type": "Point", "coordinates": [5.0, 52.0]}] * 2,
+    })
+    # Ids read from a float column (e.g. one with gaps) arrive as 1.0, 2.0.
+    values = pd.DataFrame({"row": [0, 1], "parameter_id": [1.0, 2.0], "value": [10, 20]})
+
+    status = api.observations_create_many(stub.data.project_ids[0], observations, values=values,
+                                          user_id="user-1")
+
+    assert list(status["status"]) == ["created", "created"], status["error"].tolist()
+    assert list(status["values_created"]) == [1, 1]
+    created = stub.data.records["values"].values()
+    assert sorted(v.get("parameter_id", v.get("parameter", {}).get("id")) for v in created) == [1, 2]
+
+
+def test_wkt_and_shapely_geometry_is_sent_as_geojson(stub, api):
+    observations = pd.DataFrame({
+        "reference_code": ["wkt", "shapely", "bad"],
+        "acquired_at": ["2026-05-01T00:00:00Z"] * 3,
+        "geometry": ["POINT (5.1 52.1)", shapely.Point(5.2, 52.2), "POINT (oops)"],
+    })
+
+    status = api.observations_create_many(stub.data.project_ids[0], observations, user_id="user-1")
+
+    assert list(status["status"]) == ["created", "created", "invalid"]
+    assert "invalid geometry" in status.at[2, "error"]
+    records = stub.data.records["observations"]
+    for label, (x, y) in ((0, (5.1, 52.1)), (1, (5.2, 52.2))):
+        geometry = records[status.at[label, "observation_id"]]["geometry"]
+        assert geometry["type"] == "Point" and tuple(geometry["coordinates"]) == (x, y)
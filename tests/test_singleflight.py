@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from scoutmasterapi_builder.singleflight import SingleFlight
+from scoutmasterapi_builder.stub import StubData, StubServer
+
+
+@pytest.fixture
+def stub():
+    with StubServer(StubData(fields=2, layers=0, observations=0), latency=0.3) as server:
+        yield server
+
+
+def _concurrently(fn, n):
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def run(i):
+        barrier.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_concurrent_gets_send_one_request(stub):
+    api = stub.client()
+    endpoint = f"projects/{stub.data.project_ids[0]}/fields"
+    api._ensure_token()
+    stub.reset_stats()
+
+    results = _concurrently(lambda: api._get(endpoint), 8)
+
+    assert stub.stats["requests"] == 1
+    assert all(r == results[0] for r in results) and len(results[0]) == 2
+
+
+def test_coalesced_callers_get_independent_copies(stub):
+    api = stub.client()
+    endpoint = f"projects/{stub.data.project_ids[0]}/fields"
+
+    results = _concurrently(lambda: api._get(endpoint), 4)
+    results[0][0]["name"] = "changed"
+    results[0].append({"id": "extra"})
+
+    assert all(r[0]["name"] == "Field 0" and len(r) == 2 for r in results[1:])
+    assert len({id(r) for r in results}) == len(results)
+
+
+def test_followers_share_the_leaders_error():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        started.set()
+        release.wait()
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("key", fail)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=call) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    while flight._calls["key"].waiters < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+
+    assert len(calls) == 1 and len(errors) == 4
@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from scoutmasterapi_builder.streaming import iter_json_array
+
+
+def _split_everywhere(body):
+    for i in range(1, len(body)):
+        yield [body[:i], body[i:]]
+
+
+@pytest.mark.parametrize("items", [
+    [1, -2500.0, True, None, "a,]b", 3e-7, 12],
+    [{"id": 1, "geometry": {"type": "Point", "coordinates": [5.1, 52.0]}}, [1, 2], 1.5E+10],
+])
+def test_items_survive_any_chunk_boundary(items):
+    body = json.dumps({"data": {"features": items}}).encode()
+    for chunks in _split_everywhere(body):
+        assert list(iter_json_array(chunks, "features")) == items
+
+
+def test_number_split_after_decimal_point():
+    chunks = [b'{"features": [1, -2500.', b'0, true]}']
+    assert list(iter_json_array(chunks, "features")) == [1, -2500.0, True]
+
+
+def test_truncated_stream_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"features": [1, 2'], "features"))
@@ -0,0 +1,69 @@
+import warnings
+
+import pytest
+import shapely
+
+from scoutmasterapi_builder.stub import StubData, StubServer
+
+
+@pytest.fixture
+def stub():
+    with StubServer(StubData(projects=2, fields=3, layers=1, observations=4, values=2,
+                             layer_size=1024)) as server:
+        yield server
+
+
+def test_stub_rejects_wkt_field_geometry(stub):
+    api = stub.client()
+    with pytest.raises(Exception):
+        api._post(f"projects/{stub.data.project_ids[0]}/fields",
+                  {"user_id": "u", "name": "WKT", "geometry": "POINT (5 52)"})
+
+
+def test_project_round_trip(stub, tmp_path):
+    api = stub.client()
+    source, target = stub.data.project_ids
+    export = api.project_export(source, str(tmp_path))
+    assert not export["errors"]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        status = api.project_import(str(tmp_path), target, "user-1")
+    assert (status["status"] == "imported").all(), status[status["status"] != "imported"]
+
+    fields = stub.data.records["fields"]
+    created = status[status["kind"] == "fields"]
+    for old_id, new_id in zip(created["id"], created["new_id"]):
+        geometry = fields[new_id]["geometry"]
+        assert isinstance(geometry, dict) and geometry["type"] == "Polygon"
+        assert fields[new_id]["project_id"] == target
+        assert shapely.geometry.shape(geometry).equals(shapely.geometry.shape(fields[old_id]["geometry"]))
+
+    # A second run resumes from the saved id map and creates nothing.
+    again = api.project_import(str(tmp_path), target, "user-1")
+    assert (again["status"] == "already imported").all()
+
+
+def test_import_remaps_reference_ids_by_name(stub, tmp_path):
+    api = stub.client()
+    source, target = stub.data.project_ids
+    api.project_export(source, str(tmp_path), include=["values"])
+
+    # The target host numbers the same parameters differently and lacks one.
+    parameters = stub.data.records["observation-parameters"]
+    renumbered = {str(p["id"] + 10): dict(p, id=p["id"] + 10) for p in parameters.values()
+                  if p["name"] != "Moisture"}
+    parameters.clear()
+    parameters.update(renumbered)
+    stub.data.version += 1  # invalidate the stub's response cache
+    before = set(stub.data.records["values"])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        status = api.project_import(str(tmp_path), target, "user-1", include=["values"])
+
+    created = [stub.data.records["values"][i] for i in set(stub.data.records["values"]) - before]
+    assert created and {v["parameter_id"] for v in created} <= {11, 13, 14}
+    failed = status[status["status"] == "failed"]
+    assert len(failed) and (failed["kind"] == "values").all()
+    assert failed["error"].str.contains("'Moisture'").all()
@@ -0,0 +1,46 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from scoutmasterapi_builder.stub import StubData, StubServer
+
+
+@pytest.fixture
+def stub():
+    with StubServer(StubData(projects=2, fields=1, layers=0, observations=0)) as server:
+        yield server
+
+
+@pytest.fixture
+def api(stub):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        yield stub.client()
+
+
+def test_new_email_in_two_projects_is_created_once(stub, api):
+    environment_id = stub.data.ids("environments")[0]
+    first, second = stub.data.project_ids
+    users = pd.DataFrame({"email": ["new@x.nl", "new@x.nl"], "project_id": [first, second]})
+
+    status = api.users_provision(users, environment_id=environment_id)
+
+    assert list(status["user_status"]) == ["created", "created"]
+    assert status["user_id"].nunique() == 1
+    assert list(status["invite_status"]) == ["sent", "sent"]
+    created = [u for u in stub.data.records["users"].values() if u.get("email") == "new@x.nl"]
+    assert len(created) == 1 and created[0]["id"] == status["user_id"].iloc[0]
+    invites = {(i["project_id"], i["email"]) for i in stub.data.records["invites"].values()}
+    assert invites == {(first, "new@x.nl"), (second, "new@x.nl")}
+
+
+def test_provisioning_again_writes_nothing(stub, api):
+    users = pd.DataFrame({"email": ["a@x.nl", "b@x.nl"], "project_id": stub.data.project_ids[0]})
+    api.users_provision(users)
+    stub.reset_stats()
+
+    status = api.users_provision(users)
+
+    assert set(status["user_status"]) == {"exists"} and set(status["invite_status"]) == {"pending"}
+    assert stub.stats["requests"] == 2  # the user and invite listings only